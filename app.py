@@ -4,181 +4,5394 @@ import numpy as np
 from datetime import datetime
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QPushButton, QLabel, QComboBox, 
-                              QSpinBox, QFileDialog, QMessageBox, QFrame, QSizePolicy,
+                              QSpinBox, QDoubleSpinBox, QFileDialog, QMessageBox, QFrame, QSizePolicy,
                               QProgressBar, QSlider, QCheckBox, QTabWidget, QGridLayout,
                               QTextEdit, QGroupBox, QLineEdit, QGraphicsDropShadowEffect,
-                              QSystemTrayIcon, QMenu, QAction, QSplashScreen)
-from PySide6.QtCore import Qt, QThread, Signal, QTimer, QRect, QPropertyAnimation, QEasingCurve, QSize
+                              QSystemTrayIcon, QMenu, QAction, QSplashScreen,
+                              QTableWidget, QTableWidgetItem, QHeaderView,
+                              QListWidget, QListWidgetItem, QInputDialog)
+from PySide6.QtCore import Qt, QCoreApplication, QObject, QThread, Signal, QTimer, QRect, QPointF, QPropertyAnimation, QEasingCurve, QSize
 from PySide6.QtGui import (QPixmap, QImage, QPainter, QScreen, QFont, QIcon, 
-                          QPalette, QColor, QLinearGradient, QBrush, QPen)
+                          QPalette, QColor, QLinearGradient, QBrush, QPen, QPolygonF)
 import cv2
 import pyautogui
 import threading
 import time
+import tracemalloc
+import itertools
+import platform
 import json
+import errno
+import sqlite3
+import struct
+import bisect
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import multiprocessing
+import queue
+import concurrent.futures
+import select
+import socket
+import mmap
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
 import psutil
 
+# Optional: window-following capture on X11
+try:
+    from Xlib import X, display as xdisplay, error as xerror
+    from Xlib.ext import composite
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+# Optional: animated GIF/WebP export
+try:
+    from PIL import Image, GifImagePlugin
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Optional: camera mode negotiation through V4L2 ioctls (Linux)
+try:
+    import fcntl
+    V4L2_AVAILABLE = sys.platform.startswith("linux")
+except ImportError:
+    V4L2_AVAILABLE = False
+
+
+# Per-user data directory for background jobs, caches and catalogs
+APP_DATA_DIR = os.path.join(os.path.expanduser("~"), ".eem_studio")
+
+# Intermediate spool format: header, then (timestamp, length, JPEG payload) records
+SPOOL_MAGIC = b"EEMSPL01"
+SPOOL_HEADER = struct.Struct("<8sIIdI")  # magic, width, height, fps, jpeg quality
+SPOOL_RECORD = struct.Struct("<dI")      # capture timestamp, payload size
+
+# Frame index sidecar: header, then one fixed-size record per frame or marker
+INDEX_MAGIC = b"EEMIDX01"
+INDEX_HEADER = struct.Struct("<8sIIdd")  # magic, version, keyframe interval, fps, start wall-clock
+INDEX_RECORD = struct.Struct("<dQII")    # seconds since start, byte offset, frame number, flags
+INDEX_KEYFRAME = 1
+INDEX_PAUSE = 2
+INDEX_RESUME = 4
+INDEX_MARKERS = INDEX_PAUSE | INDEX_RESUME
+INDEX_EXTENSION = ".eemidx"
+
+# Per-session performance log written next to each recording, one JSON object per line
+PERF_LOG_EXTENSION = ".perf.jsonl"
+
+# Keyframe interval of OpenCV's FFmpeg writer
+VIDEOWRITER_GOP = 12
+
+# Network streams are sent as MPEG-TS, cut on packet boundaries
+TS_PACKET_SIZE = 188
+
+# Recorder stages that can be placed on CPUs and prioritised on their own
+PIPELINE_STAGES = ("grab", "camera", "encode", "write", "preview")
+REALTIME_PRIORITY = 10  # SCHED_FIFO priority, well below the kernel's own threads
+SCHED_POLICIES = {0: "normal", 1: "fifo", 2: "rr", 3: "batch", 5: "idle"}
+
+# Rate at which the GUI polls the recorder's status and preview
+STATUS_INTERVAL = 1.0 / 15
+
+# Widest frame handed to the live preview for each preview quality, None keeps the full size
+PREVIEW_WIDTHS = {"full": None, "balanced": 960, "low": 480}
+
+# Live previews for other processes: one shared-memory ring per recording,
+# advertised by a small JSON file in this data subdirectory
+PREVIEW_DIRECTORY = "previews"
+
+
+def get_app_data_path(*parts):
+    """Return a path inside the application data directory, creating it if needed"""
+    path = os.path.join(APP_DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+class SequentialFileWriter:
+    """Append-only file writer that moves large aligned blocks to disk on its own thread
+    
+    Callers only copy into an in-memory buffer. Full blocks are queued for an
+    I/O thread, which reserves file extents ahead of the data with
+    posix_fallocate so the file stays contiguous and a full disk is detected
+    when the next extent is reserved rather than in the middle of a frame.
+    Disk errors are raised from the next write() call.
+    
+    fsync policies: "none" leaves flushing to the OS, "interval" syncs every
+    few seconds and "always" syncs after every block.
+    """
+    
+    BLOCK_SIZE = 1024 * 1024
+    QUEUE_BLOCKS = 16                    # Up to 16 MB in flight before write() blocks
+    PREALLOCATE_SIZE = 64 * 1024 * 1024
+    FSYNC_POLICIES = ("none", "interval", "always")
+    
+    def __init__(self, path, fsync_policy="interval", fsync_interval=5.0, preallocate=True, stages=None):
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        
+        self.path = path
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.preallocate = preallocate and hasattr(os, "posix_fallocate")
+        self.stages = stages or PipelineStages()
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.buffer = bytearray()
+        self.position = 0   # Bytes accepted from the caller
+        self.queued = 0     # Bytes handed to the I/O thread
+        self.written = 0    # Bytes on disk
+        self.allocated = 0
+        self.error = None
+        self.closed = False
+        
+        self.blocks = queue.Queue(maxsize=self.QUEUE_BLOCKS)
+        self.thread = threading.Thread(target=self.io_loop, name="eem-writer", daemon=True)
+        self.thread.start()
+    
+    def write(self, data):
+        if self.error:
+            raise self.error
+        
+        self.buffer += data
+        self.position += len(data)
+        
+        # Cut blocks so every write ends on a block boundary, even after a short flush
+        while len(self.buffer) >= self.BLOCK_SIZE - self.queued % self.BLOCK_SIZE:
+            size = self.BLOCK_SIZE - self.queued % self.BLOCK_SIZE
+            self.queue_block(bytes(self.buffer[:size]))
+            del self.buffer[:size]
+        return len(data)
+    
+    def tell(self):
+        return self.position
+    
+    def flush(self):
+        """Hand everything buffered so far to the I/O thread"""
+        if self.buffer:
+            self.queue_block(bytes(self.buffer))
+            self.buffer.clear()
+    
+    def queue_block(self, block):
+        self.queued += len(block)
+        self.blocks.put(block)
+    
+    def io_loop(self):
+        self.stages.enter("write")
+        last_sync = time.time()
+        while True:
+            block = self.blocks.get()
+            if block is None:
+                break
+            if self.error:
+                continue  # Keep draining so the writer never blocks on a dead disk
+            
+            try:
+                self.reserve(len(block))
+                view = memoryview(block)
+                while view:
+                    view = view[os.write(self.fd, view):]
+                self.written += len(block)
+                
+                now = time.time()
+                if self.fsync_policy == "always" or \
+                        (self.fsync_policy == "interval" and now - last_sync >= self.fsync_interval):
+                    getattr(os, "fdatasync", os.fsync)(self.fd)
+                    last_sync = now
+            except OSError as e:
+                self.error = e
+    
+    def reserve(self, size):
+        """Preallocate the next extent before the data reaches the end of the current one"""
+        if not self.preallocate or self.written + size <= self.allocated:
+            return
+        try:
+            os.posix_fallocate(self.fd, self.allocated, max(self.PREALLOCATE_SIZE, size))
+            self.allocated += max(self.PREALLOCATE_SIZE, size)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+            # Filesystem without fallocate support, write without reservations
+            self.preallocate = False
+    
+    def close(self):
+        """Write out the buffer, trim unused preallocation and close; returns any disk error"""
+        if self.closed:
+            return self.error
+        self.closed = True
+        self.flush()
+        self.blocks.put(None)
+        self.thread.join()
+        
+        try:
+            if self.allocated > self.written:
+                os.ftruncate(self.fd, self.written)
+            if self.fsync_policy != "none":
+                os.fsync(self.fd)
+        except OSError as e:
+            self.error = self.error or e
+        finally:
+            os.close(self.fd)
+        return self.error
+
+
+class FrameSpoolWriter:
+    """Append-only spool of intra-only JPEG frames for cheap real-time capture"""
+    
+    FLUSH_INTERVAL = 1.0  # Bounds what a crashed process can lose
+    
+    def __init__(self, path, width, height, fps, jpeg_quality=90, fsync_policy="interval", stages=None):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.jpeg_quality = jpeg_quality
+        self.frame_count = 0
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        
+        # Disk I/O happens on the writer's thread in large aligned blocks
+        self.file = SequentialFileWriter(path, fsync_policy, stages=stages)
+        self.file.write(SPOOL_HEADER.pack(SPOOL_MAGIC, width, height, float(fps), jpeg_quality))
+        self.last_flush = time.time()
+    
+    def isOpened(self):
+        return not self.file.closed
+    
+    def tell(self):
+        """Bytes written so far, the file itself may be larger while space is preallocated"""
+        return self.file.tell()
+    
+    def write(self, frame, timestamp=None):
+        """Compress a BGR frame and append it to the spool, returns the record's byte offset"""
+        ok, payload = cv2.imencode(".jpg", frame, self.encode_params)
+        if not ok:
+            return None
+        
+        offset = self.file.tell()
+        self.file.write(SPOOL_RECORD.pack(timestamp or time.time(), len(payload)))
+        self.file.write(payload.tobytes())
+        self.frame_count += 1
+        
+        now = time.time()
+        if now - self.last_flush >= self.FLUSH_INTERVAL:
+            self.file.flush()
+            self.last_flush = now
+        return offset
+    
+    def release(self):
+        """Close the spool, returns the disk error that stopped writing if any"""
+        return self.file.close()
+
+
+class FrameSpoolReader:
+    """Sequential reader for spool files written by FrameSpoolWriter"""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(SPOOL_HEADER.size)
+        
+        if len(header) < SPOOL_HEADER.size:
+            raise ValueError(f"Spool file is truncated: {path}")
+        
+        magic, self.width, self.height, self.fps, self.jpeg_quality = SPOOL_HEADER.unpack(header)
+        if magic != SPOOL_MAGIC:
+            raise ValueError(f"Not a spool file: {path}")
+    
+    def iter_records(self, read_payload=True):
+        """Yield (timestamp, payload) for every complete record"""
+        file_size = os.path.getsize(self.path)
+        with open(self.path, "rb", buffering=4 * 1024 * 1024) as f:
+            f.seek(SPOOL_HEADER.size)
+            while True:
+                record = f.read(SPOOL_RECORD.size)
+                if len(record) < SPOOL_RECORD.size:
+                    break
+                
+                timestamp, size = SPOOL_RECORD.unpack(record)
+                if size == 0:
+                    break  # Preallocated space that was never written
+                if f.tell() + size > file_size:
+                    break  # Tail was cut off by a crash, keep what we have
+                
+                if read_payload:
+                    payload = f.read(size)
+                else:
+                    payload = None
+                    f.seek(size, os.SEEK_CUR)
+                
+                yield timestamp, payload
+    
+    def count_frames(self):
+        """Count complete records without decoding them"""
+        return sum(1 for _record in self.iter_records(read_payload=False))
+    
+    def __iter__(self):
+        """Yield (timestamp, BGR frame) pairs"""
+        for timestamp, payload in self.iter_records():
+            frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is not None:
+                yield timestamp, frame
+
+
+class FrameIndexWriter:
+    """Sidecar index with one fixed-size record per frame plus pause/resume markers
+    
+    Records hold the capture time relative to the start of the recording, the
+    byte offset of the frame in the recorded file, the output frame number and
+    flags. Fixed-size records let FrameIndexReader binary-search a memory map.
+    """
+    
+    def __init__(self, path, fps, start_time, keyframe_interval=1):
+        self.path = path
+        self.start_time = start_time
+        self.keyframe_interval = keyframe_interval
+        self.frame_count = 0
+        self.file = open(path, "wb", buffering=256 * 1024)
+        self.file.write(INDEX_HEADER.pack(INDEX_MAGIC, 1, keyframe_interval, float(fps), start_time))
+    
+    def add_frame(self, timestamp, offset, keyframe=None):
+        """Record a frame written at a byte offset; keyframes follow the interval unless given"""
+        if keyframe is None:
+            keyframe = self.frame_count % self.keyframe_interval == 0
+        flags = INDEX_KEYFRAME if keyframe else 0
+        self.file.write(INDEX_RECORD.pack(timestamp - self.start_time, offset, self.frame_count, flags))
+        self.frame_count += 1
+    
+    def add_marker(self, timestamp, flag):
+        """Record a pause or resume at the position of the next frame"""
+        self.file.write(INDEX_RECORD.pack(timestamp - self.start_time, 0, self.frame_count, flag))
+    
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class FrameIndexReader:
+    """Memory-mapped reader for FrameIndexWriter sidecars with O(log n) time lookups"""
+    
+    RECORD_DTYPE = np.dtype([("pts", "<f8"), ("offset", "<u8"), ("frame", "<u4"), ("flags", "<u4")])
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size or header[:8] != INDEX_MAGIC:
+            raise ValueError(f"Not a frame index: {path}")
+        
+        _, self.version, self.keyframe_interval, self.fps, self.start_time = INDEX_HEADER.unpack(header)
+        
+        # A crash can leave a partial record at the end, ignore it
+        count = (os.path.getsize(path) - INDEX_HEADER.size) // INDEX_RECORD.size
+        if count > 0:
+            self.records = np.memmap(path, dtype=self.RECORD_DTYPE, mode="r",
+                                     offset=INDEX_HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.RECORD_DTYPE)
+        self._frame_positions = None
+        self._keyframe_positions = None
+    
+    @property
+    def frame_positions(self):
+        """Record positions of real frames, markers excluded"""
+        if self._frame_positions is None:
+            self._frame_positions = np.flatnonzero((self.records["flags"] & INDEX_MARKERS) == 0)
+        return self._frame_positions
+    
+    @property
+    def keyframe_positions(self):
+        if self._keyframe_positions is None:
+            self._keyframe_positions = np.flatnonzero(self.records["flags"] & INDEX_KEYFRAME)
+        return self._keyframe_positions
+    
+    def __len__(self):
+        return len(self.frame_positions)
+    
+    def record(self, position):
+        record = self.records[position]
+        return {
+            "frame": int(record["frame"]),
+            "time": self.start_time + float(record["pts"]),
+            "pts": float(record["pts"]),
+            "offset": int(record["offset"]),
+            "keyframe": bool(record["flags"] & INDEX_KEYFRAME)
+        }
+    
+    def find(self, wall_time):
+        """Return the record position of the frame on screen at a wall-clock time, or -1"""
+        position = int(np.searchsorted(self.records["pts"], wall_time - self.start_time, side="right")) - 1
+        while position >= 0 and self.records["flags"][position] & INDEX_MARKERS:
+            position -= 1
+        return position
+    
+    def frame_at(self, wall_time):
+        """Return the frame shown at a wall-clock time, or None before the first frame"""
+        position = self.find(wall_time)
+        return self.record(position) if position >= 0 else None
+    
+    def keyframe_before(self, wall_time):
+        """Return the last keyframe at or before a wall-clock time, where decoding can start"""
+        position = self.find(wall_time)
+        index = int(np.searchsorted(self.keyframe_positions, position, side="right")) - 1
+        return self.record(self.keyframe_positions[index]) if position >= 0 and index >= 0 else None
+    
+    def frame(self, number):
+        """Return the record of an output frame number"""
+        return self.record(self.frame_positions[number])
+    
+    def pauses(self):
+        """Return (paused, resumed) wall-clock pairs; resumed is None if never resumed"""
+        pauses = []
+        for position in np.flatnonzero(self.records["flags"] & INDEX_MARKERS):
+            record = self.records[position]
+            wall_time = self.start_time + float(record["pts"])
+            if record["flags"] & INDEX_PAUSE:
+                pauses.append([wall_time, None])
+            elif pauses and pauses[-1][1] is None:
+                pauses[-1][1] = wall_time
+        return [tuple(pause) for pause in pauses]
+    
+    def close(self):
+        self.records = None
+
+
+def update_index_from_container(index_file, video_file):
+    """Replace estimated offsets and keyframe flags with the container's real ones
+    
+    Only packet headers are read, in presentation order they match the frame
+    numbers written by the recorder.
+    """
+    output = run_ffmpeg_tool(["-select_streams", "v:0", "-show_entries", "packet=pts_time,pos,flags",
+                              "-of", "csv=p=0", video_file], name="ffprobe")
+    packets = []
+    for line in output.decode(errors="replace").splitlines():
+        fields = line.split(",")
+        if len(fields) >= 3 and fields[0] not in ("", "N/A") and fields[1] not in ("", "N/A"):
+            packets.append((float(fields[0]), int(fields[1]), "K" in fields[2]))
+    packets.sort()
+    
+    reader = FrameIndexReader(index_file)
+    frame_positions = reader.frame_positions
+    reader.close()
+    
+    count = (os.path.getsize(index_file) - INDEX_HEADER.size) // INDEX_RECORD.size
+    if count == 0:
+        return index_file
+    
+    records = np.memmap(index_file, dtype=FrameIndexReader.RECORD_DTYPE, mode="r+",
+                        offset=INDEX_HEADER.size, shape=(count,))
+    usable = min(len(packets), len(frame_positions))
+    positions = frame_positions[:usable]
+    records["offset"][positions] = [packet[1] for packet in packets[:usable]]
+    keyframes = np.array([packet[2] for packet in packets[:usable]], dtype=bool)
+    records["flags"][positions] = (records["flags"][positions] & ~np.uint32(INDEX_KEYFRAME)) | \
+        np.where(keyframes, INDEX_KEYFRAME, 0).astype(np.uint32)
+    records.flush()
+    del records
+    return index_file
+
+
+def grab_screen_frame(x, y, width, height, mouse_cursor=True):
+    """Grab a screen region as a BGR frame"""
+    if mouse_cursor:
+        screen_img = pyautogui.screenshot(region=(x, y, width, height))
+    else:
+        # Alternative method without cursor (would need implementation)
+        screen_img = pyautogui.screenshot(region=(x, y, width, height))
+    
+    screen_frame = np.array(screen_img)
+    return cv2.cvtColor(screen_frame, cv2.COLOR_RGB2BGR)
+
+
+def letterbox_frame(frame, canvas):
+    """Scale a frame into a fixed-size canvas, keeping its aspect ratio with black bars"""
+    out_height, out_width = canvas.shape[:2]
+    height, width = frame.shape[:2]
+    if (width, height) == (out_width, out_height):
+        np.copyto(canvas, frame)
+        return canvas
+    
+    scale = min(out_width / width, out_height / height)
+    new_width, new_height = max(1, int(width * scale)), max(1, int(height * scale))
+    x = (out_width - new_width) // 2
+    y = (out_height - new_height) // 2
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    
+    canvas.fill(0)
+    canvas[y:y + new_height, x:x + new_width] = cv2.resize(frame, (new_width, new_height), interpolation=interpolation)
+    return canvas
+
+
+def list_x11_windows():
+    """Return (window id, title) for the top-level windows listed by the window manager"""
+    if not XLIB_AVAILABLE or not os.environ.get("DISPLAY"):
+        return []
+    
+    display = xdisplay.Display()
+    try:
+        root = display.screen().root
+        client_list = root.get_full_property(display.intern_atom("_NET_CLIENT_LIST"), X.AnyPropertyType)
+        net_wm_name = display.intern_atom("_NET_WM_NAME")
+        utf8_string = display.intern_atom("UTF8_STRING")
+        
+        windows = []
+        for window_id in (client_list.value if client_list else []):
+            window = display.create_resource_object("window", window_id)
+            try:
+                name = window.get_full_property(net_wm_name, utf8_string)
+                title = name.value if name else window.get_wm_name()
+            except xerror.XError:
+                continue  # Closed while we were looking
+            if isinstance(title, bytes):
+                title = title.decode(errors="replace")
+            if title:
+                windows.append((int(window_id), title))
+        return windows
+    finally:
+        display.close()
+
+
+class X11WindowCapture:
+    """Grabs one X11 window at a fixed output size while it moves and resizes
+    
+    A background thread blocks on ConfigureNotify events from its own X
+    connection, so the geometry is only queried when the window changes. With
+    the Composite extension the window's off-screen pixmap is read, which keeps
+    working while other windows cover it; otherwise its visible screen area is
+    grabbed. Frames are letterboxed into the output size.
+    """
+    
+    def __init__(self, window_id, output_size=None, use_composite=True):
+        if not XLIB_AVAILABLE:
+            raise RuntimeError("Window capture needs the python-xlib package")
+        
+        self.window_id = window_id
+        self.display = xdisplay.Display()
+        self.window = self.display.create_resource_object("window", window_id)
+        self.root = self.display.screen().root
+        self.screen_size = (self.display.screen().width_in_pixels, self.display.screen().height_in_pixels)
+        self.lock = threading.Lock()
+        self.geometry = self.query_geometry(self.window, self.root)
+        self.pixmap = None
+        self.pixmap_stale = True
+        self.window_closed = False
+        
+        # The output keeps the starting size, encoders want even dimensions
+        width, height = output_size or self.geometry[2:]
+        self.width, self.height = max(2, width // 2 * 2), max(2, height // 2 * 2)
+        self.canvas = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        
+        self.composite = use_composite and self.display.has_extension("Composite")
+        if self.composite:
+            self.window.composite_redirect_window(composite.RedirectAutomatic)
+            self.display.flush()
+        
+        self.stop_event = threading.Event()
+        self.events_thread = threading.Thread(target=self.watch_events, name="eem-window-events", daemon=True)
+        self.events_thread.start()
+    
+    @staticmethod
+    def query_geometry(window, root):
+        """Return (x, y, width, height) of a window in root coordinates"""
+        geometry = window.get_geometry()
+        origin = root.translate_coords(window, 0, 0)
+        return origin.x, origin.y, geometry.width, geometry.height
+    
+    def watch_events(self):
+        # python-xlib connections are not shared between threads, events get their own
+        display = xdisplay.Display()
+        window = display.create_resource_object("window", self.window_id)
+        root = display.screen().root
+        try:
+            window.change_attributes(event_mask=X.StructureNotifyMask)
+            display.flush()
+            
+            while not self.stop_event.is_set():
+                if not display.pending_events():
+                    select.select([display.fileno()], [], [], 0.25)
+                    continue
+                
+                event = display.next_event()
+                if event.type == X.ConfigureNotify:
+                    try:
+                        geometry = self.query_geometry(window, root)
+                    except xerror.XError:
+                        continue
+                    with self.lock:
+                        # A resized window gets a new backing pixmap
+                        self.pixmap_stale = self.pixmap_stale or geometry[2:] != self.geometry[2:]
+                        self.geometry = geometry
+                elif event.type == X.DestroyNotify:
+                    self.window_closed = True
+                    break
+        except xerror.XError:
+            self.window_closed = True
+        finally:
+            display.close()
+    
+    def grab(self, out=None):
+        """Return the window letterboxed into the output size, copied into out if given
+        
+        While the window is unmapped, off screen or closed the previous frame is repeated.
+        """
+        with self.lock:
+            x, y, width, height = self.geometry
+            pixmap_stale, self.pixmap_stale = self.pixmap_stale, False
+        
+        try:
+            if self.composite:
+                if pixmap_stale or self.pixmap is None:
+                    if self.pixmap is not None:
+                        self.pixmap.free()
+                    self.pixmap = self.window.composite_name_window_pixmap()
+                image = self.pixmap.get_image(0, 0, width, height, X.ZPixmap, 0xffffffff)
+            else:
+                # Only the part of the window that is on screen can be read from the root
+                left, top = max(0, x), max(0, y)
+                right, bottom = min(self.screen_size[0], x + width), min(self.screen_size[1], y + height)
+                width, height = right - left, bottom - top
+                image = None
+                if width > 0 and height > 0:
+                    image = self.root.get_image(left, top, width, height, X.ZPixmap, 0xffffffff)
+        except xerror.XError:
+            image = None
+        
+        if image is not None:
+            # 32 bits per pixel BGRX, rows may carry padding past the window width
+            pixels = np.frombuffer(image.data, dtype=np.uint8).reshape(height, -1, 4)[:, :width, :3]
+            letterbox_frame(pixels, self.canvas)
+        
+        if out is None:
+            return self.canvas
+        np.copyto(out, self.canvas)
+        return out
+    
+    def close(self):
+        self.stop_event.set()
+        self.events_thread.join(timeout=1)
+        try:
+            if self.pixmap is not None:
+                self.pixmap.free()
+            if self.composite:
+                self.window.composite_unredirect_window(composite.RedirectAutomatic)
+            self.display.close()
+        except xerror.XError:
+            pass
+
+
+class SyntheticFrameSource:
+    """Generated frames with a moving block and a frame counter, for soak tests"""
+    
+    def __init__(self, width=640, height=360):
+        self.width, self.height = width, height
+        self.background = np.zeros((height, width, 3), dtype=np.uint8)
+        self.background[:] = (48, 40, 32)
+        cv2.rectangle(self.background, (width // 10, height // 10), (width // 2, height // 2), (200, 160, 60), -1)
+        self.frame_number = 0
+    
+    def grab(self, out=None):
+        frame = out if out is not None else np.empty_like(self.background)
+        np.copyto(frame, self.background)
+        size = max(8, self.height // 8)
+        x = (self.frame_number * 4) % max(1, self.width - size)
+        cv2.rectangle(frame, (x, self.height - 2 * size), (x + size, self.height - size), (60, 60, 230), -1)
+        cv2.putText(frame, str(self.frame_number), (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self.frame_number += 1
+        return frame
+    
+    def close(self):
+        pass
+
+
+# V4L2 enumeration structs from linux/videodev2.h
+V4L2_FMTDESC = struct.Struct("<III32sII12x")  # index, buffer type, flags, description, pixel format, mbus code
+V4L2_FRMSIZE = struct.Struct("<III6I8x")      # index, pixel format, type, discrete or stepwise sizes
+V4L2_FRMIVAL = struct.Struct("<IIIII6I8x")    # index, pixel format, width, height, type, discrete or stepwise intervals
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+
+
+def v4l2_iowr(number, size):
+    return (3 << 30) | (size << 16) | (ord("V") << 8) | number
+
+
+VIDIOC_ENUM_FMT = v4l2_iowr(2, V4L2_FMTDESC.size)
+VIDIOC_ENUM_FRAMESIZES = v4l2_iowr(74, V4L2_FRMSIZE.size)
+VIDIOC_ENUM_FRAMEINTERVALS = v4l2_iowr(75, V4L2_FRMIVAL.size)
+
+CAMERA_FORMATS = ("MJPG", "YUYV")  # Pixel formats read undecoded and decoded off the camera thread
+MJPG_MIN_PIXELS = 640 * 480        # Above this YUYV rarely keeps its frame rate over USB 2, so MJPG is preferred
+MJPG_REDUCED_FLAGS = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2,
+                      4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+
+def v4l2_enumerate(fd, request, layout, *fields):
+    """Unpacked results of an enumerating ioctl for index 0, 1, ... until the driver runs out"""
+    results = []
+    for index in range(256):
+        buffer = bytearray(layout.pack(index, *fields))
+        try:
+            fcntl.ioctl(fd, request, buffer)
+        except OSError:
+            break
+        results.append(layout.unpack(buffer))
+    return results
+
+
+def list_v4l2_modes(device):
+    """Modes a V4L2 camera offers with the fastest rate for each, [] for files, URLs and other platforms"""
+    if not V4L2_AVAILABLE:
+        return []
+    if isinstance(device, int):
+        path = f"/dev/video{device}"
+    elif isinstance(device, str) and device.startswith("/dev/video"):
+        path = device
+    else:
+        return []
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return []
+    
+    modes = []
+    try:
+        for description in v4l2_enumerate(fd, VIDIOC_ENUM_FMT, V4L2_FMTDESC, V4L2_BUF_TYPE_VIDEO_CAPTURE, 0, b"", 0, 0):
+            pixel_format = description[4]
+            fourcc = pixel_format.to_bytes(4, "little").decode("ascii", "replace")
+            for size in v4l2_enumerate(fd, VIDIOC_ENUM_FRAMESIZES, V4L2_FRMSIZE, pixel_format, 0, *[0] * 6):
+                # Discrete sizes come one per index, a stepwise range as its smallest and largest
+                sizes = [size[3:5]] if size[2] == 1 else [(size[3], size[6]), (size[4], size[7])]
+                for width, height in sizes:
+                    intervals = v4l2_enumerate(fd, VIDIOC_ENUM_FRAMEINTERVALS, V4L2_FRMIVAL,
+                                               pixel_format, width, height, 0, *[0] * 6)
+                    # The first fraction is the interval itself, or the shortest of a stepwise range
+                    rates = [interval[6] / interval[5] for interval in intervals if interval[5]]
+                    modes.append({"fourcc": fourcc, "width": width, "height": height, "fps": max(rates, default=0.0)})
+    finally:
+        os.close(fd)
+    return modes
+
+
+def choose_camera_mode(modes, size, fps):
+    """The mode to ask a camera for: one that keeps up with fps, the smallest covering size, MJPG when large"""
+    width, height = size
+    
+    def rank(mode):
+        pixels = mode["width"] * mode["height"]
+        covers = mode["width"] >= width and mode["height"] >= height
+        preferred = "MJPG" if pixels > MJPG_MIN_PIXELS else "YUYV"
+        return (0 < round(mode["fps"]) < fps, not covers, pixels if covers else -pixels, mode["fourcc"] != preferred)
+    
+    usable = [mode for mode in modes if mode["fourcc"] in CAMERA_FORMATS]
+    return min(usable, key=rank) if usable else None
+
+
+def decode_camera_frame(raw, fourcc, width, height, reduction=1):
+    """BGR frame from an undecoded MJPG or YUYV buffer, None if it is incomplete
+
+    MJPG can be decoded straight at 1/2, 1/4 or 1/8 of its size, which costs
+    a fraction of a full decode followed by a resize.
+    """
+    if fourcc == "MJPG":
+        return cv2.imdecode(raw, MJPG_REDUCED_FLAGS[reduction])
+    if raw.size != width * height * 2:
+        return None
+    return cv2.cvtColor(raw.reshape(height, width, 2), cv2.COLOR_YUV2BGR_YUYV)
+
+
+class CameraEffects:
+    """Background blur or chroma key driven by a low-resolution mask
+    
+    The mask is built at a fraction of the camera size and reused for up to
+    max_reuse frames while the downscaled picture barely changes, so most
+    frames only pay for one blend.
+    """
+    # OpenCV hue range (0-179) keyed out for each backdrop colour
+    CHROMA_HUES = {"green": (35, 85), "blue": (95, 130)}
+    
+    def __init__(self, effect="none", scale=0.25, max_reuse=5, motion_threshold=4.0):
+        self.effect = effect
+        self.scale = scale
+        self.max_reuse = max_reuse
+        self.motion_threshold = motion_threshold
+        self.reference = None   # Downscaled grey frame the mask was built from
+        self.weights = None     # Full-size (camera weight, background weight)
+        self.mask_age = 0
+        self.face = None
+        self.builds = 0
+        self.frames = 0
+        self.total_time = 0.0
+        
+        # Chroma key tables: one cv2.LUT pass per HSV channel instead of range tests
+        levels = np.arange(256)
+        low, high = self.CHROMA_HUES.get(effect, (0, -1))
+        self.hue_lut = np.where((levels >= low) & (levels <= high), 255, 0).astype(np.uint8)
+        self.saturation_lut = np.where(levels >= 80, 255, 0).astype(np.uint8)
+        self.value_lut = np.where(levels >= 50, 255, 0).astype(np.uint8)
+        
+        # Blur follows a detected face when OpenCV ships its cascades, else it keeps the centre sharp
+        self.face_detector = None
+        cascade_file = os.path.join(getattr(getattr(cv2, "data", None), "haarcascades", ""),
+                                    "haarcascade_frontalface_default.xml")
+        if effect == "blur" and os.path.exists(cascade_file):
+            self.face_detector = cv2.CascadeClassifier(cascade_file)
+    
+    def __bool__(self):
+        return self.effect != "none"
+    
+    def apply(self, frame):
+        """Return (frame, weights); weights is None when the result is opaque"""
+        if not self:
+            return frame, None
+        
+        started = time.perf_counter()
+        height, width = frame.shape[:2]
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if (self.weights is None or self.mask_age >= self.max_reuse or
+                cv2.absdiff(gray, self.reference).mean() > self.motion_threshold):
+            mask = self.build_chroma_mask(small) if self.effect in self.CHROMA_HUES else self.build_person_mask(gray)
+            weight = cv2.resize(mask, (width, height), interpolation=cv2.INTER_LINEAR)
+            self.weights = (weight, 1 - weight)
+            self.reference = gray
+            self.mask_age = 0
+            self.builds += 1
+        else:
+            self.mask_age += 1
+        
+        weights = self.weights
+        if self.effect == "blur":
+            # Downsample-blur-upsample gives a wide blur for the price of a small one
+            background = cv2.resize(cv2.GaussianBlur(small, (0, 0), 3), (width, height),
+                                    interpolation=cv2.INTER_LINEAR)
+            frame, weights = cv2.blendLinear(frame, background, weights[0], weights[1]), None
+        
+        self.frames += 1
+        self.total_time += time.perf_counter() - started
+        return frame, weights
+    
+    def build_chroma_mask(self, small):
+        """Weight 1 where the pixel is not the backdrop colour"""
+        hue, saturation, value = cv2.split(cv2.cvtColor(small, cv2.COLOR_BGR2HSV))
+        keyed = cv2.LUT(hue, self.hue_lut) & cv2.LUT(saturation, self.saturation_lut) & cv2.LUT(value, self.value_lut)
+        mask = cv2.medianBlur(255 - keyed, 3).astype(np.float32) / 255
+        return cv2.GaussianBlur(mask, (0, 0), 1)
+    
+    def build_person_mask(self, gray):
+        """Weight 1 over the head and shoulders, feathered into the background"""
+        height, width = gray.shape
+        if self.face_detector is not None:
+            faces = self.face_detector.detectMultiScale(gray, 1.2, 3, minSize=(width // 8, width // 8))
+            if len(faces):
+                self.face = max(faces, key=lambda face: face[2] * face[3])
+        x, y, w, h = self.face if self.face is not None else (width // 3, height // 5, width // 3, height * 2 // 5)
+        
+        mask = np.zeros((height, width), dtype=np.float32)
+        center_x = int(x + w / 2)
+        cv2.ellipse(mask, (center_x, int(y + h / 2)), (int(w * 0.7), int(h * 0.9)), 0, 0, 360, 1.0, -1)
+        cv2.ellipse(mask, (center_x, height), (int(w * 1.6), int(height - y - h * 0.8)), 0, 0, 360, 1.0, -1)
+        return cv2.GaussianBlur(mask, (0, 0), max(1.0, width / 40))
+    
+    def metrics(self):
+        """Average cost per camera frame in milliseconds and how often the mask was rebuilt"""
+        return (self.total_time * 1000 / max(1, self.frames), self.builds)
+
+
+class CameraOverlay:
+    """Webcam picture-in-picture shared by the threaded and multi-process pipelines
+    
+    The camera is read on a thread of its own and its frames decoded, scaled
+    and given their effects in a small worker pool; the capture loop only
+    blends the latest finished camera frame. With on_demand the device stays
+    closed and is opened by capture_once() for a single frame.
+    
+    On V4L2 the camera is asked for the mode closest to the camera rectangle
+    and frame rate, in MJPG or YUYV, and delivers its buffers undecoded so
+    the reading thread never spends time converting them.
+    
+    camera_position is a corner name or an (x, y) pixel position, and
+    camera_size the rectangle the camera is stretched, fitted or cropped into.
+    """
+    EFFECT_NAMES = {"blur": "Camera blur", "green": "Green screen", "blue": "Blue screen"}
+    WARMUP_FRAMES = 5      # Reads discarded after opening while exposure settles
+    STALE_SECONDS = 2.0    # A camera silent for this long is left out rather than shown frozen
+    REOPEN_INTERVAL = 2.0  # How often a camera that stopped delivering is opened again
+    DECODE_WORKERS = 2     # Camera frames decoded at once, live frames arriving meanwhile are dropped
+    
+    def __init__(self, camera_device, camera_position="bottom-right", camera_size=(320, 240), fps=30,
+                 effect="none", on_demand=False, scale="stretch", mirror=True, stages=None):
+        # A device index given as text, as scene files may, opens the camera rather than a file
+        if isinstance(camera_device, str) and camera_device.strip().isdigit():
+            camera_device = int(camera_device)
+        self.camera_device = camera_device
+        self.camera_position = camera_position
+        self.camera_size = tuple(camera_size)
+        self.fps = fps
+        self.on_demand = on_demand
+        self.scale = scale
+        self.mirror = mirror
+        self.stages = stages or PipelineStages()
+        self.cap = None
+        self.camera_available = False
+        self.effects = CameraEffects(effect)
+        self.latest = None
+        self.latest_time = 0.0
+        self.latest_sequence = 0
+        self.roi_key = None
+        self.roi = None
+        self.running = False
+        self.reader = None
+        self.raw_mode = None   # (fourcc, width, height, reduction) while buffers arrive undecoded
+        self.mode_name = None
+        self.decoder = None
+        self.slots = threading.Semaphore(self.DECODE_WORKERS)
+        self.decode_lock = threading.Lock()
+        self.effects_lock = threading.Lock()
+        self.decode_time = 0.0
+        self.decoded = 0
+        self.dropped = 0
+        
+        if camera_device is not None:
+            self.cap = self.open_device()
+            self.camera_available = self.cap.isOpened()
+            if on_demand or not self.camera_available:
+                self.cap.release()
+                self.cap = None
+            if not on_demand:
+                # A camera missing at the start is looked for like one unplugged later
+                self.running = True
+                self.decoder = concurrent.futures.ThreadPoolExecutor(
+                    self.DECODE_WORKERS, thread_name_prefix="eem-camera",
+                    initializer=self.stages.enter, initargs=("camera",))
+                self.reader = threading.Thread(target=self.read_loop, name="eem-camera", daemon=True)
+                self.reader.start()
+    
+    def open_device(self):
+        """Open the camera, on V4L2 in the negotiated mode with its buffers left undecoded"""
+        self.raw_mode = None
+        mode = choose_camera_mode(list_v4l2_modes(self.camera_device), self.camera_size, self.fps)
+        if mode:
+            cap = cv2.VideoCapture(self.camera_device, cv2.CAP_V4L2)
+            if cap.isOpened():
+                # The format goes first, the driver picks sizes and rates from those it offers in it
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode["fourcc"]))
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode["width"])
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode["height"])
+                cap.set(cv2.CAP_PROP_FPS, min(self.fps, mode["fps"] or self.fps))
+                fourcc = int(cap.get(cv2.CAP_PROP_FOURCC)).to_bytes(4, "little").decode("ascii", "replace")
+                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                self.mode_name = f"{fourcc} {width}×{height} @ {cap.get(cv2.CAP_PROP_FPS):g} fps"
+                if fourcc in CAMERA_FORMATS and cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+                    # Decode MJPG at the smallest scale that still covers the camera rectangle
+                    reduction = 1
+                    if fourcc == "MJPG":
+                        while (reduction < 8 and width // (reduction * 2) >= self.camera_size[0]
+                               and height // (reduction * 2) >= self.camera_size[1]):
+                            reduction *= 2
+                    self.raw_mode = (fourcc, width, height, reduction)
+                return cap
+            cap.release()
+        
+        cap = cv2.VideoCapture(self.camera_device)
+        if cap.isOpened():
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_size[0])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_size[1])
+            cap.set(cv2.CAP_PROP_FPS, self.fps)
+        return cap
+    
+    def read_loop(self):
+        """Camera thread: read at the camera's own pace and hand frames to the decode workers
+        
+        The capture belongs to this thread, which closes it on the way out.
+        """
+        self.stages.enter("camera")
+        decoder = self.decoder  # Still ours to submit to, and refuse, once release() drops it
+        last_read = time.time()
+        sequence = 0
+        try:
+            while self.running:
+                ret, camera_frame = self.cap.read() if self.cap else (False, None)
+                if not ret:
+                    # Unplugged, stalled or never found, look for it again now and then
+                    if time.time() - last_read >= self.REOPEN_INTERVAL:
+                        if self.cap:
+                            self.cap.release()
+                        self.cap = self.open_device()
+                        last_read = time.time()
+                    time.sleep(0.05)
+                    continue
+                last_read = time.time()
+                
+                # A live camera keeps delivering, so skip its frame rather than fall behind;
+                # files and other sources are read no faster than they are decoded
+                if not self.slots.acquire(blocking=self.raw_mode is None):
+                    self.dropped += 1
+                    continue
+                sequence += 1
+                try:
+                    decoder.submit(self.decode_frame, camera_frame, self.raw_mode, sequence, last_read)
+                except RuntimeError:  # Released while reading
+                    self.slots.release()
+                    break
+        finally:
+            if self.cap:
+                self.cap.release()
+                self.cap = None
+    
+    def decode_frame(self, camera_frame, raw_mode, sequence, read_time):
+        """Decode worker: finish one read, kept unless a newer one finished first"""
+        try:
+            if raw_mode:
+                start = time.perf_counter()
+                camera_frame = decode_camera_frame(camera_frame, *raw_mode)
+                if camera_frame is None:
+                    return
+                with self.decode_lock:
+                    self.decode_time += time.perf_counter() - start
+                    self.decoded += 1
+            processed = self.process_frame(camera_frame)
+            with self.decode_lock:
+                if sequence > self.latest_sequence:
+                    self.latest, self.latest_time, self.latest_sequence = processed, read_time, sequence
+        except cv2.error:
+            pass  # A corrupt buffer, the next one will do
+        finally:
+            self.slots.release()
+    
+    def capture_once(self):
+        """Open the camera, keep one settled frame and close it again"""
+        if self.camera_device is None:
+            return
+        # Tried at every capture, so a camera plugged in later is picked up
+        cap = self.open_device()
+        self.camera_available = cap.isOpened()
+        camera_frame = None
+        for _ in range(self.WARMUP_FRAMES):
+            ret, frame = cap.read()
+            if ret:
+                camera_frame = frame
+        cap.release()
+        if camera_frame is not None and self.raw_mode:
+            camera_frame = decode_camera_frame(camera_frame, *self.raw_mode)
+        if camera_frame is not None:
+            self.latest = self.process_frame(camera_frame)
+    
+    def process_frame(self, camera_frame):
+        """Return (frame, weights) ready to blend"""
+        # Flip camera horizontally for mirror effect
+        if self.mirror:
+            camera_frame = cv2.flip(camera_frame, 1)
+        camera_frame = self.scale_frame(camera_frame)
+        # Masks are reused from frame to frame, so workers take turns
+        with self.effects_lock:
+            camera_frame, weights = self.effects.apply(camera_frame)
+        
+        # A keyed camera has no rectangle to frame
+        if weights is None:
+            camera_frame = self.add_camera_effects(camera_frame)
+        return camera_frame, weights
+    
+    def scale_frame(self, frame):
+        """Resize to the camera rectangle: stretched, fitted inside it, or cropped to fill it"""
+        width, height = self.camera_size
+        frame_height, frame_width = frame.shape[:2]
+        if self.scale == "fit":
+            factor = min(width / frame_width, height / frame_height)
+            width, height = max(1, int(frame_width * factor)), max(1, int(frame_height * factor))
+        elif self.scale == "fill":
+            # Crop to the rectangle's shape first so only the part kept is resized
+            factor = max(width / frame_width, height / frame_height)
+            crop_width = min(frame_width, int(round(width / factor)))
+            crop_height = min(frame_height, int(round(height / factor)))
+            x = (frame_width - crop_width) // 2
+            y = (frame_height - crop_height) // 2
+            frame = frame[y:y + crop_height, x:x + crop_width]
+        # Asked for in the rectangle's own size, a camera needs no resize at all
+        if frame.shape[1] == width and frame.shape[0] == height:
+            return frame
+        return cv2.resize(frame, (width, height))
+    
+    def composite(self, screen_frame):
+        """Draw the latest camera frame onto the screen frame in place"""
+        latest = self.latest
+        if latest is None:
+            return
+        if self.reader and time.time() - self.latest_time > self.STALE_SECONDS:
+            return
+        
+        # Placement only changes with the frame sizes, clip it once for each
+        key = (screen_frame.shape[:2], latest[0].shape[:2])
+        if key != self.roi_key:
+            self.roi_key, self.roi = key, self.compute_roi(*key)
+        
+        # Blend camera frame with screen
+        if self.roi:
+            self.blend_camera_frame(screen_frame, latest, self.roi)
+    
+    def compute_roi(self, screen_shape, camera_shape):
+        """Screen and camera slices for the camera centred in its rectangle, clipped to the screen"""
+        height, width = screen_shape
+        camera_height, camera_width = camera_shape
+        x_pos, y_pos = self.get_camera_position(width, height)
+        x_pos += (self.camera_size[0] - camera_width) // 2
+        y_pos += (self.camera_size[1] - camera_height) // 2
+        
+        x_start, y_start = max(0, x_pos), max(0, y_pos)
+        x_end, y_end = min(width, x_pos + camera_width), min(height, y_pos + camera_height)
+        if x_end <= x_start or y_end <= y_start:
+            return None
+        return ((slice(y_start, y_end), slice(x_start, x_end)),
+                (slice(y_start - y_pos, y_end - y_pos), slice(x_start - x_pos, x_end - x_pos)))
+    
+    def add_camera_effects(self, frame):
+        """Add visual effects to camera frame"""
+        # Add a subtle border
+        cv2.rectangle(frame, (0, 0), (frame.shape[1]-1, frame.shape[0]-1), (255, 255, 255), 2)
+        return frame
+    
+    def metrics(self):
+        """Camera decode and effect cost in the same shape as overlay layer metrics"""
+        if self.latest is None:
+            return {}
+        metrics = {}
+        if self.raw_mode and self.decoded:
+            # Live frames skipped while both decode workers were busy
+            name = f"Camera decode ({self.mode_name}, {self.dropped} dropped)"
+            metrics[name] = (self.decode_time * 1000 / self.decoded, self.decoded)
+        if self.effects:
+            metrics[self.EFFECT_NAMES.get(self.effects.effect, "Camera effect")] = self.effects.metrics()
+        return metrics
+    
+    def get_camera_position(self, width, height):
+        """Calculate camera position based on settings"""
+        margin = 20
+        if isinstance(self.camera_position, (tuple, list)):
+            return tuple(self.camera_position)
+        if self.camera_position == "top-left":
+            return margin, margin
+        elif self.camera_position == "top-right":
+            return width - self.camera_size[0] - margin, margin
+        elif self.camera_position == "bottom-left":
+            return margin, height - self.camera_size[1] - margin
+        else:  # bottom-right
+            return width - self.camera_size[0] - margin, height - self.camera_size[1] - margin
+    
+    def blend_camera_frame(self, screen_frame, latest, roi):
+        """Blend camera frame with screen frame"""
+        camera_frame, weights = latest
+        screen_area, camera_area = roi
+        target = screen_frame[screen_area]
+        if weights is None:
+            target[:] = camera_frame[camera_area]
+        else:
+            target[:] = cv2.blendLinear(camera_frame[camera_area], target,
+                                        weights[0][camera_area], weights[1][camera_area])
+    
+    def release(self):
+        self.running = False
+        if self.reader:
+            # A read stuck in the driver is left to finish, the reader closes the camera after it
+            self.reader.join(timeout=1.0)
+            self.reader = None
+        if self.decoder:
+            self.decoder.shutdown(wait=True)
+            self.decoder = None
+        self.camera_available = False
+
+
+class CameraScene:
+    """Any number of cameras layered over the screen, composited in one pass
+    
+    Every camera is a CameraOverlay reading on its own thread into a
+    latest-frame slot, so a slow or unplugged one never holds up the screen;
+    it just drops out until it delivers again. Layers are blended in z-order
+    into ROIs computed once per frame size.
+    """
+    SCALE_MODES = ("fit", "fill", "stretch")
+    
+    def __init__(self, cameras):
+        # Cameras not found at the start stay in and are looked for again
+        self.cameras = [camera for camera in cameras if camera.camera_device is not None]
+        self.missing = [camera.camera_device for camera in cameras
+                        if camera.camera_device is not None and not camera.camera_available]
+        self.on_demand = any(camera.on_demand for camera in self.cameras)
+    
+    @classmethod
+    def from_sources(cls, sources, frame_size, fps=30, on_demand=False, stages=None):
+        """Open the cameras of a scene description for a frame of the given size"""
+        width, height = frame_size
+        cameras = []
+        for source in sorted(sources, key=lambda source: source.get("z", 0)):
+            x, y, w, h = source["rect"]
+            cameras.append(CameraOverlay(
+                source["device"], (int(x * width), int(y * height)),
+                (max(2, int(w * width)), max(2, int(h * height))), fps, source.get("effect", "none"),
+                on_demand=on_demand, scale=source.get("scale", "fit"), mirror=source.get("mirror", True),
+                stages=stages))
+        return cls(cameras)
+    
+    @property
+    def camera_available(self):
+        return bool(self.cameras)
+    
+    @property
+    def effects(self):
+        return any(camera.effects for camera in self.cameras)
+    
+    def capture_once(self):
+        for camera in self.cameras:
+            camera.capture_once()
+    
+    def composite(self, screen_frame):
+        for camera in self.cameras:
+            camera.composite(screen_frame)
+    
+    def metrics(self):
+        metrics = {}
+        for number, camera in enumerate(self.cameras, 1):
+            for name, value in camera.metrics().items():
+                metrics[f"{name} (camera {number})" if len(self.cameras) > 1 else name] = value
+        return metrics
+    
+    def release(self):
+        for camera in self.cameras:
+            camera.release()
+
+
+def load_camera_scene(path):
+    """Read a camera scene file, raising ValueError on the first problem found
+    
+    The file holds {"cameras": [...]}, each camera a device index or path, a
+    rect [x, y, width, height] as fractions of the recorded frame, and
+    optionally z (higher is drawn on top), scale (fit, fill or stretch), effect
+    and mirror.
+    """
+    try:
+        with open(path, 'r') as f:
+            scene = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read the scene file: {e}")
+    
+    sources = scene.get("cameras") if isinstance(scene, dict) else None
+    if not isinstance(sources, list) or not sources:
+        raise ValueError("The scene file lists no cameras")
+    for number, source in enumerate(sources, 1):
+        rect = source.get("rect") if isinstance(source, dict) else None
+        if not isinstance(source, dict) or not isinstance(source.get("device"), (int, str)):
+            raise ValueError(f"Camera {number} has no device")
+        if (not isinstance(rect, list) or len(rect) != 4 or
+                not all(isinstance(value, (int, float)) and 0 <= value <= 1 for value in rect) or
+                rect[2] <= 0 or rect[3] <= 0):
+            raise ValueError(f"Camera {number}: rect must be [x, y, width, height] as fractions of the frame")
+        if source.get("scale", "fit") not in CameraScene.SCALE_MODES:
+            raise ValueError(f"Camera {number}: scale must be one of {', '.join(CameraScene.SCALE_MODES)}")
+        if source.get("effect", "none") not in ("none", *CameraOverlay.EFFECT_NAMES):
+            raise ValueError(f"Camera {number}: unknown effect {source['effect']}")
+    return sources
+
+
+class OverlayLayer(ABC):
+    """A burned-in overlay, kept as a cached BGRA tile and redrawn only when its content changes"""
+    
+    def __init__(self, name, position="top-left", margin=20):
+        self.name = name
+        self.position = position
+        self.margin = margin
+        self.content_key = None
+        self.tile = None
+        self.renders = 0
+    
+    def current_key(self):
+        """Value that changes exactly when the layer needs to be redrawn"""
+        return None
+    
+    @abstractmethod
+    def render(self):
+        """Return the layer as a BGRA image"""
+    
+    def update(self):
+        key = self.current_key()
+        if self.tile is None or key != self.content_key:
+            self.content_key = key
+            self.set_tile(self.render())
+            self.renders += 1
+    
+    def set_tile(self, bgra):
+        """Crop to the visible pixels and precompute the blend terms"""
+        alpha = bgra[:, :, 3]
+        rows = np.flatnonzero(alpha.any(axis=1))
+        cols = np.flatnonzero(alpha.any(axis=0))
+        if len(rows) == 0:
+            self.tile = None
+            return
+        
+        bgra = bgra[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        weight = bgra[:, :, 3].astype(np.float32) / 255
+        self.tile = (np.ascontiguousarray(bgra[:, :, :3]), weight, 1 - weight)
+    
+    def get_origin(self, width, height, tile_width, tile_height):
+        if self.position == "top-left":
+            return self.margin, self.margin
+        elif self.position == "top-right":
+            return width - tile_width - self.margin, self.margin
+        elif self.position == "bottom-left":
+            return self.margin, height - tile_height - self.margin
+        else:  # bottom-right
+            return width - tile_width - self.margin, height - tile_height - self.margin
+    
+    def blend(self, frame):
+        """Alpha-blend the cached tile into its region of the frame in place"""
+        if self.tile is None:
+            return
+        
+        color, weight, frame_weight = self.tile
+        tile_height, tile_width = weight.shape
+        height, width = frame.shape[:2]
+        x, y = self.get_origin(width, height, tile_width, tile_height)
+        
+        # Clip against the frame edges
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(width, x + tile_width), min(height, y + tile_height)
+        if right <= left or bottom <= top:
+            return
+        
+        tile_rows = slice(top - y, bottom - y)
+        tile_cols = slice(left - x, right - x)
+        roi = frame[top:bottom, left:right]
+        roi[:] = cv2.blendLinear(color[tile_rows, tile_cols], roi,
+                                 weight[tile_rows, tile_cols], frame_weight[tile_rows, tile_cols])
+
+
+class TextOverlayLayer(OverlayLayer):
+    """White text on a translucent dark plate"""
+    
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    
+    def __init__(self, name, text="", position="bottom-left", font_scale=0.7, margin=20):
+        super().__init__(name, position, margin)
+        self.text = text
+        self.font_scale = font_scale
+    
+    def current_key(self):
+        return self.text
+    
+    def render(self):
+        text = self.current_key()
+        thickness = max(1, int(round(self.font_scale * 2)))
+        (text_width, text_height), baseline = cv2.getTextSize(text, self.FONT, self.font_scale, thickness)
+        padding = 8
+        tile = np.zeros((text_height + baseline + padding * 2, text_width + padding * 2, 4), dtype=np.uint8)
+        tile[:] = (0, 0, 0, 140)
+        cv2.putText(tile, text, (padding, padding + text_height), self.FONT, self.font_scale,
+                    (255, 255, 255, 255), thickness, cv2.LINE_AA)
+        return tile
+
+
+class TimestampOverlayLayer(TextOverlayLayer):
+    """Wall-clock time, redrawn once per second when the text changes"""
+    
+    def __init__(self, name="Timestamp", time_format="%Y-%m-%d %H:%M:%S", position="top-left", font_scale=0.7):
+        super().__init__(name, "", position, font_scale)
+        self.time_format = time_format
+    
+    def current_key(self):
+        return time.strftime(self.time_format)
+
+
+class ImageOverlayLayer(OverlayLayer):
+    """Logo or watermark loaded from an image file, transparent PNGs keep their alpha"""
+    
+    def __init__(self, name, path, position="top-right", max_width=160, opacity=0.8, margin=20):
+        super().__init__(name, position, margin)
+        self.path = path
+        self.max_width = max_width
+        self.opacity = opacity
+    
+    def current_key(self):
+        return self.path
+    
+    def render(self):
+        image = cv2.imread(self.path, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            return np.zeros((1, 1, 4), dtype=np.uint8)
+        
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+        elif image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+        
+        if image.shape[1] > self.max_width:
+            height = max(1, image.shape[0] * self.max_width // image.shape[1])
+            image = cv2.resize(image, (self.max_width, height), interpolation=cv2.INTER_AREA)
+        
+        image[:, :, 3] = (image[:, :, 3] * self.opacity).astype(np.uint8)
+        return image
+
+
+class OverlayCompositor:
+    """Applies overlay layers to each frame and keeps per-layer timing"""
+    
+    def __init__(self, layers=None):
+        self.layers = layers or []
+        self.costs = {layer.name: [0.0, 0] for layer in self.layers}  # seconds, frames
+    
+    @classmethod
+    def from_settings(cls, settings):
+        """Build layers from the overlay settings saved by the Settings tab"""
+        layers = []
+        if settings.get("timestamp"):
+            layers.append(TimestampOverlayLayer())
+        if settings.get("logo") and os.path.exists(settings["logo"]):
+            layers.append(ImageOverlayLayer("Logo", settings["logo"]))
+        if settings.get("label"):
+            layers.append(TextOverlayLayer("Label", settings["label"]))
+        return cls(layers)
+    
+    def __bool__(self):
+        return bool(self.layers)
+    
+    def apply(self, frame):
+        for layer in self.layers:
+            start = time.perf_counter()
+            layer.update()
+            layer.blend(frame)
+            cost = self.costs[layer.name]
+            cost[0] += time.perf_counter() - start
+            cost[1] += 1
+    
+    def metrics(self):
+        """Return {layer name: (average ms per frame, times rendered)}"""
+        return {
+            layer.name: (self.costs[layer.name][0] * 1000 / max(1, self.costs[layer.name][1]), layer.renders)
+            for layer in self.layers
+        }
+
+
+class ReadOnlySegment:
+    """Read-only mapping of a POSIX shared-memory segment, shaped like SharedMemory"""
+    
+    def __init__(self, name):
+        self.name = name
+        with open(os.path.join("/dev/shm", name), "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buf = memoryview(self.mmap)
+    
+    def close(self):
+        self.buf.release()
+        self.mmap.close()
+
+
+class SharedFrameRing:
+    """Fixed-size frame slots in shared memory, guarded by per-slot sequence numbers
+    
+    Writers make a slot's sequence odd while filling it and even when done, so
+    readers can copy a slot without locks and retry if it changed underneath them.
+    """
+    
+    HEADER = struct.Struct("<8sIIIIqQ")  # magic, width, height, channels, slots, latest slot, latest seq
+    LATEST = struct.Struct("<qQ")        # Trailing header fields, updated on every publish
+    LATEST_OFFSET = HEADER.size - LATEST.size
+    SLOT_HEADER = struct.Struct("<Qd")   # sequence, capture timestamp
+    SLOT_HEADER_SIZE = 64                # Keeps frame data cache-line aligned
+    MAGIC = b"EEMRING1"
+    
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        magic, self.width, self.height, self.channels, self.slot_count, _, _ = \
+            self.HEADER.unpack_from(shm.buf, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Shared memory segment is not a frame ring")
+        
+        self.frame_bytes = self.width * self.height * self.channels
+        self.slot_stride = self.SLOT_HEADER_SIZE + self.frame_bytes
+        self.data_offset = self.SLOT_HEADER_SIZE * ((self.HEADER.size + self.SLOT_HEADER_SIZE - 1) // self.SLOT_HEADER_SIZE)
+        self.frames = [
+            np.ndarray((self.height, self.width, self.channels), dtype=np.uint8, buffer=shm.buf,
+                       offset=self.data_offset + i * self.slot_stride + self.SLOT_HEADER_SIZE)
+            for i in range(self.slot_count)
+        ]
+    
+    @property
+    def name(self):
+        return self.shm.name
+    
+    @classmethod
+    def create(cls, width, height, slot_count, channels=3, name=None):
+        """Allocate a new ring owned by the calling process"""
+        header_size = cls.SLOT_HEADER_SIZE * ((cls.HEADER.size + cls.SLOT_HEADER_SIZE - 1) // cls.SLOT_HEADER_SIZE)
+        size = header_size + slot_count * (cls.SLOT_HEADER_SIZE + width * height * channels)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:header_size] = bytes(header_size)
+        cls.HEADER.pack_into(shm.buf, 0, cls.MAGIC, width, height, channels, slot_count, -1, 0)
+        return cls(shm, owner=True)
+    
+    @classmethod
+    def attach(cls, name, untrack=False, readonly=False):
+        """Map an existing ring created by another process"""
+        if readonly and os.path.exists(os.path.join("/dev/shm", name)):
+            # A read-only mapping cannot disturb the writer, and is never tracked
+            return cls(ReadOnlySegment(name), owner=False)
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack:
+            # Unrelated processes have their own resource tracker, which would
+            # otherwise unlink the segment when this reader exits
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return cls(shm, owner=False)
+    
+    def slot_offset(self, slot):
+        return self.data_offset + slot * self.slot_stride
+    
+    def begin_write(self, slot):
+        """Mark a slot as being written and return its frame buffer"""
+        seq, _ = self.SLOT_HEADER.unpack_from(self.shm.buf, self.slot_offset(slot))
+        self.SLOT_HEADER.pack_into(self.shm.buf, self.slot_offset(slot), seq | 1, 0.0)
+        return self.frames[slot]
+    
+    def end_write(self, slot, timestamp):
+        """Publish a filled slot as the latest frame"""
+        seq, _ = self.SLOT_HEADER.unpack_from(self.shm.buf, self.slot_offset(slot))
+        seq = (seq | 1) + 1
+        self.SLOT_HEADER.pack_into(self.shm.buf, self.slot_offset(slot), seq, timestamp)
+        self.LATEST.pack_into(self.shm.buf, self.LATEST_OFFSET, slot, seq)
+        return seq
+    
+    def write(self, slot, frame, timestamp):
+        np.copyto(self.begin_write(slot), frame)
+        return self.end_write(slot, timestamp)
+    
+    def latest(self):
+        """Return (slot, sequence) of the most recently published frame"""
+        return self.LATEST.unpack_from(self.shm.buf, self.LATEST_OFFSET)
+    
+    def read(self, slot, out=None, retries=3):
+        """Copy a slot without locking, returns (frame, seq, timestamp) or None if it kept changing"""
+        offset = self.slot_offset(slot)
+        for _ in range(retries):
+            seq_before, timestamp = self.SLOT_HEADER.unpack_from(self.shm.buf, offset)
+            if seq_before & 1:
+                continue
+            
+            if out is None:
+                frame = self.frames[slot].copy()
+            else:
+                np.copyto(out, self.frames[slot])
+                frame = out
+            
+            seq_after, _ = self.SLOT_HEADER.unpack_from(self.shm.buf, offset)
+            if seq_before == seq_after:
+                return frame, seq_before, timestamp
+        return None
+    
+    def read_latest(self, out=None):
+        slot, _ = self.latest()
+        if slot < 0:
+            return None
+        return self.read(slot, out)
+    
+    def close(self):
+        self.frames = []
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def list_previews():
+    """Return the advertised previews whose recorder is still running, newest first"""
+    directory = os.path.dirname(get_app_data_path(PREVIEW_DIRECTORY, "previews.json"))
+    previews = []
+    for entry in os.listdir(directory):
+        if not entry.endswith(".json"):
+            continue
+        path = os.path.join(directory, entry)
+        try:
+            with open(path, 'r') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if psutil.pid_exists(info.get("pid", -1)):
+            previews.append(info)
+        else:
+            # Left behind by a recorder that crashed
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return sorted(previews, key=lambda info: info.get("started", 0), reverse=True)
+
+
+class PreviewPublisher:
+    """Publishes downscaled recording frames to a named SharedFrameRing
+    
+    Viewers map the ring themselves and copy the latest slot without locks.
+    Nothing is sent to them, so the recorder pays one resize per published
+    frame however many are attached.
+    """
+    
+    SLOTS = 3  # A slow reader's slot is not reused until two more frames are published
+    
+    def __init__(self, width, height, output_file="", max_width=640, fps=10):
+        scale = min(1.0, max_width / width)
+        self.size = (max(2, int(width * scale)), max(2, int(height * scale)))
+        self.interval = 1.0 / fps
+        self.next_publish = 0.0
+        self.slot = 0
+        
+        name = f"eem_preview_{os.getpid()}"
+        try:
+            self.ring = SharedFrameRing.create(self.size[0], self.size[1], self.SLOTS, name=name)
+        except FileExistsError:
+            # Left behind by an earlier process with the same id
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.ring = SharedFrameRing.create(self.size[0], self.size[1], self.SLOTS, name=name)
+        
+        self.info_file = get_app_data_path(PREVIEW_DIRECTORY, f"{name}.json")
+        with open(self.info_file, 'w') as f:
+            json.dump({"name": name, "pid": os.getpid(), "width": self.size[0], "height": self.size[1],
+                       "output_file": output_file, "started": time.time()}, f)
+    
+    @property
+    def name(self):
+        return self.ring.name
+    
+    def publish(self, frame, timestamp=None):
+        """Downscale a BGR frame straight into the next slot, at most at the preview rate"""
+        now = time.time()
+        if now < self.next_publish:
+            return False
+        self.next_publish = now + self.interval
+        # Bilinear is several times cheaper than area averaging and good enough to monitor with
+        cv2.resize(frame, self.size, dst=self.ring.begin_write(self.slot), interpolation=cv2.INTER_LINEAR)
+        self.ring.end_write(self.slot, timestamp or now)
+        self.slot = (self.slot + 1) % self.SLOTS
+        return True
+    
+    def close(self):
+        try:
+            os.remove(self.info_file)
+        except OSError:
+            pass
+        self.ring.close()
+
+
+def cpu_topology():
+    """Return the CPUs this process may use, grouped by physical core"""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    cores = {}
+    for cpu in cpus:
+        try:
+            topology = f"/sys/devices/system/cpu/cpu{cpu}/topology/"
+            with open(topology + "physical_package_id") as f:
+                package = f.read().strip()
+            with open(topology + "core_id") as f:
+                key = (package, f.read().strip())
+        except OSError:
+            key = cpu
+        cores.setdefault(key, []).append(cpu)
+    return list(cores.values())
+
+
+def parse_cpu_list(text):
+    """Parse a CPU list such as "0,2,4-7" into sorted CPU numbers"""
+    cpus = set()
+    for part in text.replace(" ", "").split(","):
+        if part:
+            first, _, last = part.partition("-")
+            cpus.update(range(int(first), int(last or first) + 1))
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus):
+    """Inverse of parse_cpu_list, collapsing runs into ranges"""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{first}-{last}" if last > first else str(first) for first, last in ranges)
+
+
+def default_stage_scheduling(cores=None):
+    """Per-stage CPU sets and nice levels suited to this machine's cores
+    
+    With four or more physical cores, grab and camera each get a core of their
+    own from the top of the range, away from CPU 0 where most interrupts land,
+    and the other stages share the rest. The preview is only for show, so it
+    yields to everything else.
+    """
+    cores = cpu_topology() if cores is None else cores
+    scheduling = {stage: {"cpus": None, "nice": 0, "realtime": False} for stage in PIPELINE_STAGES}
+    scheduling["preview"]["nice"] = 5
+    if len(cores) >= 4:
+        shared = sorted(cpu for core in cores[:-2] for cpu in core)
+        scheduling["grab"]["cpus"] = sorted(cores[-1])
+        scheduling["camera"]["cpus"] = sorted(cores[-2])
+        for stage in ("encode", "write", "preview"):
+            scheduling[stage]["cpus"] = shared
+    return scheduling
+
+
+def resolve_stage_scheduling(settings):
+    """Turn saved stage settings, whose CPU lists may be "auto" or blank, into concrete ones"""
+    defaults = default_stage_scheduling()
+    scheduling = {}
+    for stage in PIPELINE_STAGES:
+        stage_settings = settings.get(stage, {})
+        cpus = stage_settings.get("cpus", "auto")
+        if cpus == "auto":
+            cpus = defaults[stage]["cpus"]
+        else:
+            cpus = parse_cpu_list(cpus) or None
+        scheduling[stage] = {"cpus": cpus,
+                             "nice": stage_settings.get("nice", defaults[stage]["nice"]),
+                             "realtime": stage_settings.get("realtime", False)}
+    return scheduling
+
+
+def apply_stage_scheduling(settings, pid=None, tid=None, all_cpus=None):
+    """Apply a stage's CPU set, nice level and scheduling policy
+    
+    Targets the calling thread by default, or every thread a process has so
+    far. On Linux each of these calls affects only the thread id given. All
+    three are set even when left at their defaults, since new threads and
+    processes inherit them from whichever stage started them. Returns what
+    the OS refused, as messages.
+    """
+    if pid is not None:
+        try:
+            tids = [thread.id for thread in psutil.Process(pid).threads()]
+        except psutil.Error:
+            return ["process exited"]
+    else:
+        tids = [tid or threading.get_native_id()]
+    
+    cpus = settings.get("cpus") or all_cpus
+    nice = settings.get("nice", 0)
+    realtime = settings.get("realtime", False)
+    errors = set()
+    for target in tids:
+        try:
+            if cpus:
+                os.sched_setaffinity(target, cpus)
+        except (OSError, AttributeError) as e:
+            errors.add(f"CPUs {format_cpu_list(cpus)}: {getattr(e, 'strerror', None) or 'unsupported'}")
+        try:
+            if os.getpriority(os.PRIO_PROCESS, target) != nice:
+                os.setpriority(os.PRIO_PROCESS, target, nice)
+        except (OSError, AttributeError) as e:
+            errors.add(f"nice {nice}: {getattr(e, 'strerror', None) or 'unsupported'}")
+        try:
+            # The stage loops sleep every frame, so FIFO cannot starve the machine
+            policy = os.SCHED_FIFO if realtime else os.SCHED_OTHER
+            if os.sched_getscheduler(target) != policy:
+                os.sched_setscheduler(target, policy, os.sched_param(REALTIME_PRIORITY if realtime else 0))
+        except (OSError, AttributeError) as e:
+            errors.add(f"{'real-time' if realtime else 'normal'} policy: {getattr(e, 'strerror', None) or 'unsupported'}")
+    return sorted(errors)
+
+
+def read_thread_placement(pid, tid=None):
+    """Where a thread (or all of a process) may run, last ran, its nice level,
+    policy and total run-queue wait; None once it has exited
+    """
+    try:
+        tids = [tid] if tid else [int(task) for task in os.listdir(f"/proc/{pid}/task")]
+        placement = {"cpus": sorted(os.sched_getaffinity(tids[0])), "last_cpus": set(),
+                     "nice": 0, "policy": "normal", "wait_ns": None}
+        for task in tids:
+            base = f"/proc/{pid}/task/{task}/"
+            with open(base + "stat") as f:
+                fields = f.read().rpartition(")")[2].split()
+            placement["last_cpus"].add(int(fields[36]))
+            placement["nice"] = int(fields[16])
+            placement["policy"] = SCHED_POLICIES.get(int(fields[38]), fields[38])
+            try:
+                with open(base + "schedstat") as f:
+                    placement["wait_ns"] = (placement["wait_ns"] or 0) + int(f.read().split()[1])
+            except OSError:
+                pass  # Kernel built without scheduler statistics
+        return placement
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class PipelineStages:
+    """The recorder stage threads running in this process and their scheduling
+    
+    Each recorder, and each of its worker processes, has its own instance
+    configured before its threads start. Every stage thread calls enter() as
+    it starts, and the entries are reported in the Analytics tab. Without
+    settings, enter() only names the thread.
+    """
+    
+    def __init__(self, settings=None):
+        self.lock = threading.Lock()
+        self.configure(settings)
+    
+    def configure(self, settings):
+        with self.lock:
+            self.settings = settings or {}
+            self.threads = []
+            # The process's own mask, for stages that may run anywhere
+            try:
+                self.all_cpus = sorted(psutil.Process().cpu_affinity())
+            except (psutil.Error, AttributeError):
+                self.all_cpus = None
+    
+    def enter(self, stage, shared=(), pid=None):
+        """Name the calling thread after its stage, or take over a child process, and apply the stage's settings"""
+        tid = None
+        if pid is None:
+            tid = threading.get_native_id()
+            threading.current_thread().name = f"eem-{stage}"
+            try:
+                with open(f"/proc/self/task/{tid}/comm", 'w') as f:
+                    f.write(f"eem-{stage}")
+            except OSError:
+                pass
+        
+        if not self.settings:
+            errors = []  # Scheduling left to the OS
+        else:
+            settings = self.settings.get(stage, {})
+            errors = apply_stage_scheduling(settings, pid, tid, self.all_cpus)
+        with self.lock:
+            self.threads.append({"stages": [stage, *shared], "pid": pid or os.getpid(), "tid": tid,
+                                 "settings": self.settings.get(stage, {}), "errors": errors})
+    
+    def snapshot(self):
+        with self.lock:
+            return [dict(thread) for thread in self.threads]
+
+
+class StageTimer:
+    """Time spent in each stage of a frame loop, reported as ms per frame"""
+    
+    def __init__(self):
+        self.totals = {}
+        self.frames = 0
+        self.last = None
+    
+    def start(self):
+        self.last = time.perf_counter()
+    
+    def lap(self, stage):
+        """Charge the time since the previous lap to stage"""
+        now = time.perf_counter()
+        self.totals[stage] = self.totals.get(stage, 0.0) + now - self.last
+        self.last = now
+    
+    def frame(self):
+        self.frames += 1
+    
+    def report(self):
+        """Mean ms per frame of each stage since the last report, then start over"""
+        frames = max(1, self.frames)
+        timings = {stage: round(total * 1000 / frames, 3) for stage, total in self.totals.items()}
+        self.totals = {}
+        self.frames = 0
+        return timings
+
+
+class PreRollBuffer:
+    """The most recent frames and their capture times, in preallocated slots
+    
+    While armed, pushing into a full buffer overwrites the oldest frame. Once
+    recording, the oldest frame is popped and written before each push, so
+    the output runs the length of the buffer behind the live image.
+    """
+    
+    def __init__(self, seconds, fps, width, height, max_memory_mb=512):
+        # At high resolutions the buffer holds fewer frames than asked for rather than run out of memory
+        count = min(int(round(seconds * fps)), max_memory_mb * 1024 * 1024 // (width * height * 3))
+        self.frames = np.empty((max(1, count), height, width, 3), dtype=np.uint8)
+        self.times = [0.0] * len(self.frames)
+        self.first = 0
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def full(self):
+        return self.count == len(self.frames)
+    
+    def push(self, frame, timestamp):
+        """Copy frame in, dropping the oldest one if the buffer is full"""
+        slot = (self.first + self.count) % len(self.frames)
+        np.copyto(self.frames[slot], frame)
+        self.times[slot] = timestamp
+        if self.full():
+            self.first = (self.first + 1) % len(self.frames)
+        else:
+            self.count += 1
+    
+    def pop(self):
+        """The oldest (frame, timestamp); the frame is only valid until the next push"""
+        slot = self.first
+        self.first = (self.first + 1) % len(self.frames)
+        self.count -= 1
+        return self.frames[slot], self.times[slot]
+    
+    def oldest_time(self):
+        """Capture time of the oldest frame, or now if there is none yet"""
+        return self.times[self.first] if self.count else time.time()
+
+
+def preview_image(frame, max_width=None):
+    """RGB copy of a BGR frame for the live preview, downscaled first so the conversion stays small"""
+    if max_width and frame.shape[1] > max_width:
+        height = max(2, frame.shape[0] * max_width // frame.shape[1])
+        frame = cv2.resize(frame, (max_width, height), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+class RecorderStatus:
+    """Latest recorder state, written by the recorder and polled by the GUI
+    
+    Each publish replaces the whole snapshot dict with one assignment, which is
+    atomic under the GIL, so a reader always gets a consistent set of values
+    without locks, and nothing queues up in the GUI's event loop however fast
+    frames are recorded.
+    """
+    
+    def __init__(self):
+        self.snapshot = {"duration": 0, "fps": 0.0, "file_size": 0, "frames": 0,
+                         "preview": None, "preview_seq": 0}
+    
+    def publish(self, **values):
+        self.snapshot = {**self.snapshot, **values}
+    
+    def publish_preview(self, frame):
+        self.publish(preview=frame, preview_seq=self.snapshot["preview_seq"] + 1)
+
 
 class AdvancedScreenRecorder(QThread):
-    update_frame = Signal(np.ndarray)
     recording_finished = Signal()
-    progress_update = Signal(int)  # Recording duration in seconds
-    fps_update = Signal(float)     # Current FPS
-    file_size_update = Signal(int) # File size in bytes
+    pipeline_error = Signal(str)   # Writing the recording failed
+    segment_started = Signal(str, str)  # Output and recorded file of an overflow segment
+    
+    TIMELAPSE_THRESHOLD = 1.5  # Mean grey level change on a 64x36 thumbnail that counts as a change
+    STANDBY_FPS = 2  # Capture rate while armed without a pre-roll
+    
+    def __init__(self, output_file, screen_region=None, camera_device=0, 
+                 camera_position="bottom-right", camera_size=(320, 240), 
+                 fps=30, quality=85, record_audio=True, mouse_cursor=True, 
+                 capture_mode="direct", fsync_policy="interval", window_id=None, overlay_settings=None,
+                 stream_targets=None, camera_effect="none", frame_source=None, accelerated=False,
+                 stream_preset="veryfast", timelapse_interval=None, timelapse_idle="keep",
+                 publish_preview=False, stage_scheduling=None, camera_scene=None, proxy_ladder=None,
+                 armed=False, pre_roll=0.0, preview_width=None, parent=None):
+        super().__init__(parent)
+        # Stage threads started from here on pick up their CPU and priority settings
+        self.stages = PipelineStages(stage_scheduling)
+        self.capture_mode = capture_mode
+        self.proxy_rungs = proxy_ladder or []
+        self.proxy_ladder = None
+        self.proxy_files = []
+        self.proxy_stats = []
+        self.publish_preview = publish_preview
+        self.preview_publisher = None
+        self.preview_width = preview_width
+        self.frame_pacing = None
+        self.stage_timings = {}
+        self.dropped_frames = 0
+        self.status = RecorderStatus()
+        self.stream_preset = stream_preset
+        self.accelerated = accelerated
+        self.timelapse_interval = timelapse_interval
+        self.timelapse_idle = timelapse_idle
+        self.timelapse_reference = None
+        self.timelapse_previous = None
+        self.wake_event = threading.Event()
+        self.fsync_policy = fsync_policy
+        self.stream_targets = stream_targets or []
+        self.stream_stats = []
+        self.screen_region = screen_region
+        self.camera_device = camera_device
+        self.camera_position = camera_position
+        self.camera_size = camera_size
+        self.fps = fps
+        self.quality = quality
+        self.record_audio = record_audio
+        self.mouse_cursor = mouse_cursor
+        self.is_recording = False
+        self.is_paused = False
+        self.frame_count = 0
+        self.start_time = None
+        
+        # Get screen dimensions
+        self.screen_width, self.screen_height = pyautogui.size()
+        
+        # A followed window or synthetic source fixes the output size to its starting size
+        self.frame_source = frame_source or (X11WindowCapture(window_id) if window_id else None)
+        if self.frame_source:
+            self.x, self.y = 0, 0
+            self.width, self.height = self.frame_source.width, self.frame_source.height
+            self.source_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        elif screen_region:
+            self.x, self.y, self.width, self.height = screen_region
+        else:
+            self.x, self.y = 0, 0
+            self.width, self.height = self.screen_width, self.screen_height
+        
+        # Initialize video writer with better codec
+        self.fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.segments = []  # (output file, recorded file) for each volume the recording used
+        self.pending_directory = None
+        self.open_output(output_file)
+        
+        # Initialize camera if available, or every camera of a scene
+        # A timelapse opens the cameras only for the moment of each capture
+        if camera_scene:
+            self.camera = CameraScene.from_sources(camera_scene, (self.width, self.height), fps,
+                                                   on_demand=bool(timelapse_interval), stages=self.stages)
+        else:
+            self.camera = CameraScene([CameraOverlay(camera_device, camera_position, camera_size, fps, camera_effect,
+                                                     on_demand=bool(timelapse_interval), stages=self.stages)])
+        self.camera_available = self.camera.camera_available
+        
+        # Burned-in timestamp, logo and label
+        self.overlays = OverlayCompositor.from_settings(overlay_settings or {})
+        self.overlay_costs = {}
+        
+        # Armed, run() idles in standby with everything open until trigger() or stop
+        self.armed = armed
+        self.triggered = False
+        self.pre_roll = PreRollBuffer(pre_roll, fps, self.width, self.height) if armed and pre_roll else None
+        self.stage_timer = None
+    
+    def open_output(self, output_file):
+        """Open the writer for a recording segment"""
+        self.output_file = output_file
+        if self.capture_mode == "spool":
+            # Cheap intra-only capture, the final encode happens after stop
+            self.record_file = output_file + ".spool"
+            self.out = FrameSpoolWriter(self.record_file, self.width, self.height, self.fps,
+                                        fsync_policy=self.fsync_policy, stages=self.stages)
+        elif self.stream_targets:
+            # One encode feeds both the file and the network streams
+            self.record_file = output_file
+            self.out = TeeStreamWriter(output_file, self.width, self.height, self.fps, self.quality,
+                                       self.stream_targets, self.stream_preset, self.stages)
+        else:
+            self.record_file = output_file
+            self.out = cv2.VideoWriter(output_file, self.fourcc, self.fps, (self.width, self.height))
+        self.segments.append((output_file, self.record_file))
+        
+        # Editing proxies of this segment, scaled from the same frames
+        if self.proxy_rungs:
+            self.proxy_ladder = ProxyLadder(output_file, self.width, self.height, self.fps, self.proxy_rungs,
+                                            self.quality, self.stream_preset)
+            self.proxy_files += self.proxy_ladder.files
+    
+    def release_proxies(self):
+        """Finish the proxy files; a proxy that failed is reported in its stats, not as a recording error"""
+        if self.proxy_ladder:
+            self.proxy_ladder.release()
+            self.proxy_stats = self.proxy_ladder.stats()
+            self.proxy_ladder = None
+    
+    def open_index(self, start_time):
+        # Frame times and offsets for seeking without probing the container
+        if self.capture_mode == "spool":
+            keyframe_interval = 1
+        else:
+            keyframe_interval = getattr(self.out, "keyframe_interval", VIDEOWRITER_GOP)
+        self.index = FrameIndexWriter(self.output_file + INDEX_EXTENSION, self.fps,
+                                      start_time, keyframe_interval)
+    
+    def rotate_output(self, directory):
+        """Continue the recording in a new segment file in another directory"""
+        self.pending_directory = directory
+    
+    def start_segment(self, directory):
+        """Close the current segment and open the next one, called between frames"""
+        self.pending_directory = None
+        first_output = self.segments[0][0]
+        name, extension = os.path.splitext(os.path.basename(first_output))
+        output_file = os.path.join(directory, f"{name}_part{len(self.segments) + 1}{extension}")
+        
+        error = self.out.release()
+        self.index.close()
+        self.release_proxies()
+        if error:
+            raise error
+        self.open_output(output_file)
+        self.open_index(self.now())
+        self.segment_started.emit(*self.segments[-1])
+    
+    def now(self):
+        """Wall-clock time, or the time implied by the frame count when running accelerated
+        
+        Timelapse frames are stamped the same way, compressed to playback speed.
+        """
+        if (self.accelerated or self.timelapse_interval) and self.start_time is not None:
+            return self.start_time + self.frame_count / self.fps
+        return time.time()
+    
+    def timelapse_frame(self, frame):
+        """Apply the idle policy to a timelapse capture; returns the frame to write, or None"""
+        small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (64, 36), interpolation=cv2.INTER_AREA)
+        changed = (self.timelapse_reference is None or
+                   cv2.absdiff(small, self.timelapse_reference).mean() > self.TIMELAPSE_THRESHOLD)
+        if changed:
+            self.timelapse_reference = small
+        
+        if not changed and self.timelapse_idle == "skip":
+            return None
+        if not changed and self.timelapse_idle == "average" and self.timelapse_previous is not None:
+            # Still scenes settle into an average instead of flickering with noise
+            frame = cv2.addWeighted(self.timelapse_previous, 0.5, frame, 0.5, 0)
+        if self.timelapse_idle == "average":
+            self.timelapse_previous = frame.copy()
+        return frame
+    
+    def open_preview_publisher(self):
+        """Advertise a downscaled live preview for other processes, if enabled"""
+        if not self.publish_preview:
+            return
+        try:
+            self.preview_publisher = PreviewPublisher(self.width, self.height, self.output_file)
+        except OSError:
+            # The recording matters more than its preview
+            self.preview_publisher = None
+    
+    def close_preview_publisher(self):
+        if self.preview_publisher:
+            self.preview_publisher.close()
+            self.preview_publisher = None
+    
+    def stage_threads(self):
+        """Stage threads of this recording with the settings they were given"""
+        return self.stages.snapshot()
+    
+    def grab_frame(self):
+        """Capture the screen, or the followed window, with the cursor if enabled"""
+        if self.frame_source:
+            return self.frame_source.grab(self.source_frame)
+        return grab_screen_frame(self.x, self.y, self.width, self.height, self.mouse_cursor)
+    
+    def composite_frame(self, frame):
+        """Add the camera and the overlays in place"""
+        if self.camera_available:
+            if self.camera.on_demand:
+                self.camera.capture_once()
+            self.camera.composite(frame)
+        if self.overlays:
+            self.overlays.apply(frame)
+    
+    def write_frame(self, frame, timestamp, file_size):
+        """Encode one frame into the output, its index and the proxies"""
+        if self.capture_mode == "spool":
+            offset = self.out.write(frame, timestamp)
+        else:
+            # OpenCV hides the muxer, the bytes flushed so far are the best estimate
+            self.out.write(frame)
+            offset = file_size
+        self.index.add_frame(timestamp, offset or 0)
+        self.frame_count += 1
+        self.stage_timer.lap("encode")
+        if self.proxy_ladder:
+            self.proxy_ladder.write(frame)
+            self.stage_timer.lap("proxy")
+    
+    def drain_pre_roll(self, file_size):
+        """Write the frames the pre-roll still holds back, oldest first"""
+        while self.pre_roll:
+            frame, timestamp = self.pre_roll.pop()
+            self.write_frame(frame, timestamp, file_size)
+    
+    def standby(self):
+        """Keep the camera, the grab path and the writer open until triggered or stopped
+        
+        With a pre-roll every frame is kept at the full frame rate, otherwise
+        frames are grabbed just often enough to keep the sources awake and the
+        preview moving. Returns True when triggered.
+        """
+        interval = 1.0 / (self.fps if self.pre_roll is not None else self.STANDBY_FPS)
+        preview_time = 0.0
+        while self.is_recording and not self.triggered:
+            frame_time = time.time()
+            frame = self.grab_frame()
+            self.composite_frame(frame)
+            if self.pre_roll is not None:
+                self.pre_roll.push(frame, frame_time)
+            if frame_time - preview_time >= STATUS_INTERVAL:
+                preview_time = frame_time
+                self.status.publish_preview(preview_image(frame, self.preview_width))
+            if self.preview_publisher:
+                self.preview_publisher.publish(frame)
+            
+            # The trigger sets the event, so recording starts without waiting out the interval
+            self.wake_event.wait(max(0, interval - (time.time() - frame_time)))
+            self.wake_event.clear()
+        return self.is_recording
+    
+    def discard_output(self):
+        """Remove the files an armed recorder opened but never recorded into"""
+        for path in {path for segment in self.segments for path in segment} | set(self.proxy_files):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def run(self):
+        # Encoding and writing happen on this thread unless a writer does them on its own,
+        # a shared thread runs with the grab settings
+        shared = ["preview"]
+        if not self.stream_targets:
+            shared.append("encode")
+            if self.capture_mode != "spool":
+                shared.append("write")
+        self.stages.enter("grab", shared)
+        
+        self.is_recording = True
+        self.stage_timer = StageTimer()
+        self.stage_timer.start()
+        self.open_preview_publisher()
+        triggered = False
+        try:
+            triggered = not self.armed or self.standby()
+            if triggered:
+                self.record()
+        except Exception as e:
+            # Whatever went wrong, the files are closed and the GUI told below
+            self.pipeline_error.emit(f"Recording failed: {e}")
+        
+        # Clean up
+        self.close_preview_publisher()
+        self.camera.release()
+        if self.frame_source:
+            self.frame_source.close()
+        error = self.out.release()
+        if triggered:
+            self.index.close()
+        self.release_proxies()
+        if not triggered:
+            self.discard_output()
+        if error and triggered:
+            self.pipeline_error.emit(f"Writing the recording failed: {error}")
+        self.recording_finished.emit()
+    
+    def record(self):
+        """Record until stopped, after the pre-roll if there is one"""
+        stage_timer = self.stage_timer
+        self.start_time = self.pre_roll.oldest_time() if self.pre_roll else time.time()
+        last_time = time.time()
+        fps_counter = 0
+        fps_timer = time.time()
+        file_size = 0
+        was_paused = False
+        lateness = []
+        preview_time = 0.0
+        self.open_index(self.start_time)
+        
+        while self.is_recording:
+            if self.pending_directory:
+                try:
+                    self.drain_pre_roll(file_size)
+                    self.start_segment(self.pending_directory)
+                    file_size = 0
+                except Exception as e:
+                    self.pipeline_error.emit(f"Could not continue the recording in a new file: {e}")
+                    return
+            
+            if self.is_paused != was_paused:
+                was_paused = self.is_paused
+                try:
+                    # Held back frames come before the pause in the file and the index
+                    self.drain_pre_roll(file_size)
+                except Exception as e:
+                    self.pipeline_error.emit(f"Writing the recording failed: {e}")
+                    return
+                self.index.add_marker(self.now(), INDEX_PAUSE if was_paused else INDEX_RESUME)
+            
+            if self.is_paused:
+                # Sleep until resumed or stopped instead of polling at the frame rate
+                self.wake_event.wait()
+                self.wake_event.clear()
+                last_time = time.time()
+                continue
+            
+            current_time = self.now()
+            stage_timer.start()
+            screen_frame = self.grab_frame()
+            stage_timer.lap("grab")
+            self.composite_frame(screen_frame)
+            
+            # Unchanged timelapse captures may be dropped
+            if self.timelapse_interval:
+                screen_frame = self.timelapse_frame(screen_frame)
+            stage_timer.lap("composite")
+            stage_timer.frame()
+            
+            if screen_frame is not None:
+                # Write frame to output file, or the oldest one when the pre-roll delays the output
+                try:
+                    if self.pre_roll is None:
+                        self.write_frame(screen_frame, current_time, file_size)
+                    else:
+                        if self.pre_roll.full():
+                            frame, timestamp = self.pre_roll.pop()
+                            self.write_frame(frame, timestamp, file_size)
+                        self.pre_roll.push(screen_frame, current_time)
+                except Exception as e:
+                    self.pipeline_error.emit(f"Writing the recording failed: {e}")
+                    return
+                
+                # Only frames the GUI can show are converted for the preview
+                if last_time - preview_time >= STATUS_INTERVAL:
+                    preview_time = last_time
+                    self.status.publish_preview(preview_image(screen_frame, self.preview_width))
+                if self.preview_publisher:
+                    self.preview_publisher.publish(screen_frame)
+                stage_timer.lap("preview")
+                
+                # Calculate FPS
+                fps_counter += 1
+                if last_time - fps_timer >= 1.0:
+                    actual_fps = fps_counter / (last_time - fps_timer)
+                    self.status.publish(fps=actual_fps)
+                    fps_counter = 0
+                    fps_timer = last_time
+                    self.overlay_costs = {**self.overlays.metrics(), **self.camera.metrics()}
+                    self.stage_timings = stage_timer.report()
+                    if self.stream_targets:
+                        self.stream_stats = self.out.sink_stats()
+                    if self.proxy_ladder:
+                        self.proxy_stats = self.proxy_ladder.stats()
+                    if lateness:
+                        self.frame_pacing = (sum(lateness) / len(lateness), max(lateness))
+                        lateness = []
+                
+                # File size (approximate)
+                if self.capture_mode == "spool":
+                    file_size = self.out.tell()
+                elif os.path.exists(self.record_file):
+                    file_size = os.path.getsize(self.record_file)
+                self.status.publish(duration=int(current_time - self.start_time), file_size=file_size,
+                                    frames=self.frame_count)
+            
+            # Control frame rate, an accelerated run records as fast as it can
+            elapsed = time.time() - last_time
+            if self.timelapse_interval:
+                # Idle on the event between captures, stop and pause wake it at once
+                self.wake_event.wait(max(0, self.timelapse_interval - elapsed))
+                self.wake_event.clear()
+            elif not self.accelerated:
+                delay = 1.0/self.fps - elapsed
+                if delay > 0:
+                    time.sleep(delay)
+                    # How late the OS woke us, the frame pacing cost of a busy machine
+                    lateness.append((time.time() - last_time - 1.0/self.fps) * 1000)
+                else:
+                    # Whole frame intervals that passed without a capture
+                    self.dropped_frames += int(elapsed * self.fps) - 1
+            last_time = time.time()
+        
+        try:
+            self.drain_pre_roll(file_size)
+        except Exception as e:
+            self.pipeline_error.emit(f"Writing the recording failed: {e}")
+    
+    def pause_recording(self):
+        self.is_paused = True
+        self.wake_event.set()
+    
+    def resume_recording(self):
+        self.is_paused = False
+        self.wake_event.set()
+    
+    def trigger(self):
+        """Start recording from standby"""
+        self.triggered = True
+        self.wake_event.set()
+    
+    def stop_recording(self):
+        self.is_recording = False
+        self.wake_event.set()
+
+
+def capture_process_main(ring_name, config, free_slots, filled_slots, status_queue, stop_event, pause_event,
+                         wake_event):
+    """Capture process: grab and composite frames straight into free ring slots"""
+    stages = PipelineStages(config["stage_scheduling"])
+    ring = SharedFrameRing.attach(ring_name)
+    x, y, width, height = config["region"]
+    if config["camera_scene"]:
+        camera = CameraScene.from_sources(config["camera_scene"], (width, height), config["fps"], stages=stages)
+    else:
+        camera = CameraScene([CameraOverlay(config["camera_device"], config["camera_position"],
+                                            tuple(config["camera_size"]), config["fps"], config["camera_effect"],
+                                            stages=stages)])
+    window_capture = X11WindowCapture(config["window_id"], (width, height)) if config["window_id"] else None
+    overlays = OverlayCompositor.from_settings(config["overlays"])
+    # After the camera thread is started, so it does not inherit this thread's settings
+    stages.enter("grab")
+    frame_interval = 1.0 / config["fps"]
+    captured = 0
+    dropped = 0
+    last_report = time.time()
+    was_paused = False
+    lateness = []
+    stage_timer = StageTimer()
+    
+    try:
+        while not stop_event.is_set():
+            last_time = time.time()
+            
+            # Negative slot numbers carry pause/resume markers for the frame index
+            if pause_event.is_set() != was_paused:
+                was_paused = pause_event.is_set()
+                filled_slots.put((-INDEX_PAUSE if was_paused else -INDEX_RESUME, last_time))
+            
+            if pause_event.is_set():
+                # Sleep until resumed or stopped instead of polling at the frame rate
+                wake_event.wait()
+                wake_event.clear()
+                continue
+            
+            try:
+                slot = free_slots.get(timeout=frame_interval)
+            except queue.Empty:
+                # The encoder is behind, drop this frame instead of stalling capture
+                slot = None
+                dropped += 1
+            
+            if slot is not None:
+                timestamp = time.time()
+                stage_timer.start()
+                frame = ring.begin_write(slot)
+                if window_capture:
+                    window_capture.grab(frame)
+                else:
+                    np.copyto(frame, grab_screen_frame(x, y, width, height, config["mouse_cursor"]))
+                stage_timer.lap("grab")
+                camera.composite(frame)
+                if overlays:
+                    overlays.apply(frame)
+                stage_timer.lap("composite")
+                stage_timer.frame()
+                ring.end_write(slot, timestamp)
+                filled_slots.put((slot, timestamp))
+                captured += 1
+            
+            if last_time - last_report >= 1.0:
+                status_queue.put(("captured", (captured, dropped)))
+                if overlays or camera.effects:
+                    status_queue.put(("overlay_costs", {**overlays.metrics(), **camera.metrics()}))
+                status_queue.put(("stages", (os.getpid(), stages.snapshot())))
+                status_queue.put(("stage_timings", stage_timer.report()))
+                if lateness:
+                    status_queue.put(("frame_pacing", (sum(lateness) / len(lateness), max(lateness))))
+                    lateness = []
+                last_report = last_time
+            
+            # Control frame rate
+            elapsed = time.time() - last_time
+            if not stop_event.wait(max(0, frame_interval - elapsed)) and elapsed < frame_interval:
+                lateness.append((time.time() - last_time - frame_interval) * 1000)
+    finally:
+        camera.release()
+        if window_capture:
+            window_capture.close()
+        status_queue.put(("captured", (captured, dropped)))
+        filled_slots.put(None)
+        ring.close()
+
+
+def encoder_process_main(ring_name, config, free_slots, filled_slots, status_queue):
+    """Encoder process: write filled ring slots to the output and hand them back"""
+    stages = PipelineStages(config["stage_scheduling"])
+    ring = SharedFrameRing.attach(ring_name)
+    size = (ring.width, ring.height)
+    spool = config["capture_mode"] == "spool"
+    if spool:
+        out = FrameSpoolWriter(config["record_file"], ring.width, ring.height, config["fps"],
+                               fsync_policy=config["fsync_policy"], stages=stages)
+    elif config["stream_targets"]:
+        out = TeeStreamWriter(config["record_file"], ring.width, ring.height, config["fps"], config["quality"],
+                              config["stream_targets"], config["stream_preset"], stages)
+    else:
+        out = cv2.VideoWriter(config["record_file"], cv2.VideoWriter_fourcc(*'mp4v'), config["fps"], size)
+    stages.enter("encode", () if spool or config["stream_targets"] else ("write",))
+    
+    index = FrameIndexWriter(config["output_file"] + INDEX_EXTENSION, config["fps"], config["start_time"],
+                             1 if spool else getattr(out, "keyframe_interval", VIDEOWRITER_GOP))
+    ladder = ProxyLadder(config["output_file"], ring.width, ring.height, config["fps"], config["proxy_ladder"],
+                         config["quality"], config["stream_preset"]) if config["proxy_ladder"] else None
+    frames_written = 0
+    file_size = 0
+    last_report = time.time()
+    stage_timer = StageTimer()
+    try:
+        while True:
+            item = filled_slots.get()
+            if item is None:
+                break
+            
+            slot, timestamp = item
+            if slot < 0:
+                index.add_marker(timestamp, -slot)
+                continue
+            
+            # The slot belongs to this process until it is put back on the free list
+            stage_timer.start()
+            if spool:
+                offset = out.write(ring.frames[slot], timestamp)
+            else:
+                out.write(ring.frames[slot])
+                offset = file_size
+            index.add_frame(timestamp, offset or 0)
+            stage_timer.lap("encode")
+            if ladder:
+                ladder.write(ring.frames[slot])
+                stage_timer.lap("proxy")
+            free_slots.put(slot)
+            frames_written += 1
+            stage_timer.frame()
+            
+            now = time.time()
+            if now - last_report >= 0.25:
+                status_queue.put(("encoded", frames_written))
+                status_queue.put(("stages", (os.getpid(), stages.snapshot())))
+                status_queue.put(("stage_timings", stage_timer.report()))
+                last_report = now
+                if ladder:
+                    status_queue.put(("proxy_stats", ladder.stats()))
+                if config["stream_targets"]:
+                    status_queue.put(("stream_stats", out.sink_stats()))
+                if spool:
+                    status_queue.put(("written", out.tell()))
+                elif os.path.exists(config["record_file"]):
+                    file_size = os.path.getsize(config["record_file"])
+    except Exception as e:
+        status_queue.put(("error", f"Encoder failed: {e}"))
+        raise
+    finally:
+        error = out.release()
+        index.close()
+        ring.close()
+        if ladder:
+            ladder.release()
+            status_queue.put(("proxy_stats", ladder.stats()))
+        if error:
+            status_queue.put(("error", f"Writing the recording failed: {error}"))
+    
+    status_queue.put(("encoded", frames_written))
+
+
+class ProcessPipelineRecorder(QThread):
+    """Recorder that runs capture and encoding in their own processes
+    
+    Frames move through a SharedFrameRing; only slot numbers and small status
+    tuples cross process boundaries. This thread just maps the latest slot for
+    the preview and watches the workers, so a crashed encoder is reported
+    instead of taking the UI down with it.
+    """
+    recording_finished = Signal()
+    pipeline_error = Signal(str)   # A worker process failed
+    
+    RING_SLOTS = 6
+    PREVIEW_INTERVAL = STATUS_INTERVAL
+    
+    def __init__(self, output_file, screen_region=None, camera_device=0, 
+                 camera_position="bottom-right", camera_size=(320, 240), 
+                 fps=30, quality=85, record_audio=True, mouse_cursor=True, 
+                 capture_mode="direct", fsync_policy="interval", window_id=None, overlay_settings=None,
+                 stream_targets=None, camera_effect="none", stream_preset="veryfast",
+                 publish_preview=False, stage_scheduling=None, camera_scene=None, proxy_ladder=None,
+                 preview_width=None, parent=None):
+        super().__init__(parent)
+        self.output_file = output_file
+        self.capture_mode = capture_mode
+        self.publish_preview = publish_preview
+        self.preview_publisher = None
+        self.preview_width = preview_width
+        self.stage_scheduling = stage_scheduling
+        self.worker_stages = {}  # Worker pid -> the stage threads it reported
+        self.stages = PipelineStages()
+        self.frame_pacing = None
+        self.stage_timings = {}
+        self.dropped_frames = 0
+        self.status = RecorderStatus()
+        self.fps = fps
+        self.quality = quality
+        self.is_recording = False
+        self.is_paused = False
+        self.frame_count = 0
+        self.bytes_written = 0
+        self.overlay_costs = {}
+        self.stream_stats = []
+        self.proxy_stats = []
+        self.workers = []
+        self.start_time = None
+        
+        if window_id:
+            # The capture process follows the window, only its starting size is needed here
+            probe = X11WindowCapture(window_id)
+            self.x, self.y = 0, 0
+            self.width, self.height = probe.width, probe.height
+            probe.close()
+        elif screen_region:
+            self.x, self.y, self.width, self.height = screen_region
+        else:
+            self.x, self.y = 0, 0
+            self.width, self.height = pyautogui.size()
+        
+        self.record_file = output_file + ".spool" if capture_mode == "spool" else output_file
+        self.config = {
+            "region": (self.x, self.y, self.width, self.height),
+            "camera_device": camera_device,
+            "camera_position": camera_position,
+            "camera_size": list(camera_size),
+            "camera_effect": camera_effect,
+            "camera_scene": camera_scene,
+            "fps": fps,
+            "mouse_cursor": mouse_cursor,
+            "capture_mode": capture_mode,
+            "record_file": self.record_file,
+            "output_file": output_file,
+            "fsync_policy": fsync_policy,
+            "window_id": window_id,
+            "overlays": overlay_settings or {},
+            "quality": quality,
+            "stream_targets": [] if capture_mode == "spool" else list(stream_targets or []),
+            "stream_preset": stream_preset,
+            "stage_scheduling": stage_scheduling,
+            "proxy_ladder": list(proxy_ladder or [])
+        }
+        # The encoder process writes the proxies, their names are known up front
+        self.proxy_files = [rung["file"] for rung in
+                            plan_proxy_ladder(output_file, self.width, self.height, self.config["proxy_ladder"])]
+        
+        # Spawn rather than fork, forking a process that runs Qt threads is unsafe
+        self.context = multiprocessing.get_context("spawn")
+        self.stop_event = self.context.Event()
+        self.pause_event = self.context.Event()
+        self.wake_event = self.context.Event()  # Set on resume and stop, a paused capture process waits for it
+    
+    def open_preview_publisher(self):
+        """Advertise a downscaled live preview for other processes, if enabled"""
+        if not self.publish_preview:
+            return
+        try:
+            self.preview_publisher = PreviewPublisher(self.width, self.height, self.output_file)
+        except OSError:
+            # The recording matters more than its preview
+            self.preview_publisher = None
+    
+    def close_preview_publisher(self):
+        if self.preview_publisher:
+            self.preview_publisher.close()
+            self.preview_publisher = None
+    
+    def stage_threads(self):
+        """Stage threads of this recording, here and in the worker processes"""
+        return self.stages.snapshot() + [thread for threads in list(self.worker_stages.values())
+                                             for thread in threads]
+    
+    def run(self):
+        self.stages.configure(self.stage_scheduling)
+        ring = SharedFrameRing.create(self.width, self.height, self.RING_SLOTS)
+        free_slots = self.context.Queue()
+        filled_slots = self.context.Queue()
+        status_queue = self.context.Queue()
+        for slot in range(self.RING_SLOTS):
+            free_slots.put(slot)
+        self.config["start_time"] = time.time()
+        
+        encoder = self.context.Process(
+            target=encoder_process_main, name="eem-encoder", daemon=True,
+            args=(ring.name, self.config, free_slots, filled_slots, status_queue))
+        capture = self.context.Process(
+            target=capture_process_main, name="eem-capture", daemon=True,
+            args=(ring.name, self.config, free_slots, filled_slots, status_queue,
+                  self.stop_event, self.pause_event, self.wake_event))
+        self.workers = [capture, encoder]
+        
+        self.is_recording = True
+        self.start_time = self.config["start_time"]
+        preview = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        last_seq = 0
+        fps_frames = 0
+        fps_timer = self.start_time
+        error = None
+        self.open_preview_publisher()
+        
+        try:
+            encoder.start()
+            capture.start()
+            # Only once the workers are spawned, they would inherit the preview's low priority
+            self.stages.enter("preview")
+            
+            while self.is_recording:
+                # Drain small control messages from the workers
+                while True:
+                    try:
+                        kind, value = status_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "encoded":
+                        self.frame_count = value
+                    elif kind == "captured":
+                        self.dropped_frames = value[1]
+                    elif kind == "written":
+                        self.bytes_written = value
+                    elif kind == "overlay_costs":
+                        self.overlay_costs = value
+                    elif kind == "stream_stats":
+                        self.stream_stats = value
+                    elif kind == "proxy_stats":
+                        self.proxy_stats = value
+                    elif kind == "stages":
+                        self.worker_stages[value[0]] = value[1]
+                    elif kind == "frame_pacing":
+                        self.frame_pacing = value
+                    elif kind == "stage_timings":
+                        # Each worker times its own stages
+                        self.stage_timings = {**self.stage_timings, **value}
+                    elif kind == "error":
+                        error = value
+                
+                if error is None and not encoder.is_alive():
+                    error = f"Encoder process exited unexpectedly (code {encoder.exitcode})"
+                if error is None and not capture.is_alive():
+                    error = f"Capture process exited unexpectedly (code {capture.exitcode})"
+                if error:
+                    self.pipeline_error.emit(error)
+                    break
+                
+                # Map the most recent slot for the preview
+                slot, seq = ring.latest()
+                if slot >= 0 and seq != last_seq:
+                    result = ring.read(slot, preview)
+                    if result is not None:
+                        last_seq = seq
+                        self.status.publish_preview(preview_image(preview, self.preview_width))
+                        if self.preview_publisher:
+                            self.preview_publisher.publish(preview, result[2])
+                
+                current_time = time.time()
+                if current_time - fps_timer >= 1.0:
+                    self.status.publish(fps=(self.frame_count - fps_frames) / (current_time - fps_timer))
+                    fps_frames = self.frame_count
+                    fps_timer = current_time
+                
+                # Spool files are preallocated, so their size on disk runs ahead of the data
+                file_size = self.status.snapshot["file_size"]
+                if self.capture_mode == "spool":
+                    file_size = self.bytes_written
+                elif os.path.exists(self.record_file):
+                    file_size = os.path.getsize(self.record_file)
+                self.status.publish(duration=int(current_time - self.start_time), file_size=file_size,
+                                    frames=self.frame_count)
+                
+                time.sleep(self.PREVIEW_INTERVAL)
+        except Exception as e:
+            self.pipeline_error.emit(f"Could not start recording processes: {e}")
+        finally:
+            self.stop_event.set()
+            self.wake_event.set()
+            if capture.pid is not None:
+                capture.join(timeout=5)
+                if capture.is_alive():
+                    capture.terminate()
+            if capture.exitcode != 0:
+                # A dead capture process never sent its end-of-stream marker
+                filled_slots.put(None)
+            
+            if encoder.pid is not None:
+                encoder.join(timeout=30)
+                if encoder.is_alive():
+                    encoder.terminate()
+            
+            # The encoder's last report has the proxies' final counts
+            while True:
+                try:
+                    kind, value = status_queue.get(timeout=0.1)
+                except (queue.Empty, OSError, ValueError):
+                    break
+                if kind == "proxy_stats":
+                    self.proxy_stats = value
+            
+            ring.close()
+            self.close_preview_publisher()
+            self.is_recording = False
+            self.recording_finished.emit()
+    
+    def pause_recording(self):
+        self.is_paused = True
+        self.pause_event.set()
+    
+    def resume_recording(self):
+        self.is_paused = False
+        self.pause_event.clear()
+        self.wake_event.set()
+    
+    def stop_recording(self):
+        self.is_recording = False
+
+
+class BurstCapture(QThread):
+    """Full-resolution stills at a fixed rate, encoded on a thread pool
+    
+    Frames are copied into a fixed set of preallocated buffers. Each buffer
+    goes back to the pool once its image is written, so when encoding falls
+    behind, shots are skipped instead of memory growing. OpenCV releases the
+    GIL while encoding, so a thread pool uses every core.
+    """
+    burst_progress = Signal(dict)
+    burst_finished = Signal(dict)
+    
+    FORMATS = {
+        "png": (".png", lambda quality: [cv2.IMWRITE_PNG_COMPRESSION, 1]),
+        "jpg": (".jpg", lambda quality: [cv2.IMWRITE_JPEG_QUALITY, quality]),
+        "webp": (".webp", lambda quality: [cv2.IMWRITE_WEBP_QUALITY, quality])
+    }
+    
+    def __init__(self, output_dir, screen_region=None, rate=20, duration=10, image_format="png",
+                 quality=90, max_memory_mb=512, workers=None, mouse_cursor=True, parent=None):
+        super().__init__(parent)
+        self.output_dir = output_dir
+        if screen_region:
+            self.x, self.y, self.width, self.height = screen_region
+        else:
+            self.x, self.y = 0, 0
+            self.width, self.height = pyautogui.size()
+        self.rate = rate
+        self.duration = duration
+        self.extension, params = self.FORMATS[image_format]
+        self.params = params(quality)
+        self.mouse_cursor = mouse_cursor
+        self.workers = workers or os.cpu_count() or 2
+        self.is_running = False
+        
+        buffer_count = max(2, int(max_memory_mb * 1024 * 1024 // (self.width * self.height * 3)))
+        self.free_buffers = queue.Queue()
+        for _ in range(buffer_count):
+            self.free_buffers.put(np.empty((self.height, self.width, 3), dtype=np.uint8))
+        self.buffer_count = buffer_count
+        self.stats_lock = threading.Lock()
+        self.stats = {"grabbed": 0, "encoded": 0, "skipped": 0, "failed": 0, "grab_time": 0.0, "encode_time": 0.0}
+    
+    def encode(self, buffer, timestamp):
+        """Pool task: write one still, then hand its buffer back"""
+        started = time.perf_counter()
+        stamp = datetime.fromtimestamp(timestamp).strftime("%Y%m%d_%H%M%S_%f")
+        try:
+            written = cv2.imwrite(os.path.join(self.output_dir, f"burst_{stamp}{self.extension}"), buffer, self.params)
+        finally:
+            self.free_buffers.put(buffer)
+        with self.stats_lock:
+            self.stats["encoded" if written else "failed"] += 1
+            self.stats["encode_time"] += time.perf_counter() - started
+    
+    def report(self, elapsed, grab_elapsed=None):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats.update(
+            elapsed=elapsed,
+            pending=self.buffer_count - self.free_buffers.qsize(),
+            grab_rate=stats["grabbed"] / max(1e-6, grab_elapsed or elapsed),
+            encode_rate=stats["encoded"] / max(1e-6, elapsed),
+            # What the pool could sustain if it never waited for frames
+            encode_capacity=stats["encoded"] * self.workers / max(1e-6, stats["encode_time"]),
+            output_dir=self.output_dir
+        )
+        return stats
+    
+    def run(self):
+        self.is_running = True
+        start = time.time()
+        grab_elapsed = None
+        error = None
+        try:
+            grab_elapsed = self.capture(start)
+        except Exception as e:
+            # burst_finished still fires, the GUI resumes background jobs on it
+            error = str(e)
+        
+        # Encoding is rated including the backlog it had to finish after the last grab
+        elapsed = time.time() - start
+        grab_elapsed = elapsed if grab_elapsed is None else grab_elapsed
+        result = self.report(elapsed, grab_elapsed)
+        result["drain_time"] = result["elapsed"] - grab_elapsed
+        result["error"] = error
+        self.is_running = False
+        self.burst_finished.emit(result)
+    
+    def capture(self, start):
+        """Grab on schedule until the duration is up or stopped, returns the seconds spent grabbing"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        interval = 1.0 / self.rate
+        next_shot = start
+        last_report = start
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while self.is_running and next_shot < start + self.duration:
+                now = time.time()
+                if now < next_shot:
+                    time.sleep(next_shot - now)
+                timestamp = time.time()
+                # A late grab moves the schedule on rather than firing a catch-up burst
+                next_shot = max(next_shot + interval, timestamp - interval / 2)
+                
+                try:
+                    buffer = self.free_buffers.get_nowait()
+                except queue.Empty:
+                    with self.stats_lock:
+                        self.stats["skipped"] += 1
+                    continue
+                
+                grab_started = time.perf_counter()
+                np.copyto(buffer, grab_screen_frame(self.x, self.y, self.width, self.height, self.mouse_cursor))
+                with self.stats_lock:
+                    self.stats["grabbed"] += 1
+                    self.stats["grab_time"] += time.perf_counter() - grab_started
+                pool.submit(self.encode, buffer, timestamp)
+                
+                if timestamp - last_report >= 1.0:
+                    self.burst_progress.emit(self.report(timestamp - start))
+                    last_report = timestamp
+            
+            grab_elapsed = time.time() - start
+        return grab_elapsed
+    
+    def stop(self):
+        self.is_running = False
+
+
+class DiskSpaceWatchdog(QThread):
+    """Projects how long the output volume lasts at the current write rate
+    
+    The rate comes from the drop in free space over a sliding window, so it
+    includes the encoder's real bitrate, preallocated extents and any other
+    program writing to the same disk.
+    """
+    space_update = Signal(float, float)  # Free bytes, seconds until full (inf when not filling)
+    space_warning = Signal(str, float)   # Directory, seconds until full
+    space_critical = Signal(str, float)  # Directory, seconds until full
+    
+    WINDOW = 30.0
+    
+    def __init__(self, directory, warning_seconds=600, critical_seconds=60,
+                 reserve_bytes=256 * 1024 * 1024, interval=2.0, parent=None):
+        super().__init__(parent)
+        self.warning_seconds = warning_seconds
+        self.critical_seconds = critical_seconds
+        self.reserve_bytes = reserve_bytes
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.set_directory(directory)
+    
+    def set_directory(self, directory):
+        """Watch another volume, e.g. after the recording rotated onto it"""
+        with self.lock:
+            self.directory = directory
+            self.samples = []
+            self.warned = False
+            self.critical = False
+    
+    def time_left(self, now, free):
+        """Seconds until free space reaches the reserve, inf while the disk is not filling"""
+        self.samples.append((now, free))
+        while len(self.samples) > 2 and now - self.samples[0][0] > self.WINDOW:
+            self.samples.pop(0)
+        
+        if free <= self.reserve_bytes:
+            return 0.0
+        first_time, first_free = self.samples[0]
+        if now - first_time < self.interval or first_free <= free:
+            return float("inf")
+        rate = (first_free - free) / (now - first_time)
+        return (free - self.reserve_bytes) / rate
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            with self.lock:
+                directory = self.directory
+                try:
+                    free = shutil.disk_usage(directory).free
+                except OSError:
+                    free = None
+                
+                if free is not None:
+                    seconds = self.time_left(time.time(), free)
+                    self.space_update.emit(free, seconds)
+                    
+                    if seconds <= self.critical_seconds and not self.critical:
+                        self.critical = True
+                        self.space_critical.emit(directory, seconds)
+                    elif seconds <= self.warning_seconds and not self.warned:
+                        self.warned = True
+                        self.space_warning.emit(directory, seconds)
+            
+            self.stop_event.wait(self.interval)
+    
+    def stop(self):
+        self.stop_event.set()
+
+
+class TimeSeries:
+    """Fixed-capacity ring buffer of float samples"""
+    
+    def __init__(self, capacity=300):
+        self.data = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+    
+    def append(self, value):
+        self.data[self.count % len(self.data)] = value
+        self.count += 1
+    
+    def latest(self, default=0.0):
+        return self.data[(self.count - 1) % len(self.data)] if self.count else default
+    
+    def values(self):
+        """Samples in chronological order"""
+        if self.count <= len(self.data):
+            return self.data[:self.count].copy()
+        start = self.count % len(self.data)
+        return np.concatenate((self.data[start:], self.data[:start]))
+
+
+class SystemSampler(QThread):
+    """Samples system and recorder resource usage off the GUI thread
+    
+    Every interval it records system CPU and memory, CPU per thread of this
+    process and per worker process, the memory of this process and its
+    children, system-wide disk write throughput and the recorder's encoded frame rate, each
+    into a TimeSeries. The GUI reads snapshots and never calls psutil itself.
+    While a session log is open, each sample is also appended to it as a line.
+    """
+    samples_ready = Signal()
+    
+    HISTORY = 300  # Five minutes at one sample per second
+    
+    def __init__(self, interval=1.0, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.series = {name: TimeSeries(self.HISTORY) for name in
+                       ("cpu", "memory", "rss", "disk_write", "encode_fps")}
+        self.thread_series = {}
+        self.info = {}
+        self.recorder = None
+        self.process_names = None
+        self.process = psutil.Process()
+        self.children = {}
+        self.stage_waits = {}
+        self.session_log = None
+        self.session_file = None
+        self.session_start = None
+    
+    def set_recorder(self, recorder):
+        """Track the frame count of the active recorder, or None between recordings"""
+        self.recorder = recorder
+    
+    def thread_names(self):
+        """Map native thread ids to names; Qt names its threads at the OS level"""
+        names = {thread.native_id: thread.name for thread in threading.enumerate()
+                 if not isinstance(thread, threading._DummyThread)}
+        for thread in self.process.threads():
+            if thread.id not in names:
+                try:
+                    with open(f"/proc/self/task/{thread.id}/comm") as f:
+                        names[thread.id] = f.read().strip()
+                except OSError:
+                    names[thread.id] = f"thread {thread.id}"
+        return names
+    
+    def sample_cpu_times(self):
+        """Return {name: CPU seconds} for our threads and our child processes"""
+        times = {}
+        try:
+            names = self.thread_names()
+            for thread in self.process.threads():
+                name = names.get(thread.id, f"thread {thread.id}")
+                times[name] = times.get(name, 0.0) + thread.user_time + thread.system_time
+        except (psutil.Error, AttributeError):
+            pass
+        
+        process_names = {}
+        if self.process_names:
+            try:
+                process_names = self.process_names()
+            except RuntimeError:
+                pass  # A worker table changed size while being read
+        
+        rss = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                child = self.children.setdefault(child.pid, child)
+                cpu = child.cpu_times()
+                rss += child.memory_info().rss
+            except psutil.Error:
+                continue
+            name = process_names.get(child.pid, f"worker {child.pid}")
+            times[name] = times.get(name, 0.0) + cpu.user + cpu.system
+        return times, rss
+    
+    def sample_placements(self, recorder, elapsed):
+        """Where the recorder's stage threads run and how long they waited for a CPU, in ms per second"""
+        threads = recorder.stage_threads() if hasattr(recorder, 'stage_threads') else []
+        placements = []
+        waits = {}
+        for thread in threads:
+            placement = read_thread_placement(thread["pid"], thread["tid"])
+            if placement is None:
+                continue  # The thread has ended
+            key = (thread["pid"], thread["tid"])
+            wait_ns = waits[key] = placement.pop("wait_ns")
+            last_wait = self.stage_waits.get(key)
+            placement["wait_ms"] = (wait_ns - last_wait) / 1e6 / elapsed \
+                if wait_ns is not None and last_wait is not None else None
+            placement["last_cpus"] = sorted(placement["last_cpus"])
+            placements.append({**thread, **placement})
+        self.stage_waits = waits
+        return placements
+    
+    def start_session_log(self, path, header):
+        """Open a performance log for the recording that is starting, returns False if it cannot be written"""
+        self.stop_session_log()
+        try:
+            log = open(path, 'w')
+            log.write(json.dumps({"type": "session", **header}, separators=(",", ":")) + "\n")
+            log.flush()
+        except OSError:
+            return False
+        with self.lock:
+            self.session_log, self.session_file, self.session_start = log, path, time.time()
+        return True
+    
+    def stop_session_log(self):
+        """Close the session log, returns its path or None if none was open"""
+        with self.lock:
+            log, path = self.session_log, self.session_file
+            self.session_log = self.session_file = None
+        if log is None:
+            return None
+        log.close()
+        return path
+    
+    def log_session_sample(self, sample):
+        with self.lock:
+            log = self.session_log
+            if log is None:
+                return
+            sample = {"type": "sample", "t": round(time.time() - self.session_start, 1), **sample}
+        
+        # Written outside the lock, a slow disk must not hold up snapshot() for the GUI
+        try:
+            log.write(json.dumps(sample, separators=(",", ":")) + "\n")
+            log.flush()
+        except ValueError:
+            pass  # Closed by stop_session_log() meanwhile
+        except OSError:
+            # Out of space most likely, the recording matters more than its log
+            with self.lock:
+                if self.session_log is log:
+                    self.session_log = self.session_file = None
+            log.close()
+    
+    def run(self):
+        psutil.cpu_percent()
+        last_time = time.time()
+        last_cpu_times, _ = self.sample_cpu_times()
+        last_disk = psutil.disk_io_counters()
+        last_frames = None
+        last_dropped = None
+        
+        while not self.stop_event.wait(self.interval):
+            now = time.time()
+            elapsed = max(1e-6, now - last_time)
+            cpu_times, rss = self.sample_cpu_times()
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_io_counters()
+            try:
+                disk_free = shutil.disk_usage(os.path.expanduser("~")).free
+            except OSError:
+                disk_free = 0
+            
+            recorder = self.recorder
+            frames = recorder.frame_count if recorder else None
+            dropped = getattr(recorder, 'dropped_frames', None)
+            placements = self.sample_placements(recorder, elapsed)
+            if frames is not None and last_frames is not None and frames >= last_frames:
+                encode_fps = (frames - last_frames) / elapsed
+            else:
+                encode_fps = 0.0
+            system_cpu = psutil.cpu_percent()
+            disk_write = (disk.write_bytes - last_disk.write_bytes) / elapsed / (1024 * 1024) \
+                if disk and last_disk else None
+            thread_cpu = {name: max(0.0, cpu_time - last_cpu_times.get(name, cpu_time)) * 100 / elapsed
+                          for name, cpu_time in cpu_times.items()}
+            
+            with self.lock:
+                self.series["cpu"].append(system_cpu)
+                self.series["memory"].append(memory.percent)
+                self.series["rss"].append(rss / (1024 * 1024))
+                if disk_write is not None:
+                    self.series["disk_write"].append(disk_write)
+                self.series["encode_fps"].append(encode_fps)
+                
+                for name, cpu in thread_cpu.items():
+                    series = self.thread_series.get(name)
+                    if series is None:
+                        series = self.thread_series[name] = TimeSeries(self.HISTORY)
+                    series.append(cpu)
+                # Threads and workers that ended stop getting samples, forget them
+                for name in list(self.thread_series):
+                    if name not in cpu_times:
+                        del self.thread_series[name]
+                
+                self.info = {
+                    "memory_total": memory.total,
+                    "memory_available": memory.available,
+                    "disk_free": disk_free,
+                    "placements": placements
+                }
+            
+            if recorder is not None:
+                # A new recorder starts counting from zero again
+                new_drops = dropped - last_dropped if dropped is not None and last_dropped is not None \
+                    and dropped >= last_dropped else 0
+                self.log_session_sample({
+                    "paused": bool(recorder.is_paused),
+                    "frames": frames,
+                    "fps": round(encode_fps, 2),
+                    "dropped": new_drops,
+                    "stages": getattr(recorder, 'stage_timings', {}),
+                    "wait_ms": {"+".join(placement["stages"]): round(placement["wait_ms"], 3)
+                                for placement in placements if placement["wait_ms"] is not None},
+                    "cpu": round(sum(thread_cpu.values()), 1),
+                    "system_cpu": system_cpu,
+                    "rss_mb": round(rss / (1024 * 1024), 1),
+                    "disk_write": round(disk_write, 2) if disk_write is not None else None
+                })
+            
+            self.children = {pid: child for pid, child in self.children.items() if child.is_running()}
+            last_time, last_cpu_times, last_disk, last_frames, last_dropped = now, cpu_times, disk, frames, dropped
+            self.samples_ready.emit()
+    
+    def snapshot(self):
+        """Return ({series name: values}, {thread name: values}, info) copied under the lock"""
+        with self.lock:
+            return ({name: series.values() for name, series in self.series.items()},
+                    {name: series.values() for name, series in self.thread_series.items()},
+                    dict(self.info))
+    
+    def stop(self):
+        self.stop_event.set()
+
+
+# Numbers compared between sessions: summary key, label, format, whether higher is better (None: neither)
+SESSION_METRICS = (
+    ("target_fps", "Target FPS", "{}", None),
+    ("mean_fps", "Mean FPS", "{:.2f}", True),
+    ("low_fps", "Low FPS (5th pct)", "{:.2f}", True),
+    ("slow_seconds", "Seconds under 90%", "{:d}", False),
+    ("dropped", "Dropped frames", "{:d}", False),
+    ("mean_cpu", "App CPU %", "{:.1f}", False),
+    ("peak_rss_mb", "Peak memory MB", "{:.1f}", False),
+    ("mean_disk_write", "System disk writes MB/s", "{:.2f}", False),
+)
+
+
+def read_session_log(path):
+    """Return (header, samples, summary) of a session log; summary is None if the session never finished"""
+    header, samples, summary = {}, [], None
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by a crash
+            kind = record.pop("type", None)
+            if kind == "session":
+                header = record
+            elif kind == "sample":
+                samples.append(record)
+            elif kind == "summary":
+                summary = record
+    return header, samples, summary
+
+
+def summarize_session(header, samples):
+    """Aggregate the per-second samples of a session into the numbers compared between sessions
+    
+    Paused seconds are left out, and so is the first second, which only
+    covers part of the startup.
+    """
+    active = [sample for sample in samples if not sample.get("paused")][1:]
+    config = header.get("config", {})
+    target_fps = 0 if config.get("timelapse_interval") else config.get("fps") or 0
+    
+    def mean(values):
+        values = [value for value in values if value is not None]
+        return round(sum(values) / len(values), 3) if values else 0.0
+    
+    def mean_by_key(key):
+        keys = {name for sample in active for name in sample.get(key, {})}
+        return {name: mean(sample.get(key, {}).get(name) for sample in active) for name in sorted(keys)}
+    
+    fps = np.array([sample["fps"] for sample in active], dtype=np.float64)
+    return {
+        "duration": samples[-1]["t"] if samples else 0.0,
+        "frames": (samples[-1]["frames"] or 0) if samples else 0,
+        "target_fps": target_fps,
+        "mean_fps": round(float(fps.mean()), 2) if len(fps) else 0.0,
+        "low_fps": round(float(np.percentile(fps, 5)), 2) if len(fps) else 0.0,
+        "slow_seconds": int((fps < 0.9 * target_fps).sum()) if target_fps else 0,
+        "dropped": sum(sample.get("dropped", 0) for sample in samples),
+        "mean_cpu": round(mean(sample["cpu"] for sample in active), 1),
+        "peak_rss_mb": max((sample["rss_mb"] for sample in samples), default=0.0),
+        "mean_disk_write": round(mean(sample.get("disk_write") for sample in active), 2),
+        "stages": mean_by_key("stages"),
+        "wait_ms": mean_by_key("wait_ms")
+    }
+
+
+def flatten_settings(settings, prefix=""):
+    """Nested settings as {"a.b": value} for listing differences"""
+    flat = {}
+    for key, value in settings.items():
+        if isinstance(value, dict) and value:
+            flat.update(flatten_settings(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def format_session_comparison(sessions):
+    """Text table of sessions side by side, each compared with the first
+    
+    Changes of 5% or more are marked as better or worse, then the settings
+    and hardware that differ between the sessions are listed.
+    """
+    def cell(value, template, baseline=None, higher_is_better=True):
+        if value is None:
+            return "n/a"
+        text = template.format(value)
+        if baseline:
+            change = (value - baseline) * 100 / abs(baseline)
+            mark = ""
+            if abs(change) >= 5 and higher_is_better is not None:
+                mark = " ✅" if (change > 0) == higher_is_better else " ⚠️"
+            text += f" ({change:+.0f}%{mark})"
+        return text
+    
+    metrics = [(("summary", key), label, template, higher) for key, label, template, higher in SESSION_METRICS]
+    for key, unit in (("stages", "ms/frame"), ("wait_ms", "CPU wait ms/s")):
+        names = sorted({name for session in sessions for name in session["summary"].get(key, {})})
+        metrics += [((key, name), f"{name} {unit}", "{:.3f}", False) for name in names]
+    
+    width = 26
+    lines = ["".ljust(32) + "".join(
+        datetime.fromtimestamp(session["started"]).strftime("%Y-%m-%d %H:%M").ljust(width) for session in sessions)]
+    lines.append("".ljust(32) + "".join(
+        os.path.basename(session["output_file"])[:width - 2].ljust(width) for session in sessions))
+    for (group, key), label, template, higher in metrics:
+        values = [(session["summary"] if group == "summary" else session["summary"].get(group, {})).get(key)
+                  for session in sessions]
+        cells = [cell(values[0], template)] + [cell(value, template, values[0], higher) for value in values[1:]]
+        lines.append(label[:31].ljust(32) + "".join(text.ljust(width) for text in cells))
+    
+    # What changed between the sessions, which is what the numbers are judged against
+    settings = [flatten_settings({**session["config"], "hardware": session["hardware"]}) for session in sessions]
+    differences = [
+        f"   {key}: " + " → ".join(str(flat.get(key, "–")) for flat in settings)
+        for key in sorted(set().union(*settings))
+        if len({json.dumps(flat.get(key), sort_keys=True) for flat in settings}) > 1
+    ]
+    lines.append("")
+    lines.append("Differences:" if differences else "Same settings and hardware")
+    lines.extend(differences)
+    return "\n".join(lines)
+
+
+def sustained_growth(times, values, limit):
+    """True when both halves of a series grow faster than limit per unit of time"""
+    half = len(values) // 2
+    if half < 2:
+        return False
+    slopes = [np.polyfit(times[part], values[part], 1)[0] for part in (slice(0, half), slice(half, None))]
+    return min(slopes) > limit
+
+
+class SoakTest(QObject):
+    """Long recording against a synthetic source in accelerated time, watched for leaks
+    
+    The recorder runs without frame pacing, so hours of frames are recorded in
+    minutes. The event loop polls the recorder status as the GUI would, and
+    every sample_interval (real seconds) a sampling thread records RSS, traced
+    Python memory and open file descriptors against simulated hours; it runs
+    off the event loop so a busy GUI cannot delay it. A metric fails when it
+    keeps growing through both halves of the run after the warm-up.
+    """
+    finished = Signal(dict)
+    
+    # Allowed growth per simulated hour
+    LIMITS = {"rss_mb": 16.0, "traced_mb": 8.0, "open_files": 0.5}
+    
+    def __init__(self, hours=8.0, fps=30, size=(640, 360), sample_interval=1.0, gui_delay=0.0,
+                 warmup=0.1, parent=None):
+        super().__init__(parent)
+        self.hours = hours
+        self.fps = fps
+        self.size = size
+        self.gui_delay = gui_delay
+        self.warmup_hours = hours * warmup
+        self.directory = None
+        self.recorder = None
+        self.samples = []
+        self.baseline = None
+        self.final_snapshot = None
+        self.status_polls = 0
+        self.segment_hour = 0
+        self.process = psutil.Process()
+        self.sample_interval = sample_interval
+        self.stop_event = threading.Event()
+        self.sampler = threading.Thread(target=self.sample_loop, name="SoakSampler", daemon=True)
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.poll_status)
+    
+    def start(self):
+        tracemalloc.start()
+        self.directory = tempfile.mkdtemp(prefix="eem_soak_")
+        self.started = time.time()
+        self.recorder = AdvancedScreenRecorder(
+            os.path.join(self.directory, "soak.mp4"), camera_device=None, fps=self.fps,
+            record_audio=False, frame_source=SyntheticFrameSource(*self.size), accelerated=True)
+        
+        self.recorder.recording_finished.connect(self.finish)
+        self.recorder.start()
+        self.sampler.start()
+        self.status_timer.start(int(STATUS_INTERVAL * 1000))
+    
+    def poll_status(self):
+        """Read the status the way the GUI does"""
+        status = self.recorder.status.snapshot
+        if status["preview"] is not None:
+            self.status_polls += 1
+        if self.gui_delay:
+            time.sleep(self.gui_delay)  # Stand-in for a busy GUI thread
+    
+    def open_files(self):
+        try:
+            return self.process.num_fds()
+        except AttributeError:
+            return self.process.num_handles()
+    
+    def sample_loop(self):
+        while not self.stop_event.wait(self.sample_interval):
+            if self.sample():
+                break
+    
+    def sample(self):
+        """Record one sample, returns True once the simulated duration is reached"""
+        recorder = self.recorder
+        simulated = recorder.frame_count / self.fps / 3600
+        self.samples.append({
+            "hours": simulated,
+            "elapsed": time.time() - self.started,
+            "rss_mb": self.process.memory_info().rss / (1024 * 1024),
+            "traced_mb": tracemalloc.get_traced_memory()[0] / (1024 * 1024),
+            "open_files": self.open_files()
+        })
+        
+        if self.baseline is None and simulated >= self.warmup_hours:
+            self.baseline = (tracemalloc.take_snapshot(), len(self.samples) - 1)
+        
+        # A new segment every simulated hour exercises rotation and keeps the disk footprint small
+        if int(simulated) > self.segment_hour:
+            self.segment_hour = int(simulated)
+            recorder.rotate_output(self.directory)
+        for output_file, record_file in recorder.segments[:-1]:
+            for path in (record_file, output_file + INDEX_EXTENSION):
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        if simulated >= self.hours or not recorder.is_recording:
+            # Snapshot before stopping, while anything queued up is still held
+            self.final_snapshot = tracemalloc.take_snapshot()
+            recorder.stop_recording()
+            return True
+        return False
+    
+    def finish(self):
+        self.status_timer.stop()
+        self.stop_event.set()
+        self.sampler.join()
+        self.recorder.wait()
+        snapshot = self.final_snapshot or tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.finished.emit(self.report(snapshot))
+    
+    def report(self, snapshot):
+        """Verdicts per metric and the allocation sites that grew most since the warm-up"""
+        start = self.baseline[1] if self.baseline else 0
+        samples = self.samples[start:]
+        times = np.array([sample["hours"] for sample in samples])
+        metrics = {}
+        for name, limit in self.LIMITS.items():
+            values = np.array([sample[name] for sample in samples], dtype=np.float64)
+            metrics[name] = {
+                "start": float(values[0]) if len(values) else 0.0,
+                "end": float(values[-1]) if len(values) else 0.0,
+                "limit_per_hour": limit,
+                "failed": bool(sustained_growth(times, values, limit))
+            }
+        
+        growth = []
+        if self.baseline:
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            for stat in snapshot.filter_traces(ignore).compare_to(self.baseline[0].filter_traces(ignore), "lineno")[:10]:
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    growth.append({"site": f"{frame.filename}:{frame.lineno}",
+                                   "grown_kb": stat.size_diff / 1024, "blocks": stat.count_diff})
+        
+        return {
+            "hours": self.hours,
+            "fps": self.fps,
+            "frames": self.recorder.frame_count,
+            "status_polls": self.status_polls,
+            "elapsed": time.time() - self.started,
+            "passed": not any(metric["failed"] for metric in metrics.values()),
+            "metrics": metrics,
+            "growth": growth,
+            "samples": self.samples
+        }
+
+
+def format_soak_report(report):
+    """Human-readable summary of a soak test report"""
+    lines = [f"Soak test: {report['hours']:g} h at {report['fps']} fps ({report['frames']} frames) "
+             f"in {report['elapsed'] / 60:.1f} min - {'PASSED' if report['passed'] else 'FAILED'}"]
+    for name, metric in report["metrics"].items():
+        lines.append(f"  {name}: {metric['start']:.1f} -> {metric['end']:.1f} "
+                     f"(limit {metric['limit_per_hour']:g}/h){'  <-- sustained growth' if metric['failed'] else ''}")
+    if report["growth"]:
+        lines.append("Allocation sites that grew since the warm-up:")
+        for site in report["growth"]:
+            lines.append(f"  {site['grown_kb']:10.1f} KB  {site['blocks']:+7d} blocks  {site['site']}")
+    return "\n".join(lines)
+
+
+def run_soak_test(argv):
+    """Command line entry point: python app.py --soak HOURS [--fps N] [--size WxH] [--gui-delay S]"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="app.py --soak")
+    parser.add_argument("--soak", type=float, metavar="HOURS", required=True, help="simulated hours to record")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--size", default="640x360", help="synthetic frame size")
+    parser.add_argument("--gui-delay", type=float, default=0.0, help="seconds each status poll blocks the event loop")
+    parser.add_argument("--report", help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+    
+    width, _, height = args.size.partition("x")
+    qt_app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    soak = SoakTest(args.soak, args.fps, (int(width), int(height)), gui_delay=args.gui_delay)
+    result = {}
+    
+    def done(report):
+        result.update(report)
+        qt_app.quit()
+    
+    soak.finished.connect(done)
+    soak.start()
+    qt_app.exec()
+    
+    print(format_soak_report(result))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 0 if result.get("passed") else 1
+
+
+# Frame rates tried by calibration, best first, and the margin each must leave
+CALIBRATION_FPS = (60, 30, 24)
+CALIBRATION_HEADROOM = 1.25
+# Live x264 presets from best quality to cheapest
+STREAM_PRESETS = ("veryfast", "superfast", "ultrafast")
+
+
+def cpu_model_name():
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu = line.partition(":")[2].strip()
+                    break
+    except OSError:
+        pass
+    return cpu
+
+
+def hardware_fingerprint(width, height):
+    """Stable id of everything calibration results depend on"""
+    blob = json.dumps([cpu_model_name(), os.cpu_count(), round(psutil.virtual_memory().total / 2**30), platform.system(),
+                       width, height, cv2.__version__, bool(find_ffmpeg_tool())])
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def load_calibration(fingerprint):
+    """Return the cached calibration for a fingerprint, or None"""
+    try:
+        with open(get_app_data_path("calibration.json"), 'r') as f:
+            return json.load(f).get(fingerprint)
+    except (OSError, ValueError):
+        return None
+
+
+def time_per_call(function, count):
+    """Average milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - started) * 1000 / count
+
+
+def benchmark_x264(frames, preset, count=30):
+    """Milliseconds per frame for a live libx264 encode, or None without FFmpeg"""
+    ffmpeg = find_ffmpeg_tool()
+    if not ffmpeg:
+        return None
+    
+    height, width = frames[0].shape[:2]
+    process = subprocess.Popen(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "bgr24",
+         "-s", f"{width}x{height}", "-r", "30", "-i", "pipe:0", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+         "-c:v", "libx264", "-preset", preset, "-tune", "zerolatency", "-pix_fmt", "yuv420p", "-f", "null", "-"],
+        stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    started = None
+    try:
+        # The first frame only gets through once FFmpeg is up, start timing after it
+        process.stdin.write(frames[0].tobytes())
+        started = time.perf_counter()
+        for index in range(1, count + 1):
+            process.stdin.write(frames[index % len(frames)].tobytes())
+    except BrokenPipeError:
+        started = None  # FFmpeg quit before taking every frame, there is nothing to time
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            started = None
+    if process.wait() != 0 or started is None:
+        return None
+    return (time.perf_counter() - started) * 1000 / count
+
+
+def recommend_settings(timings, fps_options=CALIBRATION_FPS, headroom=CALIBRATION_HEADROOM):
+    """Pick the highest frame rate some capture mode and pipeline sustain with headroom
+    
+    The threaded recorder pays for capture, preview conversion and encoding in
+    one loop; the multi-process pipeline overlaps capture and encoding, so only
+    the slower of the two has to fit. Direct encoding is preferred over Fast
+    Capture because it needs no encode after the recording.
+    """
+    encoders = {"direct": timings["encode_direct"], "spool": timings["encode_spool"]}
+    for fps in fps_options:
+        budget = 1000.0 / fps / headroom
+        for capture_mode, encode in encoders.items():
+            if timings["capture"] + timings["convert"] + encode <= budget:
+                pipeline = "threaded"
+            elif max(timings["capture"], encode) <= budget:
+                pipeline = "process"
+            else:
+                continue
+            
+            stream_preset = next((preset for preset in STREAM_PRESETS
+                                  if (timings.get("x264_" + preset) or 0) <= budget), STREAM_PRESETS[-1])
+            return {"fps": fps, "capture_mode": capture_mode, "pipeline": pipeline,
+                    "stream_preset": stream_preset, "sustained": True}
+    
+    # Nothing keeps up, take the cheapest combination
+    return {"fps": fps_options[-1], "capture_mode": "spool", "pipeline": "process",
+            "stream_preset": STREAM_PRESETS[-1], "sustained": False}
+
+
+def calibrate_hardware(width, height, quality=85):
+    """Microbenchmark capture, colour conversion and encoders at the screen size
+    
+    Returns the timings in milliseconds per frame with the recommended settings
+    and caches them in ~/.eem_studio/calibration.json under the hardware
+    fingerprint.
+    """
+    source = SyntheticFrameSource(width, height)
+    frames = [source.grab() for _ in range(8)]
+    cycle = itertools.cycle(frames)
+    timings = {}
+    
+    grab_screen_frame(0, 0, width, height)
+    timings["capture"] = time_per_call(lambda: grab_screen_frame(0, 0, width, height), 10)
+    timings["convert"] = time_per_call(lambda: cv2.cvtColor(next(cycle), cv2.COLOR_BGR2RGB), 30)
+    
+    with tempfile.TemporaryDirectory(prefix="eem_calibration_") as directory:
+        writer = cv2.VideoWriter(os.path.join(directory, "direct.mp4"), cv2.VideoWriter_fourcc(*'mp4v'),
+                                 30, (width, height))
+        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, quality)
+        timings["encode_direct"] = time_per_call(lambda: writer.write(next(cycle)), 30)
+        writer.release()
+        
+        spool = FrameSpoolWriter(os.path.join(directory, "fast.spool"), width, height, 30, fsync_policy="none")
+        timings["encode_spool"] = time_per_call(lambda: spool.write(next(cycle)), 30)
+        spool.release()
+    
+    for preset in STREAM_PRESETS:
+        cost = benchmark_x264(frames, preset)
+        if cost is not None:
+            timings["x264_" + preset] = cost
+    
+    fingerprint = hardware_fingerprint(width, height)
+    result = {
+        "fingerprint": fingerprint,
+        "screen": [width, height],
+        "calibrated": time.time(),
+        "timings": timings,
+        "recommendation": recommend_settings(timings)
+    }
+    
+    cache_file = get_app_data_path("calibration.json")
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache[fingerprint] = result
+    with open(cache_file, 'w') as f:
+        json.dump(cache, f, indent=2)
+    return result
+
+
+def find_ffmpeg_tool(name="ffmpeg"):
+    """Locate an FFmpeg command line tool, or None if it is not installed"""
+    return shutil.which(name)
+
+
+def run_ffmpeg_tool(args, name="ffmpeg"):
+    """Run an FFmpeg tool and return its stdout, raising RuntimeError on failure"""
+    tool = find_ffmpeg_tool(name)
+    if not tool:
+        raise RuntimeError(f"{name} was not found. Install FFmpeg to use this feature.")
+    
+    result = subprocess.run([tool, "-hide_banner", "-loglevel", "error"] + args,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="replace").strip().splitlines()
+        raise RuntimeError(message[-1] if message else f"{name} failed with code {result.returncode}")
+    return result.stdout
+
+
+class ResultCache:
+    """On-disk cache of derived files keyed by source path, size and mtime"""
+    
+    def __init__(self, name="postprocess"):
+        self.directory = os.path.dirname(get_app_data_path("cache", name, "_"))
+    
+    def key(self, source_files, operation, **params):
+        """Build a cache key that changes whenever a source file is modified"""
+        sources = []
+        for path in ([source_files] if isinstance(source_files, str) else source_files):
+            stat = os.stat(path)
+            sources.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+        
+        blob = json.dumps([sources, operation, params], sort_keys=True)
+        return hashlib.sha1(blob.encode()).hexdigest()
+    
+    def path(self, key, extension):
+        return os.path.join(self.directory, key + extension)
+    
+    def get(self, key, extension):
+        """Return the cached file for a key, or None"""
+        path = self.path(key, extension)
+        return path if os.path.exists(path) else None
+    
+    def get_json(self, key):
+        path = self.get(key, ".json")
+        if path:
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return None
+    
+    def put_json(self, key, value):
+        with open(self.path(key, ".json"), 'w') as f:
+            json.dump(value, f)
+
+
+def probe_recording(path):
+    """Read basic stream properties without decoding frames"""
+    info = {"duration": 0.0, "width": 0, "height": 0, "fps": 0.0, "codec": "", "frames": 0}
+    
+    if find_ffmpeg_tool("ffprobe"):
+        output = run_ffmpeg_tool(["-select_streams", "v:0", "-print_format", "json",
+                                  "-show_entries", "stream=codec_name,width,height,avg_frame_rate,nb_frames:format=duration",
+                                  path], name="ffprobe")
+        data = json.loads(output or b"{}")
+        stream = (data.get("streams") or [{}])[0]
+        num, _, den = stream.get("avg_frame_rate", "0/1").partition("/")
+        info.update(
+            duration=float(data.get("format", {}).get("duration") or 0),
+            width=int(stream.get("width") or 0),
+            height=int(stream.get("height") or 0),
+            fps=float(num) / float(den) if den and float(den) else 0.0,
+            codec=stream.get("codec_name", ""),
+            frames=int(stream.get("nb_frames") or 0)
+        )
+        return info
+    
+    # OpenCV reads the same numbers from the container header
+    cap = cv2.VideoCapture(path)
+    if cap.isOpened():
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        info.update(
+            duration=frames / fps if fps else 0.0,
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=fps,
+            frames=frames
+        )
+    cap.release()
+    return info
+
+
+def probe_keyframes(path, cache=None):
+    """Return sorted keyframe timestamps by scanning packet headers only"""
+    cache = cache or ResultCache()
+    key = cache.key(path, "keyframes")
+    cached = cache.get_json(key)
+    if cached is not None:
+        return cached
+    
+    output = run_ffmpeg_tool(["-select_streams", "v:0", "-show_entries", "packet=pts_time,flags",
+                              "-of", "csv=p=0", path], name="ffprobe")
+    keyframes = []
+    for line in output.decode(errors="replace").splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            keyframes.append(float(pts_time))
+    keyframes.sort()
+    
+    cache.put_json(key, keyframes)
+    return keyframes
+
+
+def trim_recording(source_file, output_file, start, end=None, cache=None):
+    """Cut a recording without re-encoding
+    
+    Stream copy can only start on a keyframe, so the start is moved back to the
+    nearest keyframe. Returns the (start, end) actually used.
+    """
+    cache = cache or ResultCache()
+    keyframes = probe_keyframes(source_file, cache)
+    index = bisect.bisect_right(keyframes, start + 1e-6) - 1
+    cut_start = keyframes[index] if index >= 0 else 0.0
+    
+    key = cache.key(source_file, "trim", start=cut_start, end=end, output=os.path.abspath(output_file))
+    done = cache.get_json(key)
+    if done and os.path.exists(output_file) and os.path.getmtime(output_file) == done["mtime"]:
+        return cut_start, end
+    
+    args = ["-y", "-ss", f"{cut_start:.6f}", "-i", source_file]
+    if end is not None:
+        args += ["-t", f"{max(0.0, end - cut_start):.6f}"]
+    args += ["-map", "0", "-c", "copy", "-avoid_negative_ts", "make_zero", output_file]
+    run_ffmpeg_tool(args)
+    
+    cache.put_json(key, {"mtime": os.path.getmtime(output_file)})
+    return cut_start, end
+
+
+def concat_recordings(source_files, output_file, cache=None):
+    """Join recordings with identical stream settings without re-encoding"""
+    cache = cache or ResultCache()
+    
+    # The concat demuxer needs matching streams, check before touching the disk
+    reference = None
+    for path in source_files:
+        info = probe_recording(path)
+        signature = (info["codec"], info["width"], info["height"])
+        if reference is None:
+            reference = signature
+        elif signature != reference:
+            raise ValueError(f"{os.path.basename(path)} does not match the other recordings "
+                             f"({signature[1]}×{signature[2]} {signature[0]})")
+    
+    key = cache.key(source_files, "concat", output=os.path.abspath(output_file))
+    done = cache.get_json(key)
+    if done and os.path.exists(output_file) and os.path.getmtime(output_file) == done["mtime"]:
+        return output_file
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as list_file:
+        for path in source_files:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+    
+    try:
+        run_ffmpeg_tool(["-y", "-f", "concat", "-safe", "0", "-i", list_file.name,
+                         "-map", "0", "-c", "copy", output_file])
+    finally:
+        os.remove(list_file.name)
+    
+    cache.put_json(key, {"mtime": os.path.getmtime(output_file)})
+    return output_file
+
+
+def extract_thumbnail(source_file, timestamp, width=320, cache=None):
+    """Save the keyframe nearest before a timestamp as a JPEG and return its path"""
+    cache = cache or ResultCache()
+    key = cache.key(source_file, "thumbnail", time=round(timestamp, 3), width=width)
+    cached = cache.get(key, ".jpg")
+    if cached:
+        return cached
+    
+    thumb_file = cache.path(key, ".jpg")
+    if find_ffmpeg_tool():
+        # Input seeking without accurate seek emits the keyframe, nothing else is decoded
+        run_ffmpeg_tool(["-y", "-noaccurate_seek", "-ss", f"{timestamp:.3f}", "-skip_frame", "nokey",
+                         "-i", source_file, "-frames:v", "1", "-vf", f"scale={width}:-2",
+                         "-q:v", "4", thumb_file])
+    else:
+        cap = cv2.VideoCapture(source_file)
+        cap.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
+        ret, frame = cap.read()
+        cap.release()
+        if not ret:
+            raise RuntimeError(f"Could not read a frame at {timestamp:.1f}s")
+        
+        height = max(2, int(frame.shape[0] * width / frame.shape[1]) // 2 * 2)
+        cv2.imwrite(thumb_file, cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA))
+    
+    if not os.path.exists(thumb_file):
+        raise RuntimeError(f"No frame found at {timestamp:.1f}s")
+    return thumb_file
+
+
+def create_contact_sheet(source_file, columns=4, rows=4, thumb_width=320, cache=None):
+    """Tile evenly spaced keyframe thumbnails into one image and return its path"""
+    cache = cache or ResultCache()
+    key = cache.key(source_file, "contact_sheet", columns=columns, rows=rows, width=thumb_width)
+    cached = cache.get(key, ".jpg")
+    if cached:
+        return cached
+    
+    duration = probe_recording(source_file)["duration"]
+    count = columns * rows
+    tiles = []
+    for i in range(count):
+        timestamp = duration * (i + 0.5) / count
+        try:
+            tile = cv2.imread(extract_thumbnail(source_file, timestamp, thumb_width, cache))
+        except RuntimeError:
+            tile = None
+        if tile is None:
+            continue
+        
+        label = f"{int(timestamp) // 3600:02d}:{(int(timestamp) % 3600) // 60:02d}:{int(timestamp) % 60:02d}"
+        cv2.putText(tile, label, (8, tile.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 3)
+        cv2.putText(tile, label, (8, tile.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        tiles.append(tile)
+    
+    if not tiles:
+        raise RuntimeError("No thumbnails could be extracted")
+    
+    tile_height = max(tile.shape[0] for tile in tiles)
+    sheet = np.zeros((rows * tile_height, columns * thumb_width, 3), dtype=np.uint8)
+    for i, tile in enumerate(tiles):
+        y, x = (i // columns) * tile_height, (i % columns) * thumb_width
+        h, w = min(tile.shape[0], tile_height), min(tile.shape[1], thumb_width)
+        sheet[y:y+h, x:x+w] = tile[:h, :w]
+    
+    sheet_file = cache.path(key, ".jpg")
+    cv2.imwrite(sheet_file, sheet)
+    return sheet_file
+
+
+# GIF palette slot left free to mark pixels that did not change
+GIF_TRANSPARENT = 255
+
+
+def read_animation_frames(source_file, start=0.0, end=None, fps=10, width=480, crop=None, progress=None):
+    """Decode a time range at a reduced rate and size
+
+    Returns a list of [frame, duration_ms]; a frame identical to the one before
+    it is dropped and its time added to the previous duration.
+    """
+    cap = cv2.VideoCapture(source_file)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open {os.path.basename(source_file)}")
+    
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    if end is None:
+        end = cap.get(cv2.CAP_PROP_FRAME_COUNT) / source_fps
+    if start > 0:
+        cap.set(cv2.CAP_PROP_POS_MSEC, start * 1000)
+    
+    step = 1.0 / fps
+    next_time = start
+    frames = []
+    size = None
+    while True:
+        # Frames between output ticks are only demuxed, never converted
+        if not cap.grab():
+            break
+        timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if end and timestamp >= end:
+            break
+        if timestamp + 1e-3 < next_time:
+            continue
+        next_time += step * max(1, int((timestamp - next_time) / step) + 1)
+        
+        ret, frame = cap.retrieve()
+        if not ret:
+            break
+        if crop:
+            x, y, w, h = crop
+            frame = frame[y:y+h, x:x+w]
+        if size is None:
+            height, source_width = frame.shape[:2]
+            out_width = min(width or source_width, source_width)
+            size = (out_width, max(1, round(height * out_width / source_width)))
+        if size != (frame.shape[1], frame.shape[0]):
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        
+        if frames and np.array_equal(frames[-1][0], frame):
+            frames[-1][1] += step * 1000
+        else:
+            frames.append([frame, step * 1000])
+        
+        if progress and end:
+            progress(min(99, int((timestamp - start) * 100 / max(1e-6, end - start))))
+    cap.release()
+    
+    if not frames:
+        raise RuntimeError("No frames in the selected range")
+    return frames
+
+
+def build_global_palette(frames, colors=255, sample_count=32):
+    """Quantise a montage of sampled frames once and return (palette, lookup table)
+
+    The lookup table maps every 15-bit RGB value to its nearest palette entry,
+    so quantising a frame is a single table lookup per pixel.
+    """
+    step = max(1, len(frames) // sample_count)
+    samples = [frame for frame, _ in frames[::step]]
+    height = samples[0].shape[0]
+    if height * len(samples) > 4096:
+        # The palette only needs the colour mix, not the full resolution
+        scale = 4096 / (height * len(samples))
+        samples = [cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+                   for frame in samples]
+    montage = cv2.cvtColor(np.vstack(samples), cv2.COLOR_BGR2RGB)
+    
+    quantized = Image.fromarray(montage).quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+    used = np.unique(np.asarray(quantized))
+    palette = np.array(quantized.getpalette()[:256 * 3], dtype=np.int32).reshape(-1, 3)[used]
+    
+    levels = (np.arange(32, dtype=np.int32) << 3) | 4
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).reshape(-1, 3)
+    lut = np.empty(len(grid), dtype=np.uint8)
+    for offset in range(0, len(grid), 4096):
+        distances = ((grid[offset:offset+4096, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+        lut[offset:offset+4096] = distances.argmin(axis=1)
+    
+    table = np.zeros((256, 3), dtype=np.uint8)
+    table[:len(palette)] = palette
+    return table, lut
+
+
+def quantize_frame(frame, lut):
+    """Map a BGR frame to palette indices through a 15-bit lookup table"""
+    reduced = frame >> 3
+    key = reduced[..., 2].astype(np.uint16) << 10
+    key |= reduced[..., 1].astype(np.uint16) << 5
+    key |= reduced[..., 0]
+    return lut[key]
+
+
+def encode_gif_frame(indices, offset, duration):
+    """LZW-encode one frame's sub-rectangle with its graphic control block"""
+    image = Image.fromarray(indices, "L")
+    # GIF delays are in hundredths of a second
+    return b"".join(GifImagePlugin.getdata(image, offset, duration=round(duration / 10) * 10, disposal=1,
+                                           transparency=GIF_TRANSPARENT))
+
+
+def export_animation(source_file, output_file, progress, start=0.0, end=None, fps=10, width=480,
+                     crop=None, quality=80, workers=None):
+    """Export part of a recording as a looping GIF or WebP
+
+    GIFs share one palette computed up front. Each frame after the first only
+    stores the rectangle that changed, with unchanged pixels inside it left
+    transparent. Quantisation and LZW encoding run on a thread pool.
+    """
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow was not found. Install Pillow to export GIF or WebP.")
+    
+    frames = read_animation_frames(source_file, start, end, fps, width, crop,
+                                   lambda percent: progress(percent // 2))
+    part_file = get_partial_path(output_file)
+    
+    if output_file.lower().endswith(".webp"):
+        # libwebp crops sub-frames itself, only the duplicates have to go
+        images = [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame, _ in frames]
+        images[0].save(part_file, "WEBP", save_all=True, append_images=images[1:],
+                       duration=[round(duration) for _, duration in frames], loop=0,
+                       quality=quality, method=4)
+        os.replace(part_file, output_file)
+        return output_file
+    
+    palette, lut = build_global_palette(frames)
+    height, width = frames[0][0].shape[:2]
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        indexed = list(pool.map(lambda item: quantize_frame(item[0], lut), frames))
+        progress(60)
+        
+        # Differencing is sequential, each frame is compared with the last one kept
+        rectangles = [[indexed[0], (0, 0), frames[0][1]]]
+        previous = indexed[0]
+        for indices, (_frame, duration) in zip(indexed[1:], frames[1:]):
+            changed = indices != previous
+            x, y, w, h = cv2.boundingRect(changed.view(np.uint8))
+            if w == 0:
+                rectangles[-1][2] += duration
+                continue
+            
+            patch = indices[y:y+h, x:x+w].copy()
+            patch[~changed[y:y+h, x:x+w]] = GIF_TRANSPARENT
+            rectangles.append([patch, (x, y), duration])
+            previous = indices
+        progress(70)
+        
+        blocks = pool.map(lambda item: encode_gif_frame(*item), rectangles)
+        
+        with open(part_file, "wb") as f:
+            # Header, logical screen with a 256-entry global colour table, loop forever
+            f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF7, 0, 0))
+            f.write(palette.tobytes())
+            f.write(b"!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+            for index, block in enumerate(blocks):
+                f.write(block)
+                progress(70 + (index + 1) * 29 // len(rectangles))
+            f.write(b";")
+    
+    os.replace(part_file, output_file)
+    return output_file
+
+
+class PostProcessTask(QThread):
+    """Run a post-recording operation off the GUI thread"""
+    task_finished = Signal(object, str)  # Result, error message
+    
+    def __init__(self, function, *args, parent=None):
+        super().__init__(parent)
+        self.function = function
+        self.args = args
+    
+    def run(self):
+        try:
+            self.task_finished.emit(self.function(*self.args), "")
+        except Exception as e:
+            self.task_finished.emit(None, str(e))
+
+
+def get_partial_path(output_file):
+    """Path an output is written to before being renamed into place"""
+    root, ext = os.path.splitext(output_file)
+    return f"{root}.part{ext}"
+
+
+def get_encoder_args(output_file, quality):
+    """FFmpeg video encoder arguments suited to the output container"""
+    ext = os.path.splitext(output_file)[1].lower()
+    if ext == ".avi":
+        return ["-c:v", "mpeg4", "-vtag", "XVID", "-q:v", str(max(2, int(round(31 - 0.29 * quality))))]
+    if ext == ".webm":
+        return ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", str(int(round(63 - 0.45 * quality)))]
+    
+    args = ["-c:v", "libx264", "-preset", "medium", "-crf", str(int(round(51 - 0.35 * quality))),
+            "-pix_fmt", "yuv420p"]
+    if ext in (".mp4", ".mov"):
+        args += ["-movflags", "+faststart"]
+    return args
+
+
+class PacketSink(ABC, threading.Thread):
+    """Sends the encoded stream to one network target from its own bounded queue
+    
+    offer() never blocks. When the target is slow or unreachable its queue
+    fills up and further chunks are dropped for this sink alone; the
+    connection is retried every few seconds.
+    """
+    
+    QUEUE_CHUNKS = 64
+    RETRY_INTERVAL = 2.0
+    
+    def __init__(self, url):
+        super().__init__(name=f"eem-sink-{url.split(':', 1)[0]}", daemon=True)
+        self.url = url
+        self.chunks = queue.Queue(maxsize=self.QUEUE_CHUNKS)
+        self.stop_event = threading.Event()
+        self.sent_bytes = 0
+        self.dropped = 0
+        self.state = "connecting"
+        self.error = None
+        self.next_retry = 0.0
+    
+    def offer(self, chunk):
+        try:
+            self.chunks.put_nowait(chunk)
+        except queue.Full:
+            self.dropped += 1
+    
+    def address(self):
+        # udp://host:port?pkt_size=1316 style options are FFmpeg's, not part of the address
+        host, _, port = self.url.split("://", 1)[1].split("/", 1)[0].split("?", 1)[0].rpartition(":")
+        return host.strip("[]"), int(port)
+    
+    @abstractmethod
+    def connected(self):
+        """Whether chunks can be sent without connecting first"""
+    
+    @abstractmethod
+    def connect(self):
+        """Open the connection, raising OSError if the target cannot be reached"""
+    
+    @abstractmethod
+    def send(self, chunk):
+        """Send one chunk over the open connection"""
+    
+    def disconnect(self):
+        pass
+    
+    def run(self):
+        while True:
+            try:
+                chunk = self.chunks.get(timeout=0.5)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    break
+                continue
+            if chunk is None:
+                break
+            
+            try:
+                if not self.connected():
+                    if time.time() < self.next_retry:
+                        self.dropped += 1
+                        continue
+                    self.connect()
+                    self.state = "streaming"
+                self.send(chunk)
+                self.sent_bytes += len(chunk)
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+                self.state = "reconnecting"
+                self.dropped += 1
+                self.disconnect()
+                self.next_retry = time.time() + self.RETRY_INTERVAL
+        
+        self.disconnect()
+        self.state = "closed"
+    
+    def close(self):
+        self.stop_event.set()
+        try:
+            self.chunks.put_nowait(None)
+        except queue.Full:
+            pass
+        self.join(timeout=5)
+    
+    def stats(self):
+        return {"url": self.url, "state": self.state, "sent": self.sent_bytes,
+                "dropped": self.dropped, "error": self.error}
+
+
+class UdpPacketSink(PacketSink):
+    """MPEG-TS over UDP, seven TS packets per datagram like FFmpeg's udp output"""
+    
+    DATAGRAM_SIZE = 7 * TS_PACKET_SIZE
+    
+    def __init__(self, url):
+        super().__init__(url)
+        self.sock = None
+    
+    def connected(self):
+        return self.sock is not None
+    
+    def connect(self):
+        host, port = self.address()
+        family, kind, protocol, _, address = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)[0]
+        self.sock = socket.socket(family, kind, protocol)
+        self.sock.connect(address)
+    
+    def send(self, chunk):
+        for start in range(0, len(chunk), self.DATAGRAM_SIZE):
+            self.sock.send(chunk[start:start + self.DATAGRAM_SIZE])
+    
+    def disconnect(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+
+class TcpPacketSink(UdpPacketSink):
+    """MPEG-TS over a plain TCP connection, a stalled receiver times out and is reconnected"""
+    
+    SEND_TIMEOUT = 2.0
+    
+    def connect(self):
+        self.sock = socket.create_connection(self.address(), timeout=self.SEND_TIMEOUT)
+    
+    def send(self, chunk):
+        self.sock.sendall(chunk)
+
+
+class FfmpegRelaySink(PacketSink):
+    """SRT, RTMP and other FFmpeg protocols, remuxed by a copy-only FFmpeg process"""
+    
+    def __init__(self, url):
+        super().__init__(url)
+        self.process = None
+    
+    def connected(self):
+        return self.process is not None and self.process.poll() is None
+    
+    def connect(self):
+        ffmpeg = find_ffmpeg_tool()
+        if not ffmpeg:
+            raise OSError("ffmpeg was not found")
+        
+        output_format = "flv" if self.url.startswith(("rtmp://", "rtmps://")) else "mpegts"
+        self.process = subprocess.Popen(
+            [ffmpeg, "-hide_banner", "-loglevel", "error", "-f", "mpegts", "-i", "pipe:0",
+             "-c", "copy", "-f", output_format, self.url],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    def send(self, chunk):
+        self.process.stdin.write(chunk)
+        self.process.stdin.flush()
+    
+    def disconnect(self):
+        if self.process:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+
+def create_packet_sink(url):
+    """Pick the sink for a stream target URL"""
+    if url.startswith("udp://"):
+        return UdpPacketSink(url)
+    if url.startswith("tcp://"):
+        return TcpPacketSink(url)
+    return FfmpegRelaySink(url)
+
+
+class TeeStreamWriter:
+    """Encodes frames once with FFmpeg and fans the packets out to the file and network sinks
+    
+    FFmpeg's tee muxer writes the output file itself and the same packets as
+    MPEG-TS to a pipe. A reader thread cuts the pipe on TS packet boundaries
+    and offers each chunk to every sink, so a slow network target only drops
+    its own packets and never holds up the file.
+    """
+    
+    def __init__(self, output_file, width, height, fps, quality, targets, preset="veryfast", stages=None):
+        ffmpeg = find_ffmpeg_tool()
+        if not ffmpeg:
+            raise RuntimeError("Streaming needs ffmpeg on the PATH")
+        
+        self.keyframe_interval = max(1, int(round(fps * 2)))
+        extension = os.path.splitext(output_file)[1].lower()
+        # Fragmented MP4 stays playable if the recording is cut short
+        file_options = "movflags=+frag_keyframe+empty_moov:" if extension in (".mp4", ".mov") else ""
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            [ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+             "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "pipe:0",
+             "-map", "0:v", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+             "-c:v", "libx264", "-preset", preset, "-tune", "zerolatency",
+             "-crf", str(int(round(51 - 0.35 * quality))), "-pix_fmt", "yuv420p", "-g", str(self.keyframe_interval),
+             # Containers want the codec headers up front, the stream repeats them on every keyframe
+             "-flags", "+global_header", "-f", "tee",
+             f"[{file_options}onfail=abort]{output_file}|"
+             f"[f=mpegts:onfail=ignore:bsfs/v=dump_extra=freq=keyframe]pipe:1"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=self.log)
+        self.stages = stages or PipelineStages()
+        self.stages.enter("encode", shared=("write",), pid=self.process.pid)
+        
+        self.sinks = [create_packet_sink(url) for url in targets]
+        for sink in self.sinks:
+            sink.start()
+        self.pump_thread = threading.Thread(target=self.pump, name="eem-tee", daemon=True)
+        self.pump_thread.start()
+    
+    def isOpened(self):
+        return self.process.poll() is None
+    
+    def write(self, frame):
+        if self.process.poll() is not None:
+            raise OSError(f"ffmpeg stopped: {self.read_error()}")
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+    
+    def pump(self):
+        self.stages.enter("write")
+        pending = b""
+        while True:
+            data = self.process.stdout.read1(65536)
+            if not data:
+                break
+            pending += data
+            usable = len(pending) - len(pending) % TS_PACKET_SIZE
+            if usable:
+                chunk, pending = pending[:usable], pending[usable:]
+                for sink in self.sinks:
+                    sink.offer(chunk)
+    
+    def read_error(self):
+        self.log.seek(0)
+        lines = self.log.read().decode(errors="replace").strip().splitlines()
+        return lines[-1] if lines else f"exit code {self.process.returncode}"
+    
+    def sink_stats(self):
+        return [sink.stats() for sink in self.sinks]
+    
+    def release(self):
+        """Finish the file and close the sinks, returns the encoder's error if it failed"""
+        if self.log.closed:
+            return None
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+        self.pump_thread.join()
+        for sink in self.sinks:
+            sink.close()
+        
+        # An OSError, like every other write failure the recorders handle
+        error = OSError(self.read_error()) if self.process.returncode else None
+        self.log.close()
+        return error
+
+
+X264_PRESETS = ("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow")
+
+
+def parse_proxy_ladder(text):
+    """Parse "720@75, 360@60/ultrafast" into rungs of height, optional quality and optional x264 preset"""
+    rungs = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        part, _, preset = part.partition("/")
+        height, _, quality = part.partition("@")
+        try:
+            rung = {"height": int(height.strip().removesuffix("p")),
+                    "quality": int(quality) if quality.strip() else None,
+                    "preset": preset.strip() or None}
+        except ValueError:
+            raise ValueError(f"Not a proxy rung: {part!r}, expected a height such as 720 or 720@75")
+        if rung["height"] < 16 or not (rung["quality"] is None or 1 <= rung["quality"] <= 100):
+            raise ValueError(f"Proxy rung out of range: {part!r}")
+        if rung["preset"] and rung["preset"] not in X264_PRESETS:
+            raise ValueError(f"Unknown x264 preset {rung['preset']!r}, use one of {', '.join(X264_PRESETS)}")
+        rungs.append(rung)
+    return rungs
+
+
+def plan_proxy_ladder(output_file, width, height, rungs):
+    """File, size and scaling steps of each usable rung, largest first
+    
+    Rungs not smaller than the one above are left out, and extra halving steps
+    are planned wherever a rung is more than twice as small as the one above.
+    """
+    root, _ = os.path.splitext(output_file)
+    plan = []
+    above = height
+    for rung in sorted(rungs, key=lambda rung: -rung["height"]):
+        rung_height = rung["height"] // 2 * 2
+        if rung_height >= above:
+            continue
+        steps = []
+        step_height = above
+        while step_height > 2 * rung_height:
+            step_height //= 2
+            steps.append((max(1, width * step_height // height), step_height))
+        plan.append({**rung, "file": f"{root}_{rung_height}p.mp4", "height": rung_height, "steps": steps,
+                     "width": max(2, int(round(width * rung_height / height / 2)) * 2)})
+        above = rung_height
+    return plan
+
+
+class ProxyRung(threading.Thread):
+    """Encodes one proxy resolution on its own thread from a bounded pool of frame buffers
+    
+    The producer fills a free buffer and submits it; when the encoder is behind
+    and every buffer is in use, the frame is dropped for this rung alone. The
+    encode is x264 through FFmpeg when it is on the PATH, OpenCV's MPEG-4
+    otherwise.
+    """
+    
+    BUFFERS = 4
+    
+    def __init__(self, output_file, width, height, fps, quality, preset="veryfast"):
+        super().__init__(name=f"eem-proxy-{height}p", daemon=True)
+        self.output_file = output_file
+        self.width, self.height = width, height
+        self.buffers = np.empty((self.BUFFERS, height, width, 3), dtype=np.uint8)
+        self.scratch = np.empty((height, width, 3), dtype=np.uint8)  # For rungs below, when no buffer is free
+        self.free = queue.Queue()
+        for index in range(self.BUFFERS):
+            self.free.put(index)
+        self.filled = queue.Queue()
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+        
+        ffmpeg = find_ffmpeg_tool()
+        self.log = None
+        if ffmpeg:
+            self.log = tempfile.TemporaryFile()
+            self.process = subprocess.Popen(
+                [ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+                 "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "pipe:0",
+                 "-c:v", "libx264", "-preset", preset, "-crf", str(int(round(51 - 0.35 * quality))),
+                 "-pix_fmt", "yuv420p", "-g", str(max(1, int(round(fps * 2)))),
+                 "-movflags", "+frag_keyframe+empty_moov", output_file],
+                stdin=subprocess.PIPE, stderr=self.log)
+            self.out = None
+        else:
+            self.process = None
+            self.out = cv2.VideoWriter(output_file, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    
+    def acquire(self):
+        """Index of a free buffer, or None when this rung drops the frame"""
+        if self.error is not None:
+            self.dropped += 1
+            return None
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+    
+    def submit(self, index):
+        self.filled.put(index)
+    
+    def run(self):
+        # Proxies run with the process's own scheduling, the encode settings are for the master
+        while True:
+            index = self.filled.get()
+            if index is None:
+                break
+            if self.error is None:
+                try:
+                    if self.process:
+                        self.process.stdin.write(self.buffers[index].data)
+                    else:
+                        self.out.write(self.buffers[index])
+                    self.written += 1
+                except OSError as e:
+                    # The master recording carries on without this proxy
+                    self.error = str(e)
+            self.free.put(index)
+    
+    def release(self):
+        """Finish the file; an encoder failure is left in the stats"""
+        self.filled.put(None)
+        self.join()
+        if self.process:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.wait()
+            if self.process.returncode and self.error is None:
+                self.log.seek(0)
+                lines = self.log.read().decode(errors="replace").strip().splitlines()
+                self.error = lines[-1] if lines else f"exit code {self.process.returncode}"
+            self.log.close()
+        else:
+            self.out.release()
+    
+    def stats(self):
+        return {"file": self.output_file, "height": self.height, "written": self.written,
+                "dropped": self.dropped, "error": self.error}
+
+
+class ProxyLadder:
+    """Lower resolution copies of a recording, encoded alongside the master from the same frames
+    
+    Each rung is scaled from the rung above it rather than from the master,
+    with extra halving steps where a rung is more than twice as small as the
+    one above, so every resize is a cheap linear filter over at most a 2x
+    reduction. Scaling happens in write(), on the caller's thread, straight
+    into the rung's buffer; encoding happens on each rung's own thread.
+    """
+    
+    def __init__(self, output_file, width, height, fps, rungs, quality=85, preset="veryfast"):
+        plan = plan_proxy_ladder(output_file, width, height, rungs)
+        self.rungs = [ProxyRung(rung["file"], rung["width"], rung["height"], fps,
+                                rung["quality"] or quality, rung["preset"] or preset) for rung in plan]
+        # Intermediate buffers between each rung and the one above it
+        self.steps = [[np.empty((step_height, step_width, 3), dtype=np.uint8)
+                       for step_width, step_height in rung["steps"]] for rung in plan]
+        for rung in self.rungs:
+            rung.start()
+    
+    def __bool__(self):
+        return bool(self.rungs)
+    
+    @property
+    def files(self):
+        return [rung.output_file for rung in self.rungs]
+    
+    def write(self, frame):
+        source = frame
+        for position, (rung, steps) in enumerate(zip(self.rungs, self.steps)):
+            index = rung.acquire()
+            if index is None and position == len(self.rungs) - 1:
+                break  # Nothing below needs this rung's frame
+            for step in steps:
+                cv2.resize(source, (step.shape[1], step.shape[0]), dst=step, interpolation=cv2.INTER_LINEAR)
+                source = step
+            target = rung.buffers[index] if index is not None else rung.scratch
+            cv2.resize(source, (rung.width, rung.height), dst=target, interpolation=cv2.INTER_LINEAR)
+            if index is not None:
+                rung.submit(index)
+            source = target
+    
+    def release(self):
+        """Finish every rung, failures are reported by stats()"""
+        for rung in self.rungs:
+            rung.release()
+    
+    def stats(self):
+        return [rung.stats() for rung in self.rungs]
+
+
+def run_ffmpeg_with_progress(args, duration, progress):
+    """Run ffmpeg while reporting percent complete from its progress output"""
+    tool = find_ffmpeg_tool()
+    if not tool:
+        raise RuntimeError("ffmpeg was not found. Install FFmpeg to use this feature.")
+    
+    process = subprocess.Popen([tool, "-hide_banner", "-loglevel", "error", "-nostats",
+                                "-progress", "pipe:1"] + args,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    for line in process.stdout:
+        key, _, value = line.decode(errors="replace").strip().partition("=")
+        if key == "out_time_us" and value.isdigit() and duration > 0:
+            progress(min(99, int(int(value) / 1e6 * 100 / duration)))
+    
+    message = process.stderr.read().decode(errors="replace").strip().splitlines()
+    if process.wait() != 0:
+        raise RuntimeError(message[-1] if message else f"ffmpeg failed with code {process.returncode}")
+
+
+def finalize_spool(spool_file, output_file, quality, progress):
+    """Encode a fast-capture spool into the final output and delete the spool"""
+    reader = FrameSpoolReader(spool_file)
+    total_frames = max(1, reader.count_frames())
+    part_file = get_partial_path(output_file)
+    ffmpeg = find_ffmpeg_tool()
+    
+    if ffmpeg:
+        # The spool already holds JPEG frames, so they are piped to FFmpeg undecoded
+        process = subprocess.Popen(
+            [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-f", "image2pipe", "-c:v", "mjpeg",
+             "-framerate", f"{reader.fps:g}", "-i", "-"] + get_encoder_args(output_file, quality) + [part_file],
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            for index, (_timestamp, payload) in enumerate(reader.iter_records()):
+                process.stdin.write(payload)
+                # FFmpeg is still encoding what it was sent, done is reported once it exits
+                progress(min(99, (index + 1) * 100 // total_frames))
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        
+        message = process.stderr.read().decode(errors="replace").strip().splitlines()
+        if process.wait() != 0:
+            raise RuntimeError(message[-1] if message else "ffmpeg could not encode the spool")
+    else:
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        writer = cv2.VideoWriter(part_file, fourcc, reader.fps, (reader.width, reader.height))
+        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, quality)
+        for index, (_timestamp, frame) in enumerate(reader):
+            writer.write(frame)
+            progress(min(99, (index + 1) * 100 // total_frames))
+        writer.release()
+    
+    os.replace(part_file, output_file)
+    os.remove(spool_file)
+    
+    # The index points into the spool until it is mapped onto the new container,
+    # offsets into a deleted spool would send every seek to the wrong place
+    index_file = output_file + INDEX_EXTENSION
+    if os.path.exists(index_file):
+        try:
+            if not find_ffmpeg_tool("ffprobe"):
+                raise RuntimeError("ffprobe was not found")
+            update_index_from_container(index_file, output_file)
+        except (RuntimeError, ValueError):
+            os.remove(index_file)
+    return output_file
+
+
+def transcode_recording(source_file, output_file, quality, progress, height=None, preset=None):
+    """Re-encode a recording for its container, optionally scaled to a height"""
+    part_file = get_partial_path(output_file)
+    
+    if find_ffmpeg_tool():
+        duration = probe_recording(source_file)["duration"]
+        args = ["-y", "-i", source_file, "-map", "0:v:0", "-map", "0:a?"]
+        if height:
+            args += ["-vf", f"scale=-2:{height}"]
+        encoder_args = get_encoder_args(output_file, quality)
+        if preset and "-preset" in encoder_args:
+            encoder_args[encoder_args.index("-preset") + 1] = preset
+        run_ffmpeg_with_progress(args + encoder_args + ["-c:a", "aac", part_file], duration, progress)
+    else:
+        cap = cv2.VideoCapture(source_file)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        total_frames = max(1, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        source_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if height:
+            width, size_changed = int(width * height / source_height) // 2 * 2, True
+        else:
+            height, size_changed = source_height, False
+        
+        writer = cv2.VideoWriter(part_file, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, quality)
+        index = 0
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if size_changed:
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            writer.write(frame)
+            index += 1
+            progress(min(99, index * 100 // total_frames))
+        cap.release()
+        writer.release()
+    
+    os.replace(part_file, output_file)
+    return output_file
+
+
+def run_job(kind, params, progress):
+    """Execute one background job and return a description of its result"""
+    if kind == "finalize_spool":
+        return finalize_spool(params["spool_file"], params["output_file"], params.get("quality", 85), progress)
+    if kind == "transcode":
+        return transcode_recording(params["source_file"], params["output_file"], params.get("quality", 85), progress)
+    if kind == "proxy":
+        return transcode_recording(params["source_file"], params["output_file"], params.get("quality", 60),
+                                   progress, height=params.get("height", 540), preset="veryfast")
+    if kind == "trim":
+        trim_recording(params["source_file"], params["output_file"], params["start"], params.get("end"))
+        return params["output_file"]
+    if kind == "concat":
+        return concat_recordings(params["source_files"], params["output_file"])
+    if kind == "reindex":
+        return update_index_from_container(params["index_file"], params["video_file"])
+    if kind == "animation":
+        return export_animation(params["source_file"], params["output_file"], progress,
+                                params.get("start", 0.0), params.get("end"), params.get("fps", 10),
+                                params.get("width", 480), params.get("crop"))
+    raise ValueError(f"Unknown job type: {kind}")
+
+
+def job_process_main(job, messages):
+    """Worker process entry point for a single background job"""
+    try:
+        # Background work should never compete with a live recording
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    
+    last_percent = [-1]
+    
+    def progress(percent):
+        if percent != last_percent[0]:
+            last_percent[0] = percent
+            messages.put(("progress", job["id"], percent))
+    
+    try:
+        result = run_job(job["kind"], job["params"], progress)
+        messages.put(("done", job["id"], str(result)))
+    except Exception as e:
+        messages.put(("failed", job["id"], str(e)))
+
+
+class JobQueue(QObject):
+    """Persistent priority queue of post-processing jobs run in a bounded process pool
+    
+    Jobs are saved to ~/.eem_studio/jobs.json on every state change. Jobs that
+    were running when the app exited are queued again on the next start, and
+    running workers are suspended, together with the ffmpeg they started,
+    while a recording is in progress.
+    """
+    job_updated = Signal(dict)   # Progress or status change
+    job_finished = Signal(dict)  # Done, failed or cancelled
+    queue_changed = Signal()     # Jobs added, removed or reordered
+    
+    DEFAULT_PRIORITIES = {"finalize_spool": 20, "trim": 10, "concat": 10, "transcode": 0, "proxy": -10, "reindex": -20}
+    HISTORY_LIMIT = 50
+    MAX_ATTEMPTS = 3  # Launches a running job may be interrupted on before it is marked failed
+    
+    def __init__(self, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.jobs_file = get_app_data_path("jobs.json")
+        self.max_workers = max_workers or max(1, min(2, (os.cpu_count() or 2) // 2))
+        self.context = multiprocessing.get_context("spawn")
+        self.messages = self.context.Queue()
+        self.processes = {}
+        self.paused = False
+        self.jobs = self.load_jobs()
+        
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        self.poll_timer.start(250)
+    
+    def load_jobs(self):
+        """Load saved jobs, re-queueing anything that was interrupted"""
+        jobs = []
+        try:
+            if os.path.exists(self.jobs_file):
+                with open(self.jobs_file, 'r') as f:
+                    jobs = json.load(f)
+        except Exception:
+            jobs = []
+        
+        for job in jobs:
+            if job["status"] == "running":
+                # A job that keeps taking the app down with it is given up on rather than retried forever
+                job["attempts"] = job.get("attempts", 0) + 1
+                if job["attempts"] >= self.MAX_ATTEMPTS:
+                    job["status"] = "failed"
+                    job["error"] = f"Interrupted {job['attempts']} times"
+                    job["finished"] = time.time()
+                    continue
+            if job["status"] in ("running", "held"):
+                job["status"] = "queued"
+                job["progress"] = 0
+        return jobs
+    
+    def save_jobs(self):
+        """Write the job list atomically"""
+        try:
+            temp_file = self.jobs_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(self.jobs, f, indent=2)
+            os.replace(temp_file, self.jobs_file)
+        except Exception:
+            pass
+    
+    def make_job(self, kind, params, description, priority=None, held=False):
+        return {
+            "id": datetime.now().strftime("%Y%m%d%H%M%S%f"),
+            "kind": kind,
+            "params": params,
+            "description": description,
+            "priority": self.DEFAULT_PRIORITIES.get(kind, 0) if priority is None else priority,
+            "status": "held" if held else "queued",
+            "progress": 0,
+            "created": time.time(),
+            "result": "",
+            "error": ""
+        }
+    
+    def add_job(self, kind, params, description, priority=None, held=False):
+        """Queue a job; held jobs wait for release_job() before they can run"""
+        job = self.make_job(kind, params, description, priority, held)
+        self.jobs.append(job)
+        self.save_jobs()
+        self.queue_changed.emit()
+        self.schedule()
+        return job["id"]
+    
+    def get_job(self, job_id):
+        for job in self.jobs:
+            if job["id"] == job_id:
+                return job
+        return None
+    
+    def release_job(self, job_id):
+        job = self.get_job(job_id)
+        if job and job["status"] == "held":
+            job["status"] = "queued"
+            self.save_jobs()
+            self.job_updated.emit(job)
+            self.schedule()
+    
+    def prioritize_job(self, job_id):
+        """Move a job ahead of everything else that is waiting"""
+        job = self.get_job(job_id)
+        if job and job["status"] in ("queued", "held"):
+            job["priority"] = max(j["priority"] for j in self.jobs) + 1
+            self.save_jobs()
+            self.queue_changed.emit()
     
-    def __init__(self, output_file, screen_region=None, camera_device=0, 
-                 camera_position="bottom-right", camera_size=(320, 240), 
-                 fps=30, quality=85, record_audio=True, mouse_cursor=True, 
-                 parent=None):
-        super().__init__(parent)
-        self.output_file = output_file
-        self.screen_region = screen_region
-        self.camera_device = camera_device
-        self.camera_position = camera_position
-        self.camera_size = camera_size
-        self.fps = fps
-        self.quality = quality
-        self.record_audio = record_audio
-        self.mouse_cursor = mouse_cursor
-        self.is_recording = False
-        self.is_paused = False
-        self.frame_count = 0
-        self.start_time = None
+    def cancel_job(self, job_id):
+        job = self.get_job(job_id)
+        if not job or job["status"] not in ("queued", "held", "running"):
+            return
         
-        # Get screen dimensions
-        self.screen_width, self.screen_height = pyautogui.size()
+        process = self.processes.pop(job_id, None)
+        if process:
+            self.stop_worker(process)
         
-        if screen_region:
-            self.x, self.y, self.width, self.height = screen_region
-        else:
-            self.x, self.y = 0, 0
-            self.width, self.height = self.screen_width, self.screen_height
+        output_file = job["params"].get("output_file")
+        if output_file and os.path.exists(get_partial_path(output_file)):
+            os.remove(get_partial_path(output_file))
         
-        # Initialize video writer with better codec
-        self.fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        self.out = cv2.VideoWriter(output_file, self.fourcc, fps, (self.width, self.height))
+        self.finish_job(job, "cancelled")
+        self.schedule()
+    
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job["status"] in ("queued", "held", "running")]
+        self.save_jobs()
+        self.queue_changed.emit()
+    
+    def set_paused(self, paused):
+        """Hold back new jobs and suspend running workers, e.g. while recording"""
+        self.paused = paused
+        for process in self.processes.values():
+            for member in self.worker_tree(process):
+                try:
+                    if paused:
+                        member.suspend()
+                    else:
+                        member.resume()
+                except psutil.Error:
+                    pass
         
-        # Initialize camera if available
-        self.camera_available = False
-        if camera_device is not None:
-            self.cap = cv2.VideoCapture(camera_device)
-            if self.cap.isOpened():
-                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, camera_size[0])
-                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, camera_size[1])
-                self.cap.set(cv2.CAP_PROP_FPS, fps)
-                self.camera_available = True
-            else:
-                self.cap = None
+        if not paused:
+            self.schedule()
+    
+    def worker_tree(self, process):
+        """A worker process followed by everything it started, such as its ffmpeg"""
+        try:
+            worker = psutil.Process(process.pid)
+            return [worker] + worker.children(recursive=True)
+        except psutil.Error:
+            return []
+    
+    def stop_worker(self, process):
+        """Terminate a worker and kill what it started, so nothing keeps writing its output"""
+        children = self.worker_tree(process)[1:]
+        for child in children:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+        try:
+            # A suspended worker would not act on the terminate
+            psutil.Process(process.pid).resume()
+        except psutil.Error:
+            pass
+        process.terminate()
+        process.join(timeout=5)
+        psutil.wait_procs(children, timeout=5)
+    
+    def schedule(self):
+        """Start the highest-priority waiting jobs while worker slots are free"""
+        if self.paused:
+            return
         
-    def run(self):
-        self.is_recording = True
-        self.start_time = time.time()
-        last_time = time.time()
-        fps_counter = 0
-        fps_timer = time.time()
+        waiting = sorted((job for job in self.jobs if job["status"] == "queued"),
+                         key=lambda job: (-job["priority"], job["created"]))
+        for job in waiting[:max(0, self.max_workers - len(self.processes))]:
+            process = self.context.Process(target=job_process_main, args=(job, self.messages),
+                                           name=f"eem-job-{job['kind']}", daemon=True)
+            process.start()
+            self.processes[job["id"]] = process
+            job["status"] = "running"
+            job["progress"] = 0
+            job["started"] = time.time()
+            self.job_updated.emit(job)
         
-        while self.is_recording:
-            if not self.is_paused:
-                current_time = time.time()
-                
-                # Capture screen with cursor if enabled
-                if self.mouse_cursor:
-                    screen_img = pyautogui.screenshot(region=(self.x, self.y, self.width, self.height))
-                else:
-                    # Alternative method without cursor (would need implementation)
-                    screen_img = pyautogui.screenshot(region=(self.x, self.y, self.width, self.height))
-                
-                screen_frame = np.array(screen_img)
-                screen_frame = cv2.cvtColor(screen_frame, cv2.COLOR_RGB2BGR)
-                
-                # Add camera overlay if available
-                if self.camera_available and self.cap:
-                    ret, camera_frame = self.cap.read()
-                    if ret:
-                        # Flip camera horizontally for mirror effect
-                        camera_frame = cv2.flip(camera_frame, 1)
-                        camera_frame = cv2.resize(camera_frame, self.camera_size)
-                        
-                        # Add rounded corners and border to camera
-                        camera_frame = self.add_camera_effects(camera_frame)
-                        
-                        # Determine camera position
-                        x_pos, y_pos = self.get_camera_position()
-                        
-                        # Blend camera frame with screen
-                        self.blend_camera_frame(screen_frame, camera_frame, x_pos, y_pos)
-                
-                # Write frame to output file
-                self.out.write(screen_frame)
-                self.frame_count += 1
-                
-                # Emit frame for preview
-                preview_frame = cv2.cvtColor(screen_frame, cv2.COLOR_BGR2RGB)
-                self.update_frame.emit(preview_frame)
-                
-                # Update progress
-                duration = int(current_time - self.start_time)
-                self.progress_update.emit(duration)
-                
-                # Calculate and emit FPS
-                fps_counter += 1
-                if current_time - fps_timer >= 1.0:
-                    actual_fps = fps_counter / (current_time - fps_timer)
-                    self.fps_update.emit(actual_fps)
-                    fps_counter = 0
-                    fps_timer = current_time
-                
-                # Emit file size (approximate)
-                if os.path.exists(self.output_file):
-                    file_size = os.path.getsize(self.output_file)
-                    self.file_size_update.emit(file_size)
+        if waiting:
+            self.save_jobs()
+    
+    def poll(self):
+        """Collect worker messages and reap finished workers"""
+        while True:
+            try:
+                kind, job_id, value = self.messages.get_nowait()
+            except queue.Empty:
+                break
             
-            # Control frame rate
-            elapsed = time.time() - last_time
-            sleep_time = max(0, 1.0/self.fps - elapsed)
-            time.sleep(sleep_time)
-            last_time = time.time()
+            job = self.get_job(job_id)
+            if not job or job["status"] != "running":
+                continue
+            if kind == "progress":
+                job["progress"] = value
+                self.job_updated.emit(job)
+            elif kind == "done":
+                job["result"] = value
+                job["progress"] = 100
+                self.finish_job(job, "done")
+            elif kind == "failed":
+                job["error"] = value
+                self.finish_job(job, "failed")
         
-        # Clean up
-        if self.camera_available and self.cap:
-            self.cap.release()
-        self.out.release()
-        self.recording_finished.emit()
+        for job_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            
+            process.join()
+            del self.processes[job_id]
+            job = self.get_job(job_id)
+            if job and job["status"] == "running":
+                job["error"] = f"Worker exited unexpectedly (code {process.exitcode})"
+                self.finish_job(job, "failed")
+        
+        self.schedule()
     
-    def add_camera_effects(self, frame):
-        """Add visual effects to camera frame"""
-        # Add a subtle border
-        cv2.rectangle(frame, (0, 0), (frame.shape[1]-1, frame.shape[0]-1), (255, 255, 255), 2)
-        return frame
+    def finish_job(self, job, status):
+        job["status"] = status
+        job["finished"] = time.time()
+        
+        # Keep a bounded history of completed jobs
+        finished = [j for j in self.jobs if j["status"] in ("done", "failed", "cancelled")]
+        for old_job in finished[:-self.HISTORY_LIMIT]:
+            self.jobs.remove(old_job)
+        
+        self.save_jobs()
+        self.job_updated.emit(job)
+        self.job_finished.emit(job)
     
-    def get_camera_position(self):
-        """Calculate camera position based on settings"""
-        margin = 20
-        if self.camera_position == "top-left":
-            return margin, margin
-        elif self.camera_position == "top-right":
-            return self.width - self.camera_size[0] - margin, margin
-        elif self.camera_position == "bottom-left":
-            return margin, self.height - self.camera_size[1] - margin
-        else:  # bottom-right
-            return self.width - self.camera_size[0] - margin, self.height - self.camera_size[1] - margin
+    def active_summary(self):
+        """Return (running, waiting, average progress of running jobs)"""
+        running = [job for job in self.jobs if job["status"] == "running"]
+        waiting = sum(1 for job in self.jobs if job["status"] in ("queued", "held"))
+        progress = sum(job["progress"] for job in running) // len(running) if running else 0
+        return len(running), waiting, progress
     
-    def blend_camera_frame(self, screen_frame, camera_frame, x_pos, y_pos):
-        """Blend camera frame with screen frame"""
-        y_end = min(y_pos + self.camera_size[1], self.height)
-        x_end = min(x_pos + self.camera_size[0], self.width)
+    def shutdown(self):
+        """Stop workers on exit; their jobs run again on the next launch"""
+        self.poll_timer.stop()
+        for job_id, process in list(self.processes.items()):
+            self.stop_worker(process)
+            job = self.get_job(job_id)
+            if job:
+                job["status"] = "queued"
+                job["progress"] = 0
+        self.processes.clear()
+        self.save_jobs()
+
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+
+class RecordingLibrary:
+    """SQLite catalog of recordings, refreshed incrementally from size/mtime fingerprints"""
+    
+    PAGE_SIZE = 48
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS recordings (
+            path TEXT PRIMARY KEY,
+            directory TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            duration REAL DEFAULT 0,
+            width INTEGER DEFAULT 0,
+            height INTEGER DEFAULT 0,
+            fps REAL DEFAULT 0,
+            codec TEXT DEFAULT '',
+            settings TEXT DEFAULT '{}',
+            tags TEXT DEFAULT '',
+            indexed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS recordings_mtime ON recordings (mtime_ns DESC);
+        CREATE INDEX IF NOT EXISTS recordings_directory ON recordings (directory);
+        CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            file TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS thumbnails_last_used ON thumbnails (last_used);
+        CREATE TABLE IF NOT EXISTS sessions (
+            log_file TEXT PRIMARY KEY,
+            output_file TEXT NOT NULL,
+            started REAL NOT NULL,
+            config TEXT DEFAULT '{}',
+            hardware TEXT DEFAULT '{}',
+            summary TEXT DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started DESC);
+    """
+    
+    def __init__(self, db_file=None):
+        self.db_file = db_file or get_app_data_path("library.db")
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        with self.lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(self.SCHEMA)
+    
+    def folders(self):
+        with self.lock:
+            return [row["path"] for row in self.db.execute("SELECT path FROM folders ORDER BY path")]
+    
+    def add_folder(self, folder):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR IGNORE INTO folders (path) VALUES (?)", (os.path.abspath(folder),))
+    
+    def scan(self, folders=None, progress=None):
+        """Index new or changed recordings and forget deleted ones, returns count probed"""
+        probed = 0
+        for folder in folders or self.folders():
+            prefix = os.path.join(folder, "")
+            with self.lock:
+                known = {row["path"]: (row["size"], row["mtime_ns"]) for row in self.db.execute(
+                    "SELECT path, size, mtime_ns FROM recordings WHERE directory = ? OR substr(directory, 1, ?) = ?",
+                    (folder, len(prefix), prefix))}
+            
+            seen = set()
+            for directory, _dirs, files in os.walk(folder):
+                for name in files:
+                    if not name.lower().endswith(VIDEO_EXTENSIONS) or ".part." in name:
+                        continue
+                    
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    seen.add(path)
+                    
+                    # Unchanged fingerprint, no need to open the file
+                    if known.get(path) == (stat.st_size, stat.st_mtime_ns):
+                        continue
+                    
+                    self.index_file(path, stat)
+                    probed += 1
+                    if progress:
+                        progress(path)
+            
+            removed = [(path,) for path in known if path not in seen]
+            if removed:
+                with self.lock, self.db:
+                    self.db.executemany("DELETE FROM recordings WHERE path = ?", removed)
+        return probed
+    
+    def index_file(self, path, stat=None, settings=None):
+        """Probe one recording and insert or refresh its catalog entry"""
+        stat = stat or os.stat(path)
+        try:
+            info = probe_recording(path)
+        except Exception:
+            info = {"duration": 0.0, "width": 0, "height": 0, "fps": 0.0, "codec": ""}
         
-        if y_pos >= 0 and x_pos >= 0:
-            screen_frame[y_pos:y_end, x_pos:x_end] = camera_frame[:y_end-y_pos, :x_end-x_pos]
+        with self.lock, self.db:
+            self.db.execute("""
+                INSERT INTO recordings (path, directory, name, size, mtime_ns, duration, width, height,
+                                        fps, codec, settings, indexed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    size = excluded.size, mtime_ns = excluded.mtime_ns, duration = excluded.duration,
+                    width = excluded.width, height = excluded.height, fps = excluded.fps,
+                    codec = excluded.codec, indexed = excluded.indexed,
+                    settings = CASE WHEN excluded.settings != '{}' THEN excluded.settings ELSE settings END
+            """, (path, os.path.dirname(path), os.path.basename(path), stat.st_size, stat.st_mtime_ns,
+                  info["duration"], info["width"], info["height"], info["fps"], info["codec"],
+                  json.dumps(settings or {}), time.time()))
     
-    def pause_recording(self):
-        self.is_paused = True
+    def catalog(self, entries):
+        """Register (path, settings) pairs, or just index those without settings; returns how many made it"""
+        cataloged = 0
+        for path, settings in entries:
+            try:
+                if settings:
+                    self.register_recording(path, settings)
+                else:
+                    self.index_file(path)
+                cataloged += 1
+            except Exception:
+                pass  # The catalog is a convenience, a file it cannot probe is left out
+        return cataloged
     
-    def resume_recording(self):
-        self.is_paused = False
+    def register_recording(self, path, settings):
+        """Catalog a fresh recording together with the settings it was made with"""
+        self.add_folder(os.path.dirname(path))
+        self.index_file(path, settings=settings)
     
-    def stop_recording(self):
-        self.is_recording = False
+    def get(self, path):
+        with self.lock:
+            row = self.db.execute("SELECT * FROM recordings WHERE path = ?", (path,)).fetchone()
+        return dict(row) if row else None
+    
+    def set_tags(self, path, tags):
+        with self.lock, self.db:
+            self.db.execute("UPDATE recordings SET tags = ? WHERE path = ?",
+                            (", ".join(tag.strip() for tag in tags if tag.strip()), path))
+    
+    def search_clause(self, search):
+        if not search:
+            return "", ()
+        pattern = f"%{search}%"
+        return " WHERE name LIKE ? OR tags LIKE ?", (pattern, pattern)
+    
+    def count(self, search=""):
+        where, params = self.search_clause(search)
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM recordings" + where, params).fetchone()[0]
+    
+    def page(self, offset, limit, search=""):
+        """Return one page of recordings, newest first"""
+        where, params = self.search_clause(search)
+        with self.lock:
+            rows = self.db.execute("SELECT * FROM recordings" + where +
+                                   " ORDER BY mtime_ns DESC LIMIT ? OFFSET ?", params + (limit, offset))
+            return [dict(row) for row in rows]
+    
+    def register_session(self, log_file, header, summary):
+        """Add a finished session's performance summary to the history"""
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO sessions (log_file, output_file, started, config, hardware, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (log_file, header.get("output_file", ""), header.get("started", time.time()),
+                 json.dumps(header.get("config", {})), json.dumps(header.get("hardware", {})), json.dumps(summary)))
+    
+    def session_count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def session_page(self, offset, limit):
+        """Return one page of recorded sessions, newest first"""
+        with self.lock:
+            rows = self.db.execute("SELECT * FROM sessions ORDER BY started DESC LIMIT ? OFFSET ?", (limit, offset))
+            return [{**dict(row), "config": json.loads(row["config"]), "hardware": json.loads(row["hardware"]),
+                     "summary": json.loads(row["summary"])} for row in rows]
+    
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class ThumbnailCache:
+    """Size-bounded on-disk thumbnail cache with least-recently-used eviction
+    
+    Files live in a ResultCache directory so keys follow the source mtime, and
+    their sizes and access times are tracked in the library database.
+    """
+    
+    def __init__(self, library, max_bytes=256 * 1024 * 1024, width=240):
+        self.library = library
+        self.max_bytes = max_bytes
+        self.width = width
+        self.cache = ResultCache("thumbnails")
+    
+    def get(self, path, duration=0.0):
+        """Return a thumbnail file for a recording, generating it on a miss"""
+        timestamp = min(duration * 0.1, 5.0)
+        key = self.cache.key(path, "thumbnail", time=round(timestamp, 3), width=self.width)
+        thumb_file = self.cache.get(key, ".jpg")
+        
+        if thumb_file is None:
+            thumb_file = extract_thumbnail(path, timestamp, self.width, self.cache)
+            with self.library.lock, self.library.db:
+                self.library.db.execute(
+                    "INSERT OR REPLACE INTO thumbnails (file, size, last_used) VALUES (?, ?, ?)",
+                    (thumb_file, os.path.getsize(thumb_file), time.time()))
+            self.evict()
+        else:
+            with self.library.lock, self.library.db:
+                self.library.db.execute("UPDATE thumbnails SET last_used = ? WHERE file = ?",
+                                        (time.time(), thumb_file))
+        return thumb_file
+    
+    def evict(self):
+        """Delete least recently used thumbnails until the cache fits its budget"""
+        with self.library.lock, self.library.db:
+            total = self.library.db.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            
+            evicted = []
+            for row in self.library.db.execute("SELECT file, size FROM thumbnails ORDER BY last_used"):
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(row["file"])
+                except OSError:
+                    pass
+                evicted.append((row["file"],))
+                total -= row["size"]
+            self.library.db.executemany("DELETE FROM thumbnails WHERE file = ?", evicted)
+
+
+class ThumbnailLoader(QThread):
+    """Generate thumbnails for the visible library page off the GUI thread"""
+    thumbnail_ready = Signal(str, str)  # Recording path, thumbnail file
+    
+    def __init__(self, thumbnail_cache, recordings, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.recordings = recordings
+        self.is_cancelled = False
+    
+    def run(self):
+        for recording in self.recordings:
+            if self.is_cancelled:
+                break
+            try:
+                thumb_file = self.thumbnail_cache.get(recording["path"], recording["duration"])
+                self.thumbnail_ready.emit(recording["path"], thumb_file)
+            except Exception:
+                pass
+    
+    def cancel(self):
+        self.is_cancelled = True
 
 
 class ModernPreviewWidget(QWidget):
@@ -231,6 +5444,160 @@ class ModernPreviewWidget(QWidget):
             painter.drawText(self.rect(), Qt.AlignCenter, "EEM Studio Pro\nPreview Area")
 
 
+class PreviewViewer(QWidget):
+    """Reference viewer for previews published by running recordings
+    
+    Every ring is mapped read-only and polled at the display rate, so watching
+    never slows the recorder down. New recordings show up on the next rescan.
+    """
+    
+    def __init__(self, name=None, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.previews = {}  # ring name -> ring, label, frame buffer, last sequence, advertised info
+        self.setWindowTitle("EEM Studio Pro - Live Previews")
+        self.setStyleSheet("background-color: #1E1E1E; color: white;")
+        self.resize(960, 540)
+        
+        self.grid = QGridLayout(self)
+        self.empty_label = QLabel("No recording is publishing a preview")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setStyleSheet("color: rgba(255, 255, 255, 120); font-size: 18px;")
+        self.grid.addWidget(self.empty_label, 0, 0)
+        
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.timeout.connect(self.rescan)
+        self.rescan_timer.start(2000)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.update_frames)
+        self.frame_timer.start(33)
+        self.rescan()
+    
+    def rescan(self):
+        """Attach to new previews and drop the ones whose recording ended"""
+        advertised = {info["name"]: info for info in list_previews()
+                      if self.name in (None, info.get("name"))}
+        changed = False
+        for name in list(self.previews):
+            if name not in advertised:
+                preview = self.previews.pop(name)
+                preview["ring"].close()
+                preview["label"].deleteLater()
+                changed = True
+        
+        for name, info in advertised.items():
+            if name in self.previews:
+                continue
+            try:
+                ring = SharedFrameRing.attach(name, untrack=True, readonly=True)
+            except (OSError, ValueError):
+                continue
+            label = QLabel()
+            label.setAlignment(Qt.AlignCenter)
+            label.setMinimumSize(320, 180)
+            label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+            self.previews[name] = {
+                "ring": ring, "label": label, "info": info, "last_seq": 0,
+                "frame": np.empty((ring.height, ring.width, ring.channels), dtype=np.uint8)
+            }
+            changed = True
+        
+        if changed:
+            columns = max(1, int(np.ceil(np.sqrt(len(self.previews)))))
+            for i, preview in enumerate(self.previews.values()):
+                self.grid.addWidget(preview["label"], i // columns, i % columns)
+            self.empty_label.setVisible(not self.previews)
+    
+    def update_frames(self):
+        for preview in self.previews.values():
+            ring = preview["ring"]
+            slot, seq = ring.latest()
+            if slot < 0 or seq == preview["last_seq"]:
+                continue
+            result = ring.read(slot, preview["frame"])
+            if result is None:
+                continue
+            preview["last_seq"] = seq
+            
+            rgb = cv2.cvtColor(preview["frame"], cv2.COLOR_BGR2RGB)
+            q_img = QImage(rgb.data, ring.width, ring.height, ring.width * 3, QImage.Format_RGB888)
+            label = preview["label"]
+            label.setPixmap(QPixmap.fromImage(q_img).scaled(label.size(), Qt.KeepAspectRatio,
+                                                              Qt.SmoothTransformation))
+            output_file = os.path.basename(preview["info"].get("output_file", "")) or preview["info"]["name"]
+            label.setToolTip(f"{output_file} - {max(0.0, time.time() - result[2]):.1f}s behind")
+    
+    def closeEvent(self, event):
+        for preview in self.previews.values():
+            preview["ring"].close()
+        self.previews = {}
+        event.accept()
+
+
+def run_preview_viewer(argv):
+    """Command line entry point: python app.py --view-preview [NAME] [--list]"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="app.py --view-preview")
+    parser.add_argument("--view-preview", nargs="?", const=None, metavar="NAME",
+                        help="preview to show, all running recordings if omitted")
+    parser.add_argument("--list", action="store_true", help="print the published previews and exit")
+    args = parser.parse_args(argv)
+    
+    if args.list:
+        for info in list_previews():
+            print(f"{info['name']}\t{info['width']}x{info['height']}\t{info.get('output_file', '')}")
+        return 0
+    
+    qt_app = QApplication.instance() or QApplication(sys.argv[:1])
+    viewer = PreviewViewer(args.view_preview)
+    viewer.show()
+    return qt_app.exec()
+
+
+class SparklineWidget(QWidget):
+    """Compact line chart of a recent time series with its current value"""
+    
+    def __init__(self, title, color="#3498DB", unit="", maximum=None, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.color = QColor(color)
+        self.unit = unit
+        self.maximum = maximum
+        self.values = np.zeros(0)
+        self.setMinimumHeight(44)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+    
+    def set_values(self, values, title=None):
+        self.values = values
+        if title is not None:
+            self.title = title
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor(44, 62, 80))
+        
+        current = self.values[-1] if len(self.values) else 0.0
+        painter.setPen(QColor(255, 255, 255, 200))
+        painter.setFont(QFont("Segoe UI", 9))
+        painter.drawText(self.rect().adjusted(6, 2, -6, -2), Qt.AlignLeft | Qt.AlignTop, self.title)
+        painter.drawText(self.rect().adjusted(6, 2, -6, -2), Qt.AlignRight | Qt.AlignTop, f"{current:.1f}{self.unit}")
+        
+        if len(self.values) < 2:
+            return
+        
+        # Chart area below the labels
+        left, top = 4, 18
+        width, height = self.width() - 8, self.height() - top - 4
+        top_value = self.maximum or max(1e-6, float(self.values.max()) * 1.1)
+        xs = left + np.arange(len(self.values)) * width / (len(self.values) - 1)
+        ys = top + height - np.clip(self.values / top_value, 0, 1) * height
+        
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+
+
 class ModernButton(QPushButton):
     def __init__(self, text, color="#3498DB", parent=None):
         super().__init__(text, parent)
@@ -292,22 +5659,58 @@ class EEMStudioPro(QMainWindow):
         self.recorder = None
         self.is_recording = False
         self.is_paused = False
+        self.armed = False
         self.output_file = ""
         self.selected_region = None
+        self.selected_window = None
         self.recording_duration = 0
+        self.spool_job_ids = []  # Held finalize jobs, one for each spool the recording writes
+        self.recording_error = None
+        self.disk_watchdog = None
+        
+        # The recorder's status is polled at a fixed rate, whatever its frame rate
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.poll_recorder_status)
+        self.shown_status = {}
+        self.fps_color = None
         
         # Load settings
         self.settings = self.load_settings()
+        self.stream_preset = self.settings.get("stream_preset", "veryfast")
+        self.calibration_fingerprint = self.settings.get("calibration_fingerprint")
+        self.calibration_task = None
+        self.burst = None
+        
+        # Recording catalog and its thumbnail cache
+        self.library = RecordingLibrary()
+        self.thumbnail_cache = ThumbnailCache(self.library)
+        self.library_page = 0
+        self.library_loader = None
+        self.library_scan_task = None
+        self.catalog_task = None
+        self.catalog_pending = []  # (path, settings) waiting for the catalog task
+        self.current_recording_settings = {}
+        
+        # Background post-processing, resumes jobs from earlier sessions
+        self.job_queue = JobQueue(parent=self)
+        self.job_queue.job_updated.connect(self.on_job_updated)
+        self.job_queue.job_finished.connect(self.on_job_finished)
+        self.job_queue.queue_changed.connect(self.refresh_jobs_table)
         
         # Setup UI
         self.init_ui()
         self.setup_system_tray()
         self.apply_theme()
         
-        # Setup status update timer
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_system_status)
-        self.status_timer.start(1000)  # Update every second
+        # Resource sampling runs on its own thread, the GUI only draws the results
+        self.cpu_count = psutil.cpu_count()
+        self.system_sampler = SystemSampler(parent=self)
+        self.system_sampler.process_names = self.get_worker_names
+        self.system_sampler.samples_ready.connect(self.update_system_status)
+        self.system_sampler.start()
+        
+        # Benchmark the machine on first run and whenever the hardware or screen changes
+        self.check_calibration()
         
     def init_ui(self):
         # Central widget with modern styling
@@ -421,9 +5824,20 @@ class EEMStudioPro(QMainWindow):
         self.tab_widget.addTab(settings_tab, "⚙️ Settings")
         
         # Analytics Tab
-        analytics_tab = QWidget()
-        self.setup_analytics_tab(analytics_tab)
-        self.tab_widget.addTab(analytics_tab, "📊 Analytics")
+        self.analytics_tab = QWidget()
+        self.setup_analytics_tab(self.analytics_tab)
+        self.tab_widget.addTab(self.analytics_tab, "📊 Analytics")
+        
+        # Tools Tab
+        tools_tab = QWidget()
+        self.setup_tools_tab(tools_tab)
+        self.tools_tab_index = self.tab_widget.addTab(tools_tab, "🛠️ Tools")
+        
+        # Library Tab
+        library_tab = QWidget()
+        self.setup_library_tab(library_tab)
+        self.library_tab_index = self.tab_widget.addTab(library_tab, "📚 Library")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         parent_layout.addWidget(self.tab_widget)
     
@@ -470,10 +5884,15 @@ class EEMStudioPro(QMainWindow):
         self.region_line.setReadOnly(True)
         region_btn = ModernButton("Select", "#9B59B6")
         region_btn.clicked.connect(self.select_region)
+        window_btn = ModernButton("Window", "#9B59B6")
+        window_btn.clicked.connect(self.select_window)
+        region_buttons = QHBoxLayout()
+        region_buttons.addWidget(region_btn)
+        region_buttons.addWidget(window_btn)
         
         controls_layout.addWidget(region_label, 1, 0)
         controls_layout.addWidget(self.region_line, 1, 1)
-        controls_layout.addWidget(region_btn, 1, 2)
+        controls_layout.addLayout(region_buttons, 1, 2)
         
         # Quick settings
         fps_label = QLabel("FPS:")
@@ -481,15 +5900,15 @@ class EEMStudioPro(QMainWindow):
         self.fps_combo = QComboBox()
         self.fps_combo.setStyleSheet(self.get_input_style())
         self.fps_combo.addItems(["24", "30", "60"])
-        self.fps_combo.setCurrentText("30")
+        self.fps_combo.setCurrentText(str(self.settings.get("default_fps", 30)))
         
         quality_label = QLabel("Quality:")
         quality_label.setStyleSheet("font-weight: bold;")
         self.quality_slider = QSlider(Qt.Horizontal)
         self.quality_slider.setRange(50, 100)
-        self.quality_slider.setValue(85)
+        self.quality_slider.setValue(self.settings.get("default_quality", 85))
         self.quality_slider.setStyleSheet(self.get_slider_style())
-        self.quality_value_label = QLabel("85%")
+        self.quality_value_label = QLabel(f"{self.quality_slider.value()}%")
         self.quality_slider.valueChanged.connect(lambda v: self.quality_value_label.setText(f"{v}%"))
         
         controls_layout.addWidget(fps_label, 2, 0)
@@ -500,9 +5919,80 @@ class EEMStudioPro(QMainWindow):
         quality_layout.addWidget(self.quality_value_label)
         controls_layout.addLayout(quality_layout, 3, 1, 1, 2)
         
+        # Timelapse: one capture every few seconds, played back at the FPS above
+        self.timelapse_check = QCheckBox("Timelapse")
+        self.timelapse_check.setChecked(self.settings.get("timelapse", False))
+        self.timelapse_check.setStyleSheet("font-weight: bold;")
+        self.timelapse_interval_spin = QDoubleSpinBox()
+        self.timelapse_interval_spin.setRange(0.5, 3600)
+        self.timelapse_interval_spin.setDecimals(1)
+        self.timelapse_interval_spin.setValue(self.settings.get("timelapse_interval", 5.0))
+        self.timelapse_interval_spin.setPrefix("every ")
+        self.timelapse_interval_spin.setSuffix(" s")
+        self.timelapse_interval_spin.setStyleSheet(self.get_input_style())
+        self.timelapse_idle_combo = QComboBox()
+        self.timelapse_idle_combo.setStyleSheet(self.get_input_style())
+        self.timelapse_idle_combo.addItem("Keep unchanged frames", "keep")
+        self.timelapse_idle_combo.addItem("Skip unchanged frames", "skip")
+        self.timelapse_idle_combo.addItem("Average unchanged frames", "average")
+        idle_index = self.timelapse_idle_combo.findData(self.settings.get("timelapse_idle", "skip"))
+        self.timelapse_idle_combo.setCurrentIndex(max(0, idle_index))
+        
+        controls_layout.addWidget(self.timelapse_check, 4, 0)
+        controls_layout.addWidget(self.timelapse_interval_spin, 4, 1)
+        controls_layout.addWidget(self.timelapse_idle_combo, 4, 2)
+        
+        # Frames from before Start, kept while armed
+        pre_roll_label = QLabel("Pre-roll:")
+        pre_roll_label.setStyleSheet("font-weight: bold;")
+        self.pre_roll_combo = QComboBox()
+        self.pre_roll_combo.setStyleSheet(self.get_input_style())
+        self.pre_roll_combo.addItem("Off (armed recorder idles at 2 fps)", 0.0)
+        self.pre_roll_combo.addItem("0.5 s before Start", 0.5)
+        self.pre_roll_combo.addItem("1 s before Start", 1.0)
+        self.pre_roll_combo.addItem("2 s before Start", 2.0)
+        self.pre_roll_combo.setToolTip("Only while armed: frames are captured at the full rate and kept in memory")
+        pre_roll_index = self.pre_roll_combo.findData(self.settings.get("pre_roll", 0.0))
+        self.pre_roll_combo.setCurrentIndex(max(0, pre_roll_index))
+        controls_layout.addWidget(pre_roll_label, 5, 0)
+        controls_layout.addWidget(self.pre_roll_combo, 5, 1, 1, 2)
+        
         controls_group.setLayout(controls_layout)
         layout.addWidget(controls_group)
         
+        # Burst of full-resolution stills instead of a video
+        burst_group = QGroupBox("Burst Screenshots")
+        burst_group.setStyleSheet(self.get_group_style())
+        burst_layout = QHBoxLayout()
+        
+        self.burst_rate_spin = QSpinBox()
+        self.burst_rate_spin.setRange(1, 60)
+        self.burst_rate_spin.setValue(20)
+        self.burst_rate_spin.setSuffix(" /s")
+        self.burst_rate_spin.setStyleSheet(self.get_input_style())
+        self.burst_duration_spin = QSpinBox()
+        self.burst_duration_spin.setRange(1, 600)
+        self.burst_duration_spin.setValue(10)
+        self.burst_duration_spin.setSuffix(" s")
+        self.burst_duration_spin.setStyleSheet(self.get_input_style())
+        self.burst_format_combo = QComboBox()
+        self.burst_format_combo.setStyleSheet(self.get_input_style())
+        self.burst_format_combo.addItem("PNG", "png")
+        self.burst_format_combo.addItem("JPEG", "jpg")
+        self.burst_format_combo.addItem("WebP", "webp")
+        self.burst_button = ModernButton("📸 Start Burst", "#E74C3C")
+        self.burst_button.clicked.connect(self.toggle_burst)
+        self.burst_status_label = QLabel("")
+        self.burst_status_label.setStyleSheet("color: rgba(255, 255, 255, 180);")
+        
+        burst_layout.addWidget(self.burst_rate_spin)
+        burst_layout.addWidget(self.burst_duration_spin)
+        burst_layout.addWidget(self.burst_format_combo)
+        burst_layout.addWidget(self.burst_button)
+        burst_layout.addWidget(self.burst_status_label, stretch=1)
+        burst_group.setLayout(burst_layout)
+        layout.addWidget(burst_group)
+        
         tab.setLayout(layout)
     
     def setup_settings_tab(self, tab):
@@ -555,9 +6045,70 @@ class EEMStudioPro(QMainWindow):
         size_layout.addWidget(self.height_spin)
         camera_layout.addLayout(size_layout, 2, 1)
         
+        # Camera effect, computed on the camera thread at reduced resolution
+        effect_label = QLabel("Camera Effect:")
+        effect_label.setStyleSheet("font-weight: bold;")
+        self.camera_effect_combo = QComboBox()
+        self.camera_effect_combo.setStyleSheet(self.get_input_style())
+        self.camera_effect_combo.addItem("None", "none")
+        self.camera_effect_combo.addItem("Blur Background", "blur")
+        self.camera_effect_combo.addItem("Green Screen", "green")
+        self.camera_effect_combo.addItem("Blue Screen", "blue")
+        effect_index = self.camera_effect_combo.findData(self.settings.get("camera_effect", "none"))
+        self.camera_effect_combo.setCurrentIndex(max(0, effect_index))
+        camera_layout.addWidget(effect_label, 3, 0)
+        camera_layout.addWidget(self.camera_effect_combo, 3, 1)
+        
+        # Several cameras with their own rectangles, replacing the single camera above
+        scene_label = QLabel("Camera Scene:")
+        scene_label.setStyleSheet("font-weight: bold;")
+        scene_layout = QHBoxLayout()
+        self.camera_scene_line = QLineEdit(self.settings.get("camera_scene", ""))
+        self.camera_scene_line.setPlaceholderText("Optional JSON file laying out several cameras")
+        self.camera_scene_line.setStyleSheet(self.get_input_style())
+        scene_button = ModernButton("Browse", "#E67E22")
+        scene_button.clicked.connect(self.select_camera_scene)
+        scene_layout.addWidget(self.camera_scene_line)
+        scene_layout.addWidget(scene_button)
+        camera_layout.addWidget(scene_label, 4, 0)
+        camera_layout.addLayout(scene_layout, 4, 1)
+        
         camera_group.setLayout(camera_layout)
         layout.addWidget(camera_group)
         
+        # Overlay Settings
+        overlay_group = QGroupBox("Overlays")
+        overlay_group.setStyleSheet(self.get_group_style())
+        overlay_layout = QGridLayout()
+        
+        self.overlay_timestamp_check = QCheckBox("Burn In Timestamp (top left)")
+        self.overlay_timestamp_check.setChecked(self.settings.get("overlay_timestamp", False))
+        self.overlay_timestamp_check.setStyleSheet("font-size: 14px;")
+        
+        label_text_label = QLabel("Session Label:")
+        label_text_label.setStyleSheet("font-weight: bold;")
+        self.overlay_label_line = QLineEdit(self.settings.get("overlay_label", ""))
+        self.overlay_label_line.setPlaceholderText("Shown bottom left, e.g. a session or speaker name")
+        self.overlay_label_line.setStyleSheet(self.get_input_style())
+        
+        logo_label = QLabel("Logo:")
+        logo_label.setStyleSheet("font-weight: bold;")
+        self.overlay_logo_line = QLineEdit(self.settings.get("overlay_logo", ""))
+        self.overlay_logo_line.setPlaceholderText("Image shown top right, PNG transparency is kept")
+        self.overlay_logo_line.setStyleSheet(self.get_input_style())
+        logo_browse_btn = ModernButton("Browse", "#E67E22")
+        logo_browse_btn.clicked.connect(self.select_overlay_logo)
+        
+        overlay_layout.addWidget(self.overlay_timestamp_check, 0, 0, 1, 3)
+        overlay_layout.addWidget(label_text_label, 1, 0)
+        overlay_layout.addWidget(self.overlay_label_line, 1, 1, 1, 2)
+        overlay_layout.addWidget(logo_label, 2, 0)
+        overlay_layout.addWidget(self.overlay_logo_line, 2, 1)
+        overlay_layout.addWidget(logo_browse_btn, 2, 2)
+        
+        overlay_group.setLayout(overlay_layout)
+        layout.addWidget(overlay_group)
+        
         # Advanced Settings
         advanced_group = QGroupBox("Advanced Settings")
         advanced_group.setStyleSheet(self.get_group_style())
@@ -575,9 +6126,140 @@ class EEMStudioPro(QMainWindow):
         self.minimize_tray_check.setChecked(True)
         self.minimize_tray_check.setStyleSheet("font-size: 14px;")
         
+        self.fast_capture_check = QCheckBox("Fast Capture (encode final video after recording)")
+        self.fast_capture_check.setChecked(self.settings.get("fast_capture", False))
+        self.fast_capture_check.setStyleSheet("font-size: 14px;")
+        
+        self.publish_preview_check = QCheckBox("Publish Live Preview for Other Apps")
+        self.publish_preview_check.setChecked(self.settings.get("publish_preview", False))
+        self.publish_preview_check.setStyleSheet("font-size: 14px;")
+        self.publish_preview_check.setToolTip("Watch running recordings with: python app.py --view-preview")
+        
         advanced_layout.addWidget(self.record_audio_check)
         advanced_layout.addWidget(self.mouse_cursor_check)
         advanced_layout.addWidget(self.minimize_tray_check)
+        advanced_layout.addWidget(self.fast_capture_check)
+        advanced_layout.addWidget(self.publish_preview_check)
+        
+        pipeline_layout = QHBoxLayout()
+        pipeline_label = QLabel("Recording Pipeline:")
+        pipeline_label.setStyleSheet("font-weight: bold;")
+        self.pipeline_combo = QComboBox()
+        self.pipeline_combo.setStyleSheet(self.get_input_style())
+        self.pipeline_combo.addItem("Threaded", "threaded")
+        self.pipeline_combo.addItem("Multi-process (isolated encoder)", "process")
+        pipeline_index = self.pipeline_combo.findData(self.settings.get("pipeline_mode", "threaded"))
+        self.pipeline_combo.setCurrentIndex(max(0, pipeline_index))
+        pipeline_layout.addWidget(pipeline_label)
+        pipeline_layout.addWidget(self.pipeline_combo)
+        pipeline_layout.addStretch()
+        advanced_layout.addLayout(pipeline_layout)
+        
+        preview_quality_layout = QHBoxLayout()
+        preview_quality_label = QLabel("Preview Quality:")
+        preview_quality_label.setStyleSheet("font-weight: bold;")
+        self.preview_quality_combo = QComboBox()
+        self.preview_quality_combo.setStyleSheet(self.get_input_style())
+        self.preview_quality_combo.addItem("Balanced (up to 960 px wide)", "balanced")
+        self.preview_quality_combo.addItem("Low (up to 480 px wide)", "low")
+        self.preview_quality_combo.addItem("Full resolution", "full")
+        self.preview_quality_combo.setToolTip("Only the live preview is affected, never the recording")
+        preview_quality_index = self.preview_quality_combo.findData(self.settings.get("preview_quality", "balanced"))
+        self.preview_quality_combo.setCurrentIndex(max(0, preview_quality_index))
+        preview_quality_layout.addWidget(preview_quality_label)
+        preview_quality_layout.addWidget(self.preview_quality_combo)
+        preview_quality_layout.addStretch()
+        advanced_layout.addLayout(preview_quality_layout)
+        
+        fsync_layout = QHBoxLayout()
+        fsync_label = QLabel("Disk Sync:")
+        fsync_label.setStyleSheet("font-weight: bold;")
+        self.fsync_combo = QComboBox()
+        self.fsync_combo.setStyleSheet(self.get_input_style())
+        self.fsync_combo.addItem("Every few seconds", "interval")
+        self.fsync_combo.addItem("After every block (safest)", "always")
+        self.fsync_combo.addItem("Left to the system (fastest)", "none")
+        fsync_index = self.fsync_combo.findData(self.settings.get("fsync_policy", "interval"))
+        self.fsync_combo.setCurrentIndex(max(0, fsync_index))
+        fsync_layout.addWidget(fsync_label)
+        fsync_layout.addWidget(self.fsync_combo)
+        fsync_layout.addStretch()
+        advanced_layout.addLayout(fsync_layout)
+        
+        overflow_layout = QHBoxLayout()
+        overflow_label = QLabel("Overflow Folder:")
+        overflow_label.setStyleSheet("font-weight: bold;")
+        self.overflow_line = QLineEdit(self.settings.get("overflow_directory", ""))
+        self.overflow_line.setPlaceholderText("Another disk to continue on when this one fills up")
+        self.overflow_line.setStyleSheet(self.get_input_style())
+        overflow_button = ModernButton("Browse", "#E67E22")
+        overflow_button.clicked.connect(self.select_overflow_directory)
+        overflow_layout.addWidget(overflow_label)
+        overflow_layout.addWidget(self.overflow_line)
+        overflow_layout.addWidget(overflow_button)
+        advanced_layout.addLayout(overflow_layout)
+        
+        stream_layout = QHBoxLayout()
+        stream_label = QLabel("Stream To:")
+        stream_label.setStyleSheet("font-weight: bold;")
+        self.stream_line = QLineEdit(self.settings.get("stream_targets", ""))
+        self.stream_line.setPlaceholderText("udp://127.0.0.1:5000, tcp://host:port, srt://… or rtmp://… (needs FFmpeg)")
+        self.stream_line.setStyleSheet(self.get_input_style())
+        stream_layout.addWidget(stream_label)
+        stream_layout.addWidget(self.stream_line)
+        advanced_layout.addLayout(stream_layout)
+        
+        proxy_layout = QHBoxLayout()
+        proxy_label = QLabel("Proxy Ladder:")
+        proxy_label.setStyleSheet("font-weight: bold;")
+        self.proxy_ladder_line = QLineEdit(self.settings.get("proxy_ladder", ""))
+        self.proxy_ladder_line.setPlaceholderText(
+            "Extra outputs by height, e.g. 720, 360@60/ultrafast (quality, x264 preset)")
+        self.proxy_ladder_line.setToolTip("Each height is recorded to <name>_<height>p.mp4 next to the master, "
+                                          "scaled from the next larger output")
+        self.proxy_ladder_line.setStyleSheet(self.get_input_style())
+        proxy_layout.addWidget(proxy_label)
+        proxy_layout.addWidget(self.proxy_ladder_line)
+        advanced_layout.addLayout(proxy_layout)
+        
+        calibration_layout = QHBoxLayout()
+        self.calibrate_button = ModernButton("🔬 Calibrate", "#16A085")
+        self.calibrate_button.clicked.connect(lambda: self.check_calibration(force=True))
+        self.calibration_label = QLabel("Not calibrated yet")
+        self.calibration_label.setStyleSheet("color: rgba(255, 255, 255, 180);")
+        self.calibration_label.setWordWrap(True)
+        calibration_layout.addWidget(self.calibrate_button)
+        calibration_layout.addWidget(self.calibration_label, stretch=1)
+        advanced_layout.addLayout(calibration_layout)
+        
+        # CPU placement and priority of each recorder stage
+        cores = cpu_topology()
+        stage_label = QLabel(f"Stage Scheduling ({len(cores)} cores, {sum(len(core) for core in cores)} CPUs):")
+        stage_label.setStyleSheet("font-weight: bold;")
+        self.stage_table = QTableWidget(len(PIPELINE_STAGES), 3)
+        self.stage_table.setHorizontalHeaderLabels(["CPUs", "Nice", "Real-time"])
+        self.stage_table.setVerticalHeaderLabels([stage.capitalize() for stage in PIPELINE_STAGES])
+        self.stage_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stage_table.setStyleSheet(self.get_table_style())
+        self.stage_table.setFixedHeight(190)
+        self.stage_table.setToolTip("CPUs: auto to place by core layout, blank for any CPU, or a list like 2,3 or 4-7.\n"
+                                    "Negative nice levels and real-time scheduling need extra privileges; "
+                                    "refusals are shown in Analytics.")
+        defaults = default_stage_scheduling(cores)
+        saved = self.settings.get("stage_scheduling", {})
+        for row, stage in enumerate(PIPELINE_STAGES):
+            stage_settings = saved.get(stage, {})
+            self.stage_table.setItem(row, 0, QTableWidgetItem(stage_settings.get("cpus", "auto")))
+            nice_spin = QSpinBox()
+            nice_spin.setRange(-20, 19)
+            nice_spin.setValue(stage_settings.get("nice", defaults[stage]["nice"]))
+            self.stage_table.setCellWidget(row, 1, nice_spin)
+            realtime_item = QTableWidgetItem()
+            realtime_item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+            realtime_item.setCheckState(Qt.Checked if stage_settings.get("realtime") else Qt.Unchecked)
+            self.stage_table.setItem(row, 2, realtime_item)
+        advanced_layout.addWidget(stage_label)
+        advanced_layout.addWidget(self.stage_table)
         
         advanced_group.setLayout(advanced_layout)
         layout.addWidget(advanced_group)
@@ -618,6 +6300,12 @@ class EEMStudioPro(QMainWindow):
         self.filesize_label = QLabel("0 MB")
         self.filesize_label.setStyleSheet("font-size: 16px; color: #3498DB;")
         
+        # Disk Time Left
+        disk_left_label = QLabel("Disk Time Left:")
+        disk_left_label.setStyleSheet("font-weight: bold;")
+        self.disk_left_label = QLabel("-")
+        self.disk_left_label.setStyleSheet("font-size: 16px; color: #3498DB;")
+        
         perf_layout.addWidget(cpu_label, 0, 0)
         perf_layout.addWidget(self.cpu_progress, 0, 1)
         perf_layout.addWidget(memory_label, 1, 0)
@@ -626,33 +6314,304 @@ class EEMStudioPro(QMainWindow):
         perf_layout.addWidget(self.current_fps_label, 2, 1)
         perf_layout.addWidget(filesize_label, 3, 0)
         perf_layout.addWidget(self.filesize_label, 3, 1)
+        perf_layout.addWidget(disk_left_label, 4, 0)
+        perf_layout.addWidget(self.disk_left_label, 4, 1)
+        
+        perf_group.setLayout(perf_layout)
+        layout.addWidget(perf_group)
+        
+        # Performance History
+        history_group = QGroupBox("Performance History (5 min)")
+        history_group.setStyleSheet(self.get_group_style())
+        history_layout = QGridLayout()
+        
+        self.sparklines = {
+            "cpu": SparklineWidget("System CPU", "#E74C3C", "%", 100),
+            "memory": SparklineWidget("System Memory", "#9B59B6", "%", 100),
+            "rss": SparklineWidget("EEM Studio Memory", "#3498DB", " MB"),
+            "disk_write": SparklineWidget("System Disk Writes", "#F39C12", " MB/s"),
+            "encode_fps": SparklineWidget("Encoded Frames", "#2ECC71", " fps")
+        }
+        for i, sparkline in enumerate(self.sparklines.values()):
+            history_layout.addWidget(sparkline, i // 2, i % 2)
+        
+        # The busiest threads and worker processes, reassigned on every update
+        self.thread_sparklines = [SparklineWidget("", "#1ABC9C", "%") for _ in range(4)]
+        for i, sparkline in enumerate(self.thread_sparklines):
+            history_layout.addWidget(sparkline, 3 + i // 2, i % 2)
+        
+        history_group.setLayout(history_layout)
+        layout.addWidget(history_group)
+        
+        # Recording Statistics
+        stats_group = QGroupBox("Recording Statistics")
+        stats_group.setStyleSheet(self.get_group_style())
+        stats_layout = QVBoxLayout()
+        
+        self.stats_text = QTextEdit()
+        self.stats_text.setStyleSheet("""
+            QTextEdit {
+                background: #2C3E50;
+                border: 1px solid #34495E;
+                border-radius: 5px;
+                color: white;
+                font-family: 'Consolas', 'Courier New', monospace;
+                font-size: 12px;
+                padding: 10px;
+            }
+        """)
+        self.stats_text.setReadOnly(True)
+        self.update_stats_display()
+        
+        stats_layout.addWidget(self.stats_text)
+        stats_group.setLayout(stats_layout)
+        layout.addWidget(stats_group)
+        
+        # Session History, from the performance log each recording leaves
+        sessions_group = QGroupBox("Session History")
+        sessions_group.setStyleSheet(self.get_group_style())
+        sessions_layout = QVBoxLayout()
+        
+        self.sessions_table = QTableWidget(0, 7)
+        self.sessions_table.setHorizontalHeaderLabels(
+            ["Started", "Recording", "FPS", "Low FPS", "Dropped", "CPU", "Peak Memory"])
+        self.sessions_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.sessions_table.verticalHeader().setVisible(False)
+        self.sessions_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.sessions_table.setSelectionMode(QTableWidget.ExtendedSelection)
+        self.sessions_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.sessions_table.setStyleSheet(self.get_table_style())
+        self.sessions = []
+        
+        sessions_buttons = QHBoxLayout()
+        self.sessions_more_button = ModernButton("⬇️ Load More", "#3498DB")
+        self.sessions_more_button.clicked.connect(self.load_more_sessions)
+        compare_button = ModernButton("⚖️ Compare Selected", "#9B59B6")
+        compare_button.clicked.connect(self.compare_selected_sessions)
+        self.sessions_label = QLabel("")
+        sessions_buttons.addWidget(self.sessions_more_button)
+        sessions_buttons.addWidget(compare_button)
+        sessions_buttons.addWidget(self.sessions_label)
+        sessions_buttons.addStretch()
+        
+        self.session_compare_text = QTextEdit()
+        self.session_compare_text.setStyleSheet(self.stats_text.styleSheet())
+        self.session_compare_text.setReadOnly(True)
+        self.session_compare_text.setLineWrapMode(QTextEdit.NoWrap)
+        self.session_compare_text.setPlaceholderText(
+            "Select two or more sessions and press Compare to see what a change of settings or hardware did")
+        
+        sessions_layout.addWidget(self.sessions_table)
+        sessions_layout.addLayout(sessions_buttons)
+        sessions_layout.addWidget(self.session_compare_text)
+        sessions_group.setLayout(sessions_layout)
+        layout.addWidget(sessions_group)
+        self.reload_session_history()
+        
+        # Background Jobs
+        jobs_group = QGroupBox("Background Jobs")
+        jobs_group.setStyleSheet(self.get_group_style())
+        jobs_layout = QVBoxLayout()
+        
+        self.jobs_table = QTableWidget(0, 4)
+        self.jobs_table.setHorizontalHeaderLabels(["Job", "Status", "Progress", "Priority"])
+        self.jobs_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.jobs_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.jobs_table.setStyleSheet(self.get_table_style())
+        
+        jobs_buttons = QHBoxLayout()
+        prioritize_button = ModernButton("⬆️ Run Next", "#3498DB")
+        prioritize_button.clicked.connect(self.prioritize_selected_job)
+        cancel_job_button = ModernButton("✖️ Cancel", "#E74C3C")
+        cancel_job_button.clicked.connect(self.cancel_selected_job)
+        clear_jobs_button = ModernButton("🧹 Clear Finished", "#95A5A6")
+        clear_jobs_button.clicked.connect(self.job_queue.clear_finished)
+        jobs_buttons.addWidget(prioritize_button)
+        jobs_buttons.addWidget(cancel_job_button)
+        jobs_buttons.addWidget(clear_jobs_button)
+        jobs_buttons.addStretch()
+        
+        jobs_layout.addWidget(self.jobs_table)
+        jobs_layout.addLayout(jobs_buttons)
+        jobs_group.setLayout(jobs_layout)
+        layout.addWidget(jobs_group)
+        self.refresh_jobs_table()
+        
+        tab.setLayout(layout)
+    
+    def setup_tools_tab(self, tab):
+        """Setup post-recording tools"""
+        layout = QVBoxLayout()
+        self.tool_task = None
+        
+        # Source recording
+        source_group = QGroupBox("Source Recording")
+        source_group.setStyleSheet(self.get_group_style())
+        source_layout = QHBoxLayout()
+        
+        self.tool_source_line = QLineEdit()
+        self.tool_source_line.setStyleSheet(self.get_input_style())
+        self.tool_source_line.setPlaceholderText("Select a recording...")
+        source_browse_btn = ModernButton("Browse", "#E67E22")
+        source_browse_btn.clicked.connect(self.select_tool_source)
+        
+        source_layout.addWidget(self.tool_source_line)
+        source_layout.addWidget(source_browse_btn)
+        source_group.setLayout(source_layout)
+        layout.addWidget(source_group)
+        
+        # Lossless editing
+        edit_group = QGroupBox("Lossless Editing (no re-encoding)")
+        edit_group.setStyleSheet(self.get_group_style())
+        edit_layout = QGridLayout()
+        
+        start_label = QLabel("Trim Start:")
+        start_label.setStyleSheet("font-weight: bold;")
+        self.trim_start_spin = QDoubleSpinBox()
+        self.trim_start_spin.setRange(0, 24 * 3600)
+        self.trim_start_spin.setDecimals(1)
+        self.trim_start_spin.setSuffix(" s")
+        self.trim_start_spin.setStyleSheet(self.get_input_style())
+        
+        end_label = QLabel("Trim End:")
+        end_label.setStyleSheet("font-weight: bold;")
+        self.trim_end_spin = QDoubleSpinBox()
+        self.trim_end_spin.setRange(0, 24 * 3600)
+        self.trim_end_spin.setDecimals(1)
+        self.trim_end_spin.setSuffix(" s")
+        self.trim_end_spin.setSpecialValueText("End of recording")
+        self.trim_end_spin.setStyleSheet(self.get_input_style())
+        
+        self.trim_button = ModernButton("✂️ Trim", "#9B59B6")
+        self.trim_button.clicked.connect(self.trim_selected_recording)
+        self.join_button = ModernButton("🔗 Join Recordings...", "#3498DB")
+        self.join_button.clicked.connect(self.join_recordings)
+        
+        edit_layout.addWidget(start_label, 0, 0)
+        edit_layout.addWidget(self.trim_start_spin, 0, 1)
+        edit_layout.addWidget(end_label, 1, 0)
+        edit_layout.addWidget(self.trim_end_spin, 1, 1)
+        edit_layout.addWidget(self.trim_button, 0, 2)
+        edit_layout.addWidget(self.join_button, 1, 2)
+        edit_group.setLayout(edit_layout)
+        layout.addWidget(edit_group)
+        
+        # Conversions run later in the background job queue
+        convert_group = QGroupBox("Conversion")
+        convert_group.setStyleSheet(self.get_group_style())
+        convert_layout = QHBoxLayout()
+        
+        convert_button = ModernButton("🔄 Convert Format...", "#2980B9")
+        convert_button.clicked.connect(self.queue_conversion)
+        proxy_button = ModernButton("📉 Create 540p Proxy", "#8E44AD")
+        proxy_button.clicked.connect(self.queue_proxy)
+        
+        # Animated exports use the trim range above
+        self.animation_fps_spin = QSpinBox()
+        self.animation_fps_spin.setRange(1, 30)
+        self.animation_fps_spin.setValue(10)
+        self.animation_fps_spin.setSuffix(" fps")
+        self.animation_fps_spin.setStyleSheet(self.get_input_style())
+        self.animation_width_spin = QSpinBox()
+        self.animation_width_spin.setRange(120, 1920)
+        self.animation_width_spin.setSingleStep(40)
+        self.animation_width_spin.setValue(480)
+        self.animation_width_spin.setSuffix(" px")
+        self.animation_width_spin.setStyleSheet(self.get_input_style())
+        animation_button = ModernButton("🎞️ Export GIF/WebP...", "#16A085")
+        animation_button.clicked.connect(self.queue_animation_export)
+        
+        convert_layout.addWidget(convert_button)
+        convert_layout.addWidget(proxy_button)
+        convert_layout.addStretch()
+        convert_layout.addWidget(self.animation_fps_spin)
+        convert_layout.addWidget(self.animation_width_spin)
+        convert_layout.addWidget(animation_button)
+        convert_group.setLayout(convert_layout)
+        layout.addWidget(convert_group)
+        
+        # Thumbnails
+        thumbs_group = QGroupBox("Contact Sheet")
+        thumbs_group.setStyleSheet(self.get_group_style())
+        thumbs_layout = QVBoxLayout()
+        
+        self.contact_sheet_button = ModernButton("🖼️ Generate Contact Sheet", "#16A085")
+        self.contact_sheet_button.clicked.connect(self.generate_contact_sheet)
+        self.contact_sheet_label = QLabel()
+        self.contact_sheet_label.setAlignment(Qt.AlignCenter)
+        self.contact_sheet_label.setMinimumHeight(240)
+        
+        thumbs_layout.addWidget(self.contact_sheet_button, alignment=Qt.AlignLeft)
+        thumbs_layout.addWidget(self.contact_sheet_label, stretch=1)
+        thumbs_group.setLayout(thumbs_layout)
+        layout.addWidget(thumbs_group, stretch=1)
+        
+        self.tool_status_label = QLabel("FFmpeg: " + ("available" if find_ffmpeg_tool() else
+                                                      "not found, trimming and joining are unavailable"))
+        self.tool_status_label.setStyleSheet("color: rgba(255, 255, 255, 180);")
+        layout.addWidget(self.tool_status_label)
+        
+        tab.setLayout(layout)
+    
+    def setup_library_tab(self, tab):
+        """Setup the recording library browser"""
+        layout = QVBoxLayout()
         
-        perf_group.setLayout(perf_layout)
-        layout.addWidget(perf_group)
+        toolbar_layout = QHBoxLayout()
+        self.library_search_line = QLineEdit()
+        self.library_search_line.setStyleSheet(self.get_input_style())
+        self.library_search_line.setPlaceholderText("Search by name or tag...")
+        self.library_search_line.returnPressed.connect(lambda: self.load_library_page(0))
         
-        # Recording Statistics
-        stats_group = QGroupBox("Recording Statistics")
-        stats_group.setStyleSheet(self.get_group_style())
-        stats_layout = QVBoxLayout()
+        add_folder_button = ModernButton("➕ Add Folder", "#27AE60")
+        add_folder_button.clicked.connect(self.add_library_folder)
+        self.rescan_button = ModernButton("🔄 Rescan", "#3498DB")
+        self.rescan_button.clicked.connect(self.scan_library)
+        tags_button = ModernButton("🏷️ Tags...", "#9B59B6")
+        tags_button.clicked.connect(self.edit_library_tags)
         
-        self.stats_text = QTextEdit()
-        self.stats_text.setStyleSheet("""
-            QTextEdit {
+        toolbar_layout.addWidget(self.library_search_line, stretch=1)
+        toolbar_layout.addWidget(add_folder_button)
+        toolbar_layout.addWidget(self.rescan_button)
+        toolbar_layout.addWidget(tags_button)
+        layout.addLayout(toolbar_layout)
+        
+        self.library_list = QListWidget()
+        self.library_list.setViewMode(QListWidget.IconMode)
+        self.library_list.setIconSize(QSize(240, 135))
+        self.library_list.setGridSize(QSize(270, 210))
+        self.library_list.setResizeMode(QListWidget.Adjust)
+        self.library_list.setMovement(QListWidget.Static)
+        self.library_list.setWordWrap(True)
+        self.library_list.setStyleSheet("""
+            QListWidget {
                 background: #2C3E50;
                 border: 1px solid #34495E;
                 border-radius: 5px;
                 color: white;
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 12px;
-                padding: 10px;
+            }
+            QListWidget::item:selected {
+                background: rgba(52, 152, 219, 120);
+                border-radius: 6px;
             }
         """)
-        self.stats_text.setReadOnly(True)
-        self.update_stats_display()
+        self.library_list.itemDoubleClicked.connect(self.open_library_item)
+        layout.addWidget(self.library_list, stretch=1)
         
-        stats_layout.addWidget(self.stats_text)
-        stats_group.setLayout(stats_layout)
-        layout.addWidget(stats_group)
+        pager_layout = QHBoxLayout()
+        self.library_prev_button = ModernButton("◀ Previous", "#95A5A6")
+        self.library_prev_button.clicked.connect(lambda: self.load_library_page(self.library_page - 1))
+        self.library_page_label = QLabel("")
+        self.library_page_label.setAlignment(Qt.AlignCenter)
+        self.library_next_button = ModernButton("Next ▶", "#95A5A6")
+        self.library_next_button.clicked.connect(lambda: self.load_library_page(self.library_page + 1))
+        
+        pager_layout.addWidget(self.library_prev_button)
+        pager_layout.addWidget(self.library_page_label, stretch=1)
+        pager_layout.addWidget(self.library_next_button)
+        layout.addLayout(pager_layout)
         
         tab.setLayout(layout)
     
@@ -667,6 +6626,12 @@ class EEMStudioPro(QMainWindow):
         self.record_button.clicked.connect(self.toggle_recording)
         self.record_button.setMinimumHeight(50)
         
+        # Arm button, keeps a recorder warm so Start is instant
+        self.arm_button = ModernButton("🎯 Arm", "#9B59B6")
+        self.arm_button.clicked.connect(self.toggle_armed)
+        self.arm_button.setToolTip("Open the camera and the writer now; settings are taken when arming")
+        self.arm_button.setMinimumHeight(50)
+        
         # Pause button
         self.pause_button = ModernButton("⏸️ Pause", "#F39C12")
         self.pause_button.clicked.connect(self.toggle_pause)
@@ -680,6 +6645,7 @@ class EEMStudioPro(QMainWindow):
         self.stop_button.setMinimumHeight(50)
         
         buttons_layout.addStretch()
+        buttons_layout.addWidget(self.arm_button)
         buttons_layout.addWidget(self.record_button)
         buttons_layout.addWidget(self.pause_button)
         buttons_layout.addWidget(self.stop_button)
@@ -801,6 +6767,24 @@ class EEMStudioPro(QMainWindow):
             }
         """
     
+    def get_table_style(self):
+        """Get consistent table styling"""
+        return """
+            QTableWidget {
+                background: #2C3E50;
+                border: 1px solid #34495E;
+                border-radius: 5px;
+                color: white;
+                gridline-color: #34495E;
+            }
+            QHeaderView::section {
+                background: #34495E;
+                color: white;
+                border: none;
+                padding: 4px;
+            }
+        """
+    
     def get_input_style(self):
         """Get consistent input styling"""
         return """
@@ -897,6 +6881,76 @@ class EEMStudioPro(QMainWindow):
             self.output_file = file_path
             self.output_line.setText(file_path)
     
+    def select_tool_source(self):
+        """Select the recording used by the post-recording tools"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Recording", self.tool_source_line.text() or self.settings.get("output_directory", ""),
+            "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)"
+        )
+        
+        if file_path:
+            self.tool_source_line.setText(file_path)
+    
+    def select_overlay_logo(self):
+        """Select the logo image burned into recordings"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Logo", self.overlay_logo_line.text(),
+            "Images (*.png *.jpg *.jpeg *.bmp);;All Files (*)"
+        )
+        
+        if file_path:
+            self.overlay_logo_line.setText(file_path)
+    
+    def stage_scheduling_settings(self):
+        """Stage scheduling as entered in the table, CPU lists still as text"""
+        settings = {}
+        for row, stage in enumerate(PIPELINE_STAGES):
+            settings[stage] = {
+                "cpus": self.stage_table.item(row, 0).text().strip(),
+                "nice": self.stage_table.cellWidget(row, 1).value(),
+                "realtime": self.stage_table.item(row, 2).checkState() == Qt.Checked
+            }
+        return settings
+    
+    def select_camera_scene(self):
+        """Select a camera scene file"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Camera Scene", self.camera_scene_line.text(),
+                                                   "Camera Scenes (*.json)")
+        if file_path:
+            self.camera_scene_line.setText(file_path)
+    
+    def select_overflow_directory(self):
+        """Select where recordings continue when their disk is nearly full"""
+        folder = QFileDialog.getExistingDirectory(self, "Select Overflow Folder", self.overflow_line.text())
+        if folder:
+            self.overflow_line.setText(folder)
+    
+    def select_window(self):
+        """Select a window to follow while recording"""
+        windows = list_x11_windows()
+        if not windows:
+            QMessageBox.information(
+                self, "Window Capture",
+                "Window capture needs an X11 session and the python-xlib package."
+                if not XLIB_AVAILABLE or not os.environ.get("DISPLAY") else "No windows were found."
+            )
+            return
+        
+        titles = [f"{title}  (0x{window_id:x})" for window_id, title in windows]
+        titles.insert(0, "Full screen")
+        choice, ok = QInputDialog.getItem(self, "Record Window", "Window to record:", titles, 0, False)
+        if not ok:
+            return
+        
+        if choice == titles[0]:
+            self.selected_window = None
+            self.region_line.clear()
+        else:
+            window_id, title = windows[titles.index(choice) - 1]
+            self.selected_window = window_id
+            self.region_line.setText(f"Window: {title}")
+        self.selected_region = None
+    
     def select_region(self):
         """Select screen region to record"""
         self.hide()
@@ -958,6 +7012,7 @@ class EEMStudioPro(QMainWindow):
                 
                 if rect.width() > 10 and rect.height() > 10:
                     self.selected_region = (rect.x(), rect.y(), rect.width(), rect.height())
+                    self.selected_window = None
                     self.region_line.setText(f"{rect.width()}×{rect.height()} at ({rect.x()}, {rect.y()})")
                 
                 self.region_window.close()
@@ -984,12 +7039,18 @@ class EEMStudioPro(QMainWindow):
         else:
             self.stop_recording()
     
-    def start_recording(self):
-        """Start recording"""
+    def create_recorder(self, armed=False):
+        """Build the recorder from the current settings, returns False if it could not be created"""
+        if self.burst and self.burst.isRunning():
+            QMessageBox.information(self, "Burst in Progress", "Wait for the burst to finish before recording.")
+            return False
         if not self.output_file:
             QMessageBox.warning(self, "No Output File", 
                               "Please select an output file location first.")
-            return
+            return False
+        if armed and self.timelapse_check.isChecked():
+            QMessageBox.information(self, "Timelapse", "A timelapse keeps its own pace and cannot be armed.")
+            return False
         
         # Get settings
         camera_device = self.device_combo.currentData()
@@ -999,29 +7060,147 @@ class EEMStudioPro(QMainWindow):
         quality = self.quality_slider.value()
         record_audio = self.record_audio_check.isChecked()
         mouse_cursor = self.mouse_cursor_check.isChecked()
+        capture_mode = "spool" if self.fast_capture_check.isChecked() else "direct"
         
-        # Create recorder
-        self.recorder = AdvancedScreenRecorder(
-            output_file=self.output_file,
-            screen_region=self.selected_region,
-            camera_device=camera_device,
-            camera_position=camera_position,
-            camera_size=camera_size,
-            fps=fps,
-            quality=quality,
-            record_audio=record_audio,
-            mouse_cursor=mouse_cursor
-        )
+        # Streaming shares the live encode, so it needs FFmpeg and rules out fast capture
+        stream_targets = [target.strip() for target in self.stream_line.text().split(",") if target.strip()]
+        if stream_targets and not find_ffmpeg_tool():
+            QMessageBox.warning(self, "Streaming Unavailable",
+                                "Streaming needs FFmpeg on the PATH. Recording to the file only.")
+            stream_targets = []
+        if stream_targets and capture_mode == "spool":
+            capture_mode = "direct"
+            if hasattr(self, 'tray_icon'):
+                self.tray_icon.showMessage("EEM Studio Pro", "Fast Capture is off while streaming", 
+                                         QSystemTrayIcon.Information, 3000)
+        
+        # A timelapse idles between captures, which only the threaded recorder does
+        timelapse = {}
+        if self.timelapse_check.isChecked():
+            timelapse = {"timelapse_interval": self.timelapse_interval_spin.value(),
+                         "timelapse_idle": self.timelapse_idle_combo.currentData()}
+        
+        try:
+            proxy_ladder = parse_proxy_ladder(self.proxy_ladder_line.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Proxy Ladder", f"Could not use the proxy ladder:\n\n{e}")
+            return False
+        
+        camera_scene = None
+        if self.camera_scene_line.text().strip():
+            try:
+                camera_scene = load_camera_scene(self.camera_scene_line.text().strip())
+            except ValueError as e:
+                QMessageBox.warning(self, "Camera Scene", f"Could not use the camera scene:\n\n{e}")
+                return False
+        
+        self.current_recording_settings = {
+            "camera": f"Scene of {len(camera_scene)} cameras" if camera_scene else self.device_combo.currentText(),
+            "camera_position": camera_position,
+            "camera_size": f"{camera_size[0]}×{camera_size[1]}",
+            "camera_effect": self.camera_effect_combo.currentData(),
+            "fps": fps,
+            "quality": quality,
+            "region": self.region_line.text() or "Full screen",
+            "capture_mode": capture_mode,
+            "stream_targets": stream_targets,
+            "proxy_ladder": self.proxy_ladder_line.text().strip(),
+            "timelapse_interval": timelapse.get("timelapse_interval"),
+            "pre_roll": self.pre_roll_combo.currentData() if armed else 0.0
+        }
+        
+        # Register the final encode up front so an interrupted session can be recovered
+        self.spool_job_ids = []
+        if capture_mode == "spool":
+            self.register_spool_job(self.output_file, self.output_file + ".spool")
+        
+        # Give the recording the whole machine
+        self.job_queue.set_paused(True)
+        
+        # Create recorder; only the threaded one can stand by
+        standby = {}
+        if armed:
+            standby = {"armed": True, "pre_roll": self.pre_roll_combo.currentData()}
+        if self.pipeline_combo.currentData() == "process" and not timelapse and not armed:
+            recorder_class = ProcessPipelineRecorder
+        else:
+            recorder_class = AdvancedScreenRecorder
+        
+        self.recording_error = None
+        try:
+            self.recorder = recorder_class(
+                output_file=self.output_file,
+                screen_region=self.selected_region,
+                camera_device=camera_device,
+                camera_position=camera_position,
+                camera_size=camera_size,
+                fps=fps,
+                quality=quality,
+                record_audio=record_audio,
+                mouse_cursor=mouse_cursor,
+                capture_mode=capture_mode,
+                fsync_policy=self.fsync_combo.currentData(),
+                window_id=self.selected_window,
+                overlay_settings={
+                    "timestamp": self.overlay_timestamp_check.isChecked(),
+                    "label": self.overlay_label_line.text().strip(),
+                    "logo": self.overlay_logo_line.text().strip()
+                },
+                stream_targets=stream_targets,
+                camera_effect=self.camera_effect_combo.currentData(),
+                stream_preset=self.stream_preset,
+                publish_preview=self.publish_preview_check.isChecked(),
+                stage_scheduling=resolve_stage_scheduling(self.stage_scheduling_settings()),
+                camera_scene=camera_scene,
+                proxy_ladder=proxy_ladder,
+                preview_width=PREVIEW_WIDTHS[self.preview_quality_combo.currentData()],
+                **timelapse,
+                **standby
+            )
+        except Exception as e:
+            # Most likely the followed window was closed since it was picked
+            self.cancel_spool_jobs()
+            self.job_queue.set_paused(False)
+            self.recorder = None
+            QMessageBox.warning(self, "Recording Failed", f"Could not start recording:\n\n{e}")
+            return False
+        
+        # Cameras that could not be opened join the recording once they deliver
+        missing = getattr(self.recorder, 'camera', None) and self.recorder.camera.missing
+        if missing and hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", f"Camera not found: {', '.join(map(str, missing))}",
+                                       QSystemTrayIcon.Warning, 3000)
+        return True
+    
+    def start_recording(self):
+        """Start recording, at once if a recorder is armed"""
+        if not self.armed and not self.create_recorder():
+            return
         
         # Connect signals
-        self.recorder.update_frame.connect(self.preview_widget.update_frame)
         self.recorder.recording_finished.connect(self.on_recording_finished)
-        self.recorder.progress_update.connect(self.update_duration)
-        self.recorder.fps_update.connect(self.update_fps)
-        self.recorder.file_size_update.connect(self.update_file_size)
+        self.shown_status = {}
+        self.status_timer.start(int(STATUS_INTERVAL * 1000))
+        if hasattr(self.recorder, 'pipeline_error') and not self.armed:
+            self.recorder.pipeline_error.connect(self.on_pipeline_error)
+        if hasattr(self.recorder, 'segment_started'):
+            self.recorder.segment_started.connect(self.on_segment_started)
         
-        # Start recording
-        self.recorder.start()
+        # Watch the output volume so a full disk never cuts a recording short silently
+        self.disk_watchdog = DiskSpaceWatchdog(os.path.dirname(os.path.abspath(self.output_file)))
+        self.disk_watchdog.space_update.connect(self.update_disk_space)
+        self.disk_watchdog.space_warning.connect(self.on_disk_space_warning)
+        self.disk_watchdog.space_critical.connect(self.on_disk_space_critical)
+        
+        # Start recording; an armed recorder is already capturing and only needs the trigger
+        self.start_session_log()
+        if self.armed:
+            self.armed = False
+            self.recorder.trigger()
+        else:
+            self.recorder.start()
+        self.disk_watchdog.start()
+        self.system_sampler.set_recorder(self.recorder)
         self.is_recording = True
         
         # Update UI
@@ -1029,6 +7208,8 @@ class EEMStudioPro(QMainWindow):
         self.record_button.setEnabled(False)
         self.pause_button.setEnabled(True)
         self.stop_button.setEnabled(True)
+        self.arm_button.setText("🎯 Arm")
+        self.arm_button.setEnabled(False)
         self.status_label.setText("🔴 Recording in Progress")
         self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #E74C3C;")
         
@@ -1037,6 +7218,177 @@ class EEMStudioPro(QMainWindow):
             self.tray_icon.showMessage("EEM Studio Pro", "Recording started", 
                                      QSystemTrayIcon.Information, 3000)
     
+    def start_session_log(self):
+        """Open the performance log of the recording that is starting, next to its output file"""
+        config = {
+            **self.current_recording_settings,
+            "pipeline_mode": "process" if isinstance(self.recorder, ProcessPipelineRecorder) else "thread",
+            "resolution": f"{self.recorder.width}×{self.recorder.height}",
+            "fsync_policy": self.fsync_combo.currentData(),
+            "stage_scheduling": self.stage_scheduling_settings(),
+            "overlays": [name for name, check in (("timestamp", self.overlay_timestamp_check.isChecked()),
+                                                  ("label", bool(self.overlay_label_line.text().strip())),
+                                                  ("logo", bool(self.overlay_logo_line.text().strip()))) if check]
+        }
+        hardware = {
+            "cpu": cpu_model_name(),
+            "cores": os.cpu_count(),
+            "memory_gb": round(psutil.virtual_memory().total / 2**30),
+            "system": platform.platform(),
+            "fingerprint": hardware_fingerprint(self.recorder.width, self.recorder.height)
+        }
+        started = time.time()
+        header = {"started": started, "output_file": self.output_file, "config": config, "hardware": hardware}
+        # Named by its start, so recording to the same file again keeps the earlier sessions
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+        self.system_sampler.start_session_log(f"{self.output_file}.{stamp}{PERF_LOG_EXTENSION}", header)
+    
+    def finish_session_log(self):
+        """Close the performance log, append its summary and add the session to the history"""
+        log_file = self.system_sampler.stop_session_log()
+        if not log_file:
+            return
+        try:
+            header, samples, _ = read_session_log(log_file)
+            summary = summarize_session(header, samples)
+            with open(log_file, 'a') as f:
+                f.write(json.dumps({"type": "summary", **summary}, separators=(",", ":")) + "\n")
+            self.library.register_session(log_file, header, summary)
+        except (OSError, sqlite3.Error):
+            return  # The history is a convenience, never block on it
+        self.reload_session_history()
+    
+    def reload_session_history(self):
+        self.sessions = []
+        self.sessions_table.setRowCount(0)
+        self.load_more_sessions()
+    
+    def load_more_sessions(self):
+        """Append the next page of recorded sessions to the history table"""
+        sessions = self.library.session_page(len(self.sessions), RecordingLibrary.PAGE_SIZE)
+        row = len(self.sessions)
+        self.sessions.extend(sessions)
+        self.sessions_table.setRowCount(len(self.sessions))
+        for row, session in enumerate(sessions, row):
+            summary = session["summary"]
+            fps = f"{summary.get('mean_fps', 0):.1f}"
+            if summary.get("target_fps"):
+                fps += f" / {summary['target_fps']}"
+            cells = [datetime.fromtimestamp(session["started"]).strftime("%Y-%m-%d %H:%M"),
+                     os.path.basename(session["output_file"]), fps, f"{summary.get('low_fps', 0):.1f}",
+                     str(summary.get("dropped", 0)), f"{summary.get('mean_cpu', 0):.0f}%",
+                     f"{summary.get('peak_rss_mb', 0):.0f} MB"]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setToolTip(session["log_file"])
+                self.sessions_table.setItem(row, column, item)
+        
+        total = self.library.session_count()
+        self.sessions_label.setText(f"{len(self.sessions)} of {total} sessions")
+        self.sessions_more_button.setEnabled(len(self.sessions) < total)
+    
+    def compare_selected_sessions(self):
+        """Show the selected sessions side by side, oldest first, each against the oldest"""
+        rows = sorted({index.row() for index in self.sessions_table.selectedIndexes()})
+        if len(rows) < 2:
+            QMessageBox.information(self, "Compare Sessions", "Select at least two sessions to compare.")
+            return
+        sessions = sorted((self.sessions[row] for row in rows), key=lambda session: session["started"])
+        self.session_compare_text.setPlainText(format_session_comparison(sessions))
+    
+    def toggle_armed(self):
+        """Hold a recorder in standby so Start begins within a frame, or release it"""
+        if self.armed:
+            self.disarm_recorder()
+            return
+        if self.is_recording or not self.create_recorder(armed=True):
+            return
+        
+        # The preview runs while armed
+        self.shown_status = {}
+        self.status_timer.start(int(STATUS_INTERVAL * 1000))
+        self.recorder.pipeline_error.connect(self.on_pipeline_error)
+        self.recorder.recording_finished.connect(self.on_standby_finished)
+        self.recorder.start()
+        self.armed = True
+        self.arm_button.setText("🎯 Disarm")
+        self.status_label.setText("🎯 Armed, recording starts at once")
+        self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #9B59B6;")
+    
+    def disarm_recorder(self):
+        """Stop the standby recorder; it removes the files it opened"""
+        self.armed = False
+        self.status_timer.stop()
+        self.recorder.stop_recording()
+        self.recorder.wait()
+        self.recorder = None
+        self.cancel_spool_jobs()
+        self.job_queue.set_paused(False)
+        self.arm_button.setText("🎯 Arm")
+        self.status_label.setText("🔴 Ready to Record")
+        self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #E74C3C;")
+    
+    def on_standby_finished(self):
+        """Disarm when the standby recorder stopped before Start, most likely because capture failed"""
+        if not self.armed or self.sender() is not self.recorder:
+            return  # Triggered, or a recorder disarmed earlier
+        error = self.recording_error
+        self.disarm_recorder()
+        QMessageBox.warning(self, "Standby Failed",
+                            f"The armed recorder stopped:\n\n{error or 'Capture ended unexpectedly'}")
+    
+    def toggle_burst(self):
+        """Start a burst of stills, or stop the one that is running"""
+        if self.burst and self.burst.isRunning():
+            self.burst.stop()
+            return
+        if self.is_recording:
+            QMessageBox.information(self, "Recording in Progress", "Stop the recording before taking a burst.")
+            return
+        
+        directory = os.path.dirname(self.output_file) if self.output_file else self.settings.get("output_directory", "")
+        output_dir = os.path.join(directory or os.path.expanduser("~"), f"burst_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.burst = BurstCapture(
+            output_dir,
+            screen_region=self.selected_region,
+            rate=self.burst_rate_spin.value(),
+            duration=self.burst_duration_spin.value(),
+            image_format=self.burst_format_combo.currentData(),
+            quality=self.quality_slider.value(),
+            mouse_cursor=self.mouse_cursor_check.isChecked()
+        )
+        self.burst.burst_progress.connect(self.on_burst_progress)
+        self.burst.burst_finished.connect(self.on_burst_finished)
+        
+        # Encoding stills takes every core, background jobs wait
+        self.job_queue.set_paused(True)
+        self.burst.start()
+        self.burst_button.setText("⏹️ Stop Burst")
+        self.burst_status_label.setText(f"📸 Capturing to {output_dir}")
+    
+    def on_burst_progress(self, stats):
+        self.burst_status_label.setText(
+            f"📸 {stats['grabbed']} grabbed ({stats['grab_rate']:.1f}/s), {stats['encoded']} saved "
+            f"({stats['encode_rate']:.1f}/s), {stats['pending']} waiting, {stats['skipped']} skipped")
+    
+    def on_burst_finished(self, stats):
+        """Report sustained grab rate against encode rate"""
+        self.job_queue.set_paused(False)
+        self.burst_button.setText("📸 Start Burst")
+        
+        prefix = f"⚠️ Burst stopped ({stats['error']}):" if stats["error"] else "✅"
+        text = (f"{prefix} {stats['encoded']} stills in {stats['output_dir']} — grab {stats['grab_rate']:.1f}/s, "
+                f"encode {stats['encode_rate']:.1f}/s (pool capacity {stats['encode_capacity']:.1f}/s)")
+        if stats["skipped"]:
+            text += f", {stats['skipped']} skipped while encoding caught up"
+        if stats["failed"]:
+            text += f", {stats['failed']} could not be written"
+        self.burst_status_label.setText(text)
+        
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", f"Burst saved: {stats['encoded']} stills", 
+                                     QSystemTrayIcon.Information, 3000)
+    
     def toggle_pause(self):
         """Pause or resume recording"""
         if not self.recorder:
@@ -1064,6 +7416,8 @@ class EEMStudioPro(QMainWindow):
         """Handle recording completion"""
         self.is_recording = False
         self.is_paused = False
+        self.status_timer.stop()
+        self.poll_recorder_status()
         
         # Update UI
         self.record_button.setText("🔴 Start Recording")
@@ -1071,13 +7425,70 @@ class EEMStudioPro(QMainWindow):
         self.pause_button.setEnabled(False)
         self.pause_button.setText("⏸️ Pause")
         self.stop_button.setEnabled(False)
+        self.arm_button.setEnabled(True)
+        self.job_queue.set_paused(False)
+        self.system_sampler.set_recorder(None)
+        self.finish_session_log()
+        if self.disk_watchdog:
+            self.disk_watchdog.stop()
+            self.disk_watchdog.wait()
+            self.disk_watchdog = None
+        
+        # A recording that ran out of space continued in extra files on the overflow volume
+        segments = getattr(self.recorder, "segments", [(self.output_file, None)])
+        output_files = [segment[0] for segment in segments]
+        
+        # Proxies are finished when the recorder stops, even if the master still has to be encoded
+        failed_proxies = [proxy for proxy in getattr(self.recorder, "proxy_stats", []) if proxy["error"]]
+        for proxy_file in getattr(self.recorder, "proxy_files", []):
+            if os.path.exists(proxy_file) and proxy_file not in [proxy["file"] for proxy in failed_proxies]:
+                self.catalog_recording(proxy_file, {**self.current_recording_settings,
+                                                    "proxy_of": os.path.basename(self.output_file)})
+        if failed_proxies and hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", f"Proxy failed: {failed_proxies[0]['error']}",
+                                       QSystemTrayIcon.Warning, 3000)
+        
+        # Report a pipeline failure, whatever reached the disk is kept
+        if self.recording_error:
+            QMessageBox.warning(
+                self, "Recording Failed",
+                f"The recording pipeline stopped unexpectedly:\n\n{self.recording_error}\n\n"
+                "Frames captured before the failure were kept."
+            )
+            self.recording_error = None
+            if not self.spool_job_ids:
+                self.status_label.setText("⚠️ Recording Failed")
+                self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #E74C3C;")
+                return
+        
+        # Fast capture hands the spool to a background encode instead of finishing here
+        if self.spool_job_ids:
+            for job_id in self.spool_job_ids:
+                self.job_queue.release_job(job_id)
+            self.spool_job_ids = []
+            if hasattr(self, 'tray_icon'):
+                self.tray_icon.showMessage("EEM Studio Pro", "Recording captured, finalizing in background", 
+                                         QSystemTrayIcon.Information, 3000)
+            return
+        
         self.status_label.setText("✅ Recording Complete")
         self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #2ECC71;")
+        self.tool_source_line.setText(self.output_file)
+        for output_file in output_files:
+            self.catalog_recording(output_file, self.current_recording_settings)
+            
+            # Replace the estimated index offsets with the container's once nothing else is running
+            index_file = output_file + INDEX_EXTENSION
+            if os.path.exists(index_file) and find_ffmpeg_tool("ffprobe"):
+                self.job_queue.add_job(
+                    "reindex", {"index_file": index_file, "video_file": output_file},
+                    f"Index {os.path.basename(output_file)}")
         
         # Show completion message
+        saved_files = "\n".join(output_files)
         reply = QMessageBox.question(
             self, "Recording Complete",
-            f"Recording saved successfully!\n\n{self.output_file}\n\nWould you like to open the file location?",
+            f"Recording saved successfully!\n\n{saved_files}\n\nWould you like to open the file location?",
             QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes
         )
         
@@ -1097,6 +7508,499 @@ class EEMStudioPro(QMainWindow):
             self.tray_icon.showMessage("EEM Studio Pro", "Recording completed successfully!", 
                                      QSystemTrayIcon.Information, 5000)
     
+    def update_disk_space(self, free_bytes, seconds_left):
+        """Show how long the output volume lasts at the current rate"""
+        if seconds_left == float("inf"):
+            self.disk_left_label.setText(f"{free_bytes / (1024 ** 3):.1f} GB free")
+        else:
+            minutes, seconds = divmod(int(seconds_left), 60)
+            hours, minutes = divmod(minutes, 60)
+            self.disk_left_label.setText(f"{hours:02d}:{minutes:02d}:{seconds:02d} "
+                                         f"({free_bytes / (1024 ** 3):.1f} GB free)")
+    
+    def on_disk_space_warning(self, directory, seconds_left):
+        """Warn early enough to free space or stop by choice"""
+        message = f"About {max(1, int(seconds_left // 60))} min of disk space left on {directory}"
+        self.disk_left_label.setStyleSheet("font-size: 16px; color: #F39C12;")
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", message, QSystemTrayIcon.Warning, 5000)
+    
+    def on_disk_space_critical(self, directory, seconds_left):
+        """Move the recording to the overflow folder, or stop while the file can still be closed"""
+        if not self.recorder or not self.is_recording:
+            return
+        
+        self.disk_left_label.setStyleSheet("font-size: 16px; color: #E74C3C;")
+        overflow = self.overflow_line.text().strip()
+        if overflow and os.path.isdir(overflow) and hasattr(self.recorder, 'rotate_output'):
+            try:
+                overflow_free = shutil.disk_usage(overflow).free
+                same_volume = os.stat(overflow).st_dev == os.stat(directory).st_dev
+            except OSError:
+                overflow_free, same_volume = 0, True
+            
+            if not same_volume and overflow_free > self.disk_watchdog.reserve_bytes * 4:
+                self.recorder.rotate_output(overflow)
+                self.disk_watchdog.set_directory(overflow)
+                if hasattr(self, 'tray_icon'):
+                    self.tray_icon.showMessage("EEM Studio Pro", f"Disk almost full, recording continues in {overflow}", 
+                                             QSystemTrayIcon.Warning, 5000)
+                return
+        
+        self.recorder.stop_recording()
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", "Disk almost full, recording stopped to keep the file intact", 
+                                     QSystemTrayIcon.Critical, 5000)
+    
+    def check_calibration(self, force=False):
+        """Apply cached calibration for this machine, benchmarking it if there is none"""
+        if self.calibration_task and self.calibration_task.isRunning():
+            return
+        
+        width, height = pyautogui.size()
+        fingerprint = hardware_fingerprint(width, height)
+        if not force:
+            if fingerprint == self.calibration_fingerprint:
+                cached = load_calibration(fingerprint)
+                if cached:
+                    self.calibration_label.setText(self.describe_calibration(cached))
+                return
+            cached = load_calibration(fingerprint)
+            if cached:
+                self.on_calibration_finished(cached, "")
+                return
+        
+        self.calibrate_button.setEnabled(False)
+        self.calibration_label.setText(f"⚙️ Benchmarking capture and encoders at {width}×{height}...")
+        self.calibration_task = PostProcessTask(calibrate_hardware, width, height, self.quality_slider.value())
+        self.calibration_task.task_finished.connect(self.on_calibration_finished)
+        self.calibration_task.start()
+    
+    def describe_calibration(self, result):
+        recommendation = result["recommendation"]
+        timings = result["timings"]
+        mode = "Fast Capture" if recommendation["capture_mode"] == "spool" else "direct encoding"
+        text = (f"{recommendation['fps']} fps with {mode}, {recommendation['pipeline']} pipeline, "
+                f"{recommendation['stream_preset']} streaming — capture {timings['capture']:.1f} ms, "
+                f"encode {timings['encode_direct']:.1f} ms (direct) / {timings['encode_spool']:.1f} ms (fast)")
+        if not recommendation["sustained"]:
+            text += " ⚠️ this machine cannot hold 24 fps at full screen, consider recording a region"
+        return text
+    
+    def on_calibration_finished(self, result, error):
+        """Switch the recording controls to the calibrated settings"""
+        self.calibrate_button.setEnabled(True)
+        if error:
+            self.calibration_label.setText(f"⚠️ Calibration failed: {error}")
+            return
+        
+        recommendation = result["recommendation"]
+        self.fps_combo.setCurrentText(str(recommendation["fps"]))
+        self.fast_capture_check.setChecked(recommendation["capture_mode"] == "spool")
+        self.pipeline_combo.setCurrentIndex(max(0, self.pipeline_combo.findData(recommendation["pipeline"])))
+        self.stream_preset = recommendation["stream_preset"]
+        self.calibration_fingerprint = result["fingerprint"]
+        self.calibration_label.setText(self.describe_calibration(result))
+        self.save_settings()
+        
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", 
+                                     f"Calibrated: {recommendation['fps']} fps recommended for this machine", 
+                                     QSystemTrayIcon.Information, 3000)
+    
+    def register_spool_job(self, output_file, spool_file):
+        """Register the final encode of a spool up front so an interrupted session can be recovered"""
+        self.spool_job_ids.append(self.job_queue.add_job(
+            "finalize_spool",
+            {"spool_file": spool_file, "output_file": output_file,
+             "quality": self.current_recording_settings["quality"],
+             "recording_settings": self.current_recording_settings},
+            f"Finalize {os.path.basename(output_file)}", held=True))
+    
+    def cancel_spool_jobs(self):
+        for job_id in self.spool_job_ids:
+            self.job_queue.cancel_job(job_id)
+        self.spool_job_ids = []
+    
+    def on_segment_started(self, output_file, record_file):
+        """An overflow segment opened; a spool segment needs its own finalize job"""
+        if self.spool_job_ids:
+            self.register_spool_job(output_file, record_file)
+    
+    def on_pipeline_error(self, message):
+        """Remember a worker failure so completion handling can report it"""
+        self.recording_error = message
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("EEM Studio Pro", "Recording pipeline failed", 
+                                     QSystemTrayIcon.Warning, 3000)
+    
+    def on_job_updated(self, job):
+        """Show background job progress in the tray, status bar and jobs table"""
+        self.update_job_row(job)
+        
+        running, waiting, progress = self.job_queue.active_summary()
+        if hasattr(self, 'tray_icon'):
+            if running:
+                queued = f", {waiting} queued" if waiting else ""
+                self.tray_icon.setToolTip(f"EEM Studio Pro - {running} job(s) running {progress}%{queued}")
+            else:
+                self.tray_icon.setToolTip("EEM Studio Pro")
+        
+        if job["status"] == "running" and job["kind"] == "finalize_spool" and not self.is_recording:
+            self.status_label.setText(f"⚙️ Finalizing Recording {job['progress']}%")
+            self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #F39C12;")
+    
+    def on_job_finished(self, job):
+        """Notify about a completed background job"""
+        if job["status"] == "cancelled":
+            return
+        
+        success = job["status"] == "done"
+        if hasattr(self, 'tray_icon'):
+            if success:
+                self.tray_icon.showMessage("EEM Studio Pro", f"{job['description']} finished", 
+                                         QSystemTrayIcon.Information, 5000)
+            else:
+                self.tray_icon.showMessage("EEM Studio Pro", f"{job['description']} failed:\n{job['error']}", 
+                                         QSystemTrayIcon.Warning, 5000)
+        
+        if success and job["params"].get("output_file"):
+            self.tool_source_line.setText(job["params"]["output_file"])
+            self.catalog_recording(job["params"]["output_file"], job["params"].get("recording_settings"))
+        
+        if job["kind"] == "finalize_spool" and not self.is_recording:
+            if success:
+                self.status_label.setText("✅ Recording Complete")
+                self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #2ECC71;")
+            else:
+                self.status_label.setText("⚠️ Finalizing Failed")
+                self.status_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #E74C3C;")
+    
+    def refresh_jobs_table(self):
+        """Rebuild the background jobs table"""
+        jobs = sorted(self.job_queue.jobs, key=lambda job: (
+            {"running": 0, "queued": 1, "held": 1}.get(job["status"], 2), -job["priority"], job["created"]))
+        self.jobs_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            item = QTableWidgetItem(job["description"])
+            item.setData(Qt.UserRole, job["id"])
+            self.jobs_table.setItem(row, 0, item)
+            self.update_job_row(job, row)
+    
+    def update_job_row(self, job, row=None):
+        """Update one row of the background jobs table"""
+        if row is None:
+            for index in range(self.jobs_table.rowCount()):
+                item = self.jobs_table.item(index, 0)
+                if item and item.data(Qt.UserRole) == job["id"]:
+                    row = index
+                    break
+            else:
+                self.refresh_jobs_table()
+                return
+        
+        status = job["status"].capitalize()
+        if job["status"] == "failed" and job["error"]:
+            status = f"Failed: {job['error']}"
+        self.jobs_table.setItem(row, 1, QTableWidgetItem(status))
+        self.jobs_table.setItem(row, 2, QTableWidgetItem(f"{job['progress']}%"))
+        self.jobs_table.setItem(row, 3, QTableWidgetItem(str(job["priority"])))
+    
+    def selected_job_id(self):
+        row = self.jobs_table.currentRow()
+        item = self.jobs_table.item(row, 0) if row >= 0 else None
+        return item.data(Qt.UserRole) if item else None
+    
+    def prioritize_selected_job(self):
+        job_id = self.selected_job_id()
+        if job_id:
+            self.job_queue.prioritize_job(job_id)
+    
+    def cancel_selected_job(self):
+        job_id = self.selected_job_id()
+        if job_id:
+            self.job_queue.cancel_job(job_id)
+    
+    def queue_conversion(self):
+        """Queue a format conversion of the source recording"""
+        source_file = self.tool_source_line.text()
+        if not os.path.exists(source_file):
+            QMessageBox.warning(self, "No Recording", "Please select a recording to convert.")
+            return
+        
+        root, _ = os.path.splitext(source_file)
+        output_file, _ = QFileDialog.getSaveFileName(
+            self, "Convert Recording", f"{root}_converted.mp4",
+            "MP4 (*.mp4);;MOV (*.mov);;MKV (*.mkv);;AVI (*.avi);;WebM (*.webm)"
+        )
+        if output_file and os.path.abspath(output_file) != os.path.abspath(source_file):
+            self.job_queue.add_job(
+                "transcode",
+                {"source_file": source_file, "output_file": output_file, "quality": self.quality_slider.value()},
+                f"Convert {os.path.basename(source_file)} to {os.path.splitext(output_file)[1][1:].upper()}")
+            self.tool_status_label.setText("📋 Conversion queued, see Background Jobs in the Analytics tab")
+    
+    def queue_proxy(self):
+        """Queue a low-resolution editing proxy of the source recording"""
+        source_file = self.tool_source_line.text()
+        if not os.path.exists(source_file):
+            QMessageBox.warning(self, "No Recording", "Please select a recording first.")
+            return
+        
+        root, _ = os.path.splitext(source_file)
+        self.job_queue.add_job(
+            "proxy",
+            {"source_file": source_file, "output_file": f"{root}_proxy540p.mp4", "height": 540},
+            f"540p proxy of {os.path.basename(source_file)}")
+        self.tool_status_label.setText("📋 Proxy queued, see Background Jobs in the Analytics tab")
+    
+    def queue_animation_export(self):
+        """Queue an animated GIF or WebP export of the trim range"""
+        source_file = self.tool_source_line.text()
+        if not os.path.exists(source_file):
+            QMessageBox.warning(self, "No Recording", "Please select a recording first.")
+            return
+        if not PIL_AVAILABLE:
+            QMessageBox.warning(self, "Pillow Missing", "Install Pillow (pip install pillow) to export GIF or WebP.")
+            return
+        
+        start = self.trim_start_spin.value()
+        end = self.trim_end_spin.value() or None
+        if end is not None and end <= start:
+            QMessageBox.warning(self, "Invalid Range", "Trim end must be after trim start.")
+            return
+        
+        root, _ = os.path.splitext(source_file)
+        output_file, _ = QFileDialog.getSaveFileName(
+            self, "Export Animation", f"{root}.gif", "GIF (*.gif);;WebP (*.webp)"
+        )
+        if not output_file:
+            return
+        
+        self.job_queue.add_job(
+            "animation",
+            {"source_file": source_file, "output_file": output_file, "start": start, "end": end,
+             "fps": self.animation_fps_spin.value(), "width": self.animation_width_spin.value()},
+            f"Export {os.path.basename(output_file)}")
+        self.tool_status_label.setText("📋 Export queued, see Background Jobs in the Analytics tab")
+    
+    def run_tool_task(self, description, function, *args):
+        """Run a post-recording operation in the background"""
+        if self.tool_task and self.tool_task.isRunning():
+            QMessageBox.information(self, "Tools Busy", "Please wait for the current operation to finish.")
+            return
+        
+        self.contact_sheet_button.setEnabled(False)
+        self.tool_status_label.setText(f"⚙️ {description}...")
+        
+        self.tool_task = PostProcessTask(function, *args)
+        self.tool_task.task_finished.connect(self.on_tool_task_finished)
+        self.tool_task.start()
+    
+    def on_tool_task_finished(self, result, error):
+        """Show the result of a post-recording operation"""
+        self.contact_sheet_button.setEnabled(True)
+        
+        if error:
+            self.tool_status_label.setText(f"⚠️ {error}")
+            return
+        
+        if isinstance(result, str) and result.endswith(".jpg"):
+            pixmap = QPixmap(result)
+            self.contact_sheet_label.setPixmap(
+                pixmap.scaled(self.contact_sheet_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self.tool_status_label.setText(f"✅ Contact sheet: {result}")
+        else:
+            self.tool_status_label.setText(f"✅ Saved {result}")
+    
+    def trim_selected_recording(self):
+        """Trim the source recording at keyframes"""
+        source_file = self.tool_source_line.text()
+        if not os.path.exists(source_file):
+            QMessageBox.warning(self, "No Recording", "Please select a recording to trim.")
+            return
+        
+        root, ext = os.path.splitext(source_file)
+        output_file, _ = QFileDialog.getSaveFileName(
+            self, "Save Trimmed Recording", f"{root}_trimmed{ext}",
+            "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)"
+        )
+        if not output_file:
+            return
+        
+        start = self.trim_start_spin.value()
+        end = self.trim_end_spin.value() or None
+        if end is not None and end <= start:
+            QMessageBox.warning(self, "Invalid Range", "Trim end must be after trim start.")
+            return
+        
+        self.job_queue.add_job(
+            "trim", {"source_file": source_file, "output_file": output_file, "start": start, "end": end},
+            f"Trim {os.path.basename(source_file)}")
+        self.tool_status_label.setText("📋 Trim queued, see Background Jobs in the Analytics tab")
+    
+    def join_recordings(self):
+        """Concatenate several recordings without re-encoding"""
+        source_files, _ = QFileDialog.getOpenFileNames(
+            self, "Select Recordings to Join", self.settings.get("output_directory", ""),
+            "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)"
+        )
+        if len(source_files) < 2:
+            return
+        
+        root, ext = os.path.splitext(source_files[0])
+        output_file, _ = QFileDialog.getSaveFileName(
+            self, "Save Joined Recording", f"{root}_joined{ext}",
+            "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)"
+        )
+        if output_file:
+            # The dialog lists files in the order they were picked, which is the order they are joined in
+            self.job_queue.add_job(
+                "concat", {"source_files": source_files, "output_file": output_file},
+                f"Join {len(source_files)} recordings")
+            self.tool_status_label.setText("📋 Join queued, see Background Jobs in the Analytics tab")
+    
+    def generate_contact_sheet(self):
+        """Build a thumbnail contact sheet for the source recording"""
+        source_file = self.tool_source_line.text()
+        if not os.path.exists(source_file):
+            QMessageBox.warning(self, "No Recording", "Please select a recording first.")
+            return
+        
+        self.run_tool_task("Extracting thumbnails", create_contact_sheet, source_file)
+    
+    def on_tab_changed(self, index):
+        """Load the library lazily the first time it is shown"""
+        if index == self.library_tab_index and self.library_list.count() == 0:
+            if not self.library.folders() and self.settings.get("output_directory"):
+                self.library.add_folder(self.settings["output_directory"])
+            self.load_library_page(0)
+            self.scan_library()
+    
+    def add_library_folder(self):
+        """Add a folder to the library and index it"""
+        folder = QFileDialog.getExistingDirectory(self, "Add Folder to Library",
+                                                  self.settings.get("output_directory", ""))
+        if folder:
+            self.library.add_folder(folder)
+            self.scan_library()
+    
+    def scan_library(self):
+        """Refresh the catalog in the background, only changed files are probed"""
+        if self.library_scan_task and self.library_scan_task.isRunning():
+            return
+        
+        self.rescan_button.setEnabled(False)
+        self.library_page_label.setText("🔄 Scanning library...")
+        self.library_scan_task = PostProcessTask(self.library.scan)
+        self.library_scan_task.task_finished.connect(self.on_library_scanned)
+        self.library_scan_task.start()
+    
+    def on_library_scanned(self, probed, error):
+        self.rescan_button.setEnabled(True)
+        self.load_library_page(self.library_page)
+    
+    def load_library_page(self, page):
+        """Show one page of the catalog; thumbnails are filled in as they load"""
+        page_size = RecordingLibrary.PAGE_SIZE
+        search = self.library_search_line.text().strip()
+        total = self.library.count(search)
+        page_count = max(1, (total + page_size - 1) // page_size)
+        self.library_page = max(0, min(page, page_count - 1))
+        
+        if self.library_loader:
+            self.library_loader.cancel()
+            self.library_loader.wait()
+        
+        recordings = self.library.page(self.library_page * page_size, page_size, search)
+        self.library_list.clear()
+        self.library_items = {}
+        for recording in recordings:
+            minutes, seconds = divmod(int(recording["duration"]), 60)
+            item = QListWidgetItem(
+                f"{recording['name']}\n{minutes:d}:{seconds:02d} • {recording['width']}×{recording['height']} • "
+                f"{recording['size'] / (1024 * 1024):.1f} MB")
+            item.setData(Qt.UserRole, recording["path"])
+            
+            tooltip = [recording["path"], f"{recording['fps']:.1f} fps {recording['codec']}"]
+            if recording["tags"]:
+                tooltip.append(f"Tags: {recording['tags']}")
+            for key, value in json.loads(recording["settings"] or "{}").items():
+                tooltip.append(f"{key}: {value}")
+            item.setToolTip("\n".join(tooltip))
+            
+            self.library_list.addItem(item)
+            self.library_items[recording["path"]] = item
+        
+        self.library_page_label.setText(f"Page {self.library_page + 1} of {page_count} • {total} recordings")
+        self.library_prev_button.setEnabled(self.library_page > 0)
+        self.library_next_button.setEnabled(self.library_page < page_count - 1)
+        
+        self.library_loader = ThumbnailLoader(self.thumbnail_cache, recordings)
+        self.library_loader.thumbnail_ready.connect(self.on_library_thumbnail)
+        self.library_loader.start()
+    
+    def on_library_thumbnail(self, path, thumb_file):
+        item = self.library_items.get(path)
+        if item:
+            item.setIcon(QIcon(thumb_file))
+    
+    def open_library_item(self, item):
+        """Send a library recording to the tools tab"""
+        self.tool_source_line.setText(item.data(Qt.UserRole))
+        self.tab_widget.setCurrentIndex(self.tools_tab_index)
+    
+    def edit_library_tags(self):
+        """Edit tags of the selected library recording"""
+        item = self.library_list.currentItem()
+        if not item:
+            return
+        
+        path = item.data(Qt.UserRole)
+        recording = self.library.get(path)
+        current = recording["tags"] if recording else ""
+        tags, ok = QInputDialog.getText(self, "Edit Tags", "Comma-separated tags:", text=current)
+        if ok:
+            self.library.set_tags(path, tags.split(","))
+            self.load_library_page(self.library_page)
+    
+    def catalog_recording(self, path, settings=None):
+        """Add a finished recording or job output to the library in the background"""
+        self.catalog_pending.append((path, settings))
+        if not self.catalog_task:
+            self.start_catalog_task()
+    
+    def start_catalog_task(self):
+        """Probe everything waiting to be cataloged on one worker thread"""
+        entries, self.catalog_pending = self.catalog_pending, []
+        self.catalog_task = PostProcessTask(self.library.catalog, entries)
+        self.catalog_task.task_finished.connect(self.on_catalog_finished)
+        self.catalog_task.start()
+    
+    def on_catalog_finished(self, cataloged, error):
+        self.catalog_task.wait()
+        self.catalog_task = None
+        if self.catalog_pending:
+            self.start_catalog_task()
+        else:
+            self.load_library_page(self.library_page)
+    
+    def poll_recorder_status(self):
+        """Show the recorder's latest status snapshot, touching only the widgets whose values changed"""
+        if not self.recorder:
+            return
+        status = self.recorder.status.snapshot
+        shown = self.shown_status
+        if status["preview"] is not None and status["preview_seq"] != shown.get("preview_seq"):
+            self.preview_widget.update_frame(status["preview"])
+        if status["duration"] != shown.get("duration"):
+            self.update_duration(status["duration"])
+        if f"{status['fps']:.1f}" != f"{shown.get('fps', -1):.1f}":
+            self.update_fps(status["fps"])
+        if status["file_size"] != shown.get("file_size"):
+            self.update_file_size(status["file_size"])
+        self.shown_status = status
+    
     def update_duration(self, seconds):
         """Update recording duration display"""
         self.recording_duration = seconds
@@ -1117,7 +8021,10 @@ class EEMStudioPro(QMainWindow):
         else:
             color = "#E74C3C"  # Red
         
-        self.current_fps_label.setStyleSheet(f"font-size: 16px; color: {color}; font-weight: bold;")
+        # Restyling re-polishes the label, only do it when the colour changes
+        if color != self.fps_color:
+            self.fps_color = color
+            self.current_fps_label.setStyleSheet(f"font-size: 16px; color: {color}; font-weight: bold;")
     
     def update_file_size(self, size_bytes):
         """Update file size display"""
@@ -1130,21 +8037,37 @@ class EEMStudioPro(QMainWindow):
         else:
             size_str = f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
         
-        self.filesize_label.setText(size_str)
+        if size_str != self.filesize_label.text():
+            self.filesize_label.setText(size_str)
+    
+    def get_worker_names(self):
+        """Name the worker processes for the sampler, called from its thread"""
+        processes = list(self.job_queue.processes.values())
+        processes += getattr(self.recorder, 'workers', [])
+        return {process.pid: process.name for process in processes if process.pid}
     
     def update_system_status(self):
-        """Update system performance indicators"""
+        """Update system performance indicators from the sampler's latest data"""
         try:
+            series, thread_series, self.system_info = self.system_sampler.snapshot()
+            
             # CPU usage
-            cpu_percent = psutil.cpu_percent()
-            self.cpu_progress.setValue(int(cpu_percent))
+            if len(series["cpu"]):
+                self.cpu_progress.setValue(int(series["cpu"][-1]))
             
             # Memory usage
-            memory = psutil.virtual_memory()
-            self.memory_progress.setValue(int(memory.percent))
+            if len(series["memory"]):
+                self.memory_progress.setValue(int(series["memory"][-1]))
             
-            # Update stats text if on analytics tab
-            if self.tab_widget.currentIndex() == 2:  # Analytics tab
+            # Update charts and stats text if on analytics tab
+            if self.tab_widget.currentIndex() == self.tab_widget.indexOf(self.analytics_tab):
+                for name, sparkline in self.sparklines.items():
+                    sparkline.set_values(series[name])
+                
+                busiest = sorted(thread_series.items(), key=lambda item: -item[1][-10:].mean())
+                for sparkline, (name, values) in zip(self.thread_sparklines, busiest):
+                    sparkline.set_values(values, f"CPU: {name}")
+                
                 self.update_stats_display()
                 
         except Exception as e:
@@ -1153,10 +8076,46 @@ class EEMStudioPro(QMainWindow):
     def update_stats_display(self):
         """Update statistics display"""
         try:
-            # System info
-            cpu_count = psutil.cpu_count()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            # System info, sampled in the background
+            info = getattr(self, 'system_info', {})
+            
+            # Time each overlay layer adds to a frame, measured by the recorder
+            overlay_costs = getattr(self.recorder, 'overlay_costs', {}) if self.is_recording else {}
+            overlay_lines = "".join(
+                f"\n   {name}: {cost_ms:.3f} ms/frame, drawn {renders}×"
+                for name, (cost_ms, renders) in overlay_costs.items()
+            ) or "\n   None active"
+            
+            stream_stats = getattr(self.recorder, 'stream_stats', []) if self.is_recording else []
+            stream_lines = "".join(
+                f"\n   {stream['url']}: {stream['state']}, {stream['sent'] / (1024 * 1024):.1f} MB sent, "
+                f"{stream['dropped']} chunks dropped" + (f" ({stream['error']})" if stream['error'] else "")
+                for stream in stream_stats
+            ) or "\n   Not streaming"
+            
+            proxy_stats = getattr(self.recorder, 'proxy_stats', []) if self.is_recording else []
+            proxy_lines = "".join(
+                f"\n   {proxy['height']}p: {proxy['written']} frames, {proxy['dropped']} dropped"
+                + (f" ({proxy['error']})" if proxy['error'] else "")
+                for proxy in proxy_stats
+            ) or "\n   None"
+            
+            # Where each recorder stage runs, measured by the sampler
+            placement_lines = ""
+            for placement in info.get("placements", []) if self.is_recording else []:
+                wait = placement["wait_ms"]
+                placement_lines += (
+                    f"\n   {'+'.join(placement['stages'])}: CPUs {format_cpu_list(placement['cpus'])} "
+                    f"(last on {format_cpu_list(placement['last_cpus'])}), nice {placement['nice']}, "
+                    f"{placement['policy']}, run-queue wait "
+                    + (f"{wait:.2f} ms/s" if wait is not None else "n/a"))
+                for error in placement["errors"]:
+                    placement_lines += f"\n      ⚠️ {error}"
+            frame_pacing = getattr(self.recorder, 'frame_pacing', None) if self.is_recording else None
+            if frame_pacing:
+                placement_lines += (f"\n   Frame pacing: woken {frame_pacing[0]:.2f} ms late on average, "
+                                    f"{frame_pacing[1]:.2f} ms at worst")
+            placement_lines = placement_lines or "\n   Not recording"
             
             stats_text = f"""
 ╔══════════════════════════════════════╗
@@ -1165,10 +8124,10 @@ class EEMStudioPro(QMainWindow):
 ╚══════════════════════════════════════╝
 
 🖥️  System Resources:
-   CPU Cores: {cpu_count}
-   Total RAM: {memory.total / (1024**3):.1f} GB
-   Available RAM: {memory.available / (1024**3):.1f} GB
-   Disk Space: {disk.free / (1024**3):.1f} GB free
+   CPU Cores: {self.cpu_count}
+   Total RAM: {info.get('memory_total', 0) / (1024**3):.1f} GB
+   Available RAM: {info.get('memory_available', 0) / (1024**3):.1f} GB
+   Disk Space: {info.get('disk_free', 0) / (1024**3):.1f} GB free
 
 📊 Current Session:
    Recording Duration: {self.recording_duration // 3600:02d}:{(self.recording_duration % 3600) // 60:02d}:{self.recording_duration % 60:02d}
@@ -1179,7 +8138,15 @@ class EEMStudioPro(QMainWindow):
    FPS: {self.fps_combo.currentText()}
    Quality: {self.quality_slider.value()}%
    Camera: {'Enabled' if self.device_combo.currentData() is not None else 'Disabled'}
-   Region: {'Custom' if self.selected_region else 'Full Screen'}
+   Region: {'Window' if self.selected_window else 'Custom' if self.selected_region else 'Full Screen'}
+
+🎨 Overlays:{overlay_lines}
+
+📡 Streaming:{stream_lines}
+
+🪜 Proxy Ladder:{proxy_lines}
+
+🧵 Pipeline Placement:{placement_lines}
 
 ═══════════════════════════════════════
 EEM Studio Pro v2.0 - Professional Recording Suite
@@ -1219,7 +8186,27 @@ Developed by Elijah Ekpen Mensah
             "default_fps": int(self.fps_combo.currentText()),
             "default_quality": self.quality_slider.value(),
             "camera_position": self.position_combo.currentText(),
-            "camera_size": [self.width_spin.value(), self.height_spin.value()]
+            "camera_size": [self.width_spin.value(), self.height_spin.value()],
+            "camera_effect": self.camera_effect_combo.currentData(),
+            "camera_scene": self.camera_scene_line.text().strip(),
+            "fast_capture": self.fast_capture_check.isChecked(),
+            "publish_preview": self.publish_preview_check.isChecked(),
+            "stage_scheduling": self.stage_scheduling_settings(),
+            "pipeline_mode": self.pipeline_combo.currentData(),
+            "preview_quality": self.preview_quality_combo.currentData(),
+            "fsync_policy": self.fsync_combo.currentData(),
+            "overflow_directory": self.overflow_line.text().strip(),
+            "overlay_timestamp": self.overlay_timestamp_check.isChecked(),
+            "overlay_label": self.overlay_label_line.text().strip(),
+            "overlay_logo": self.overlay_logo_line.text().strip(),
+            "stream_targets": self.stream_line.text().strip(),
+            "stream_preset": self.stream_preset,
+            "proxy_ladder": self.proxy_ladder_line.text().strip(),
+            "timelapse": self.timelapse_check.isChecked(),
+            "timelapse_interval": self.timelapse_interval_spin.value(),
+            "timelapse_idle": self.timelapse_idle_combo.currentData(),
+            "pre_roll": self.pre_roll_combo.currentData(),
+            "calibration_fingerprint": self.calibration_fingerprint
         }
         
         try:
@@ -1229,6 +8216,20 @@ Developed by Elijah Ekpen Mensah
         except:
             pass
     
+    def stop_background_threads(self):
+        """Stop the worker threads and wait for each, none may be destroyed while it still runs"""
+        self.job_queue.shutdown()
+        for thread in (self.system_sampler, self.disk_watchdog, self.burst):
+            if thread:
+                thread.stop()
+                thread.wait()
+        if self.library_loader:
+            self.library_loader.cancel()
+            self.library_loader.wait()
+        for task in (self.catalog_task, self.library_scan_task, self.calibration_task, self.tool_task):
+            if task:
+                task.wait()
+    
     def closeEvent(self, event):
         """Handle application closing"""
         if self.is_recording:
@@ -1241,7 +8242,11 @@ Developed by Elijah Ekpen Mensah
             if reply == QMessageBox.Yes:
                 if self.recorder:
                     self.recorder.stop_recording()
+                    self.recorder.wait()
+                # recording_finished is never delivered once the window closes, summarize the session here
+                self.finish_session_log()
                 self.save_settings()
+                self.stop_background_threads()
                 event.accept()
             else:
                 event.ignore()
@@ -1255,7 +8260,10 @@ Developed by Elijah Ekpen Mensah
                                              "Application minimized to tray", 
                                              QSystemTrayIcon.Information, 2000)
             else:
+                if self.armed:
+                    self.disarm_recorder()
                 self.save_settings()
+                self.stop_background_threads()
                 event.accept()
 
 
@@ -1294,6 +8302,11 @@ def create_splash_screen():
 
 
 if __name__ == "__main__":
+    if "--soak" in sys.argv:
+        sys.exit(run_soak_test(sys.argv[1:]))
+    if "--view-preview" in sys.argv:
+        sys.exit(run_preview_viewer(sys.argv[1:]))
+    
     app = QApplication(sys.argv)
     app.setApplicationName("EEM Studio Pro")
     app.setApplicationVersion("2.0")
@@ -0,0 +1,65 @@
+import numpy as np
+
+import app
+
+
+def timings(capture, convert, direct, spool, **x264):
+    return {"capture": capture, "convert": convert, "encode_direct": direct, "encode_spool": spool,
+            **{"x264_" + preset: cost for preset, cost in x264.items()}}
+
+
+def test_fast_machine_records_directly_at_the_top_rate():
+    result = app.recommend_settings(timings(2, 1, 5, 3, veryfast=4, superfast=3, ultrafast=2))
+    assert result == {"fps": 60, "capture_mode": "direct", "pipeline": "threaded",
+                      "stream_preset": "veryfast", "sustained": True}
+
+
+def test_process_pipeline_when_only_the_overlapped_stages_fit():
+    # 60 fps with 1.25x headroom leaves 13.3 ms: 6 + 2 + 9 is over it, the slower of 6 and 9 fits
+    result = app.recommend_settings(timings(6, 2, 9, 12))
+    assert result["fps"] == 60
+    assert result["capture_mode"] == "direct"
+    assert result["pipeline"] == "process"
+
+
+def test_fast_capture_when_direct_encoding_is_too_slow():
+    result = app.recommend_settings(timings(2, 1, 40, 5))
+    assert result["fps"] == 60
+    assert result["capture_mode"] == "spool"
+    assert result["pipeline"] == "threaded"
+
+
+def test_frame_rate_falls_back_until_it_is_sustained():
+    # 30 fps leaves 26.7 ms, 24 fps leaves 33.3 ms
+    assert app.recommend_settings(timings(10, 2, 20, 20))["fps"] == 30
+    assert app.recommend_settings(timings(10, 2, 30, 30))["fps"] == 24
+
+
+def test_stream_preset_is_the_slowest_that_fits():
+    result = app.recommend_settings(timings(2, 1, 5, 3, veryfast=20, superfast=12, ultrafast=6))
+    assert result["stream_preset"] == "superfast"
+    # Without FFmpeg there are no x264 timings, any preset is taken to fit
+    assert app.recommend_settings(timings(2, 1, 5, 3))["stream_preset"] == "veryfast"
+
+
+def test_nothing_keeps_up():
+    result = app.recommend_settings(timings(100, 10, 100, 100, veryfast=100, superfast=100, ultrafast=100))
+    assert result == {"fps": 24, "capture_mode": "spool", "pipeline": "process",
+                      "stream_preset": "ultrafast", "sustained": False}
+
+
+def test_custom_frame_rates_and_headroom():
+    # 50 fps without headroom leaves exactly 20 ms, the threaded loop needs 21
+    result = app.recommend_settings(timings(10, 1, 10, 10), fps_options=(50, 25), headroom=1.0)
+    assert result["fps"] == 50
+    assert result["pipeline"] == "process"
+
+
+def test_x264_benchmark_when_ffmpeg_quits_early(tmp_path, monkeypatch):
+    # Exits cleanly without reading a frame, as a broken FFmpeg build might
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text("#!/bin/sh\nexit 0\n")
+    ffmpeg.chmod(0o755)
+    monkeypatch.setattr(app, "find_ffmpeg_tool", lambda *args: str(ffmpeg))
+    frames = [np.zeros((720, 1280, 3), dtype=np.uint8)]
+    assert app.benchmark_x264(frames, "veryfast", count=5) is None
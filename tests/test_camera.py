@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+import pytest
+
+import app
+
+
+def mode(fourcc, width, height, fps):
+    return {"fourcc": fourcc, "width": width, "height": height, "fps": fps}
+
+
+MODES = [
+    mode("YUYV", 640, 480, 30.0),
+    mode("YUYV", 1280, 720, 10.0),
+    mode("MJPG", 640, 480, 30.0),
+    mode("MJPG", 1280, 720, 30.0),
+    mode("MJPG", 1920, 1080, 30.0),
+    mode("H264", 1280, 720, 30.0),
+]
+
+
+def test_v4l2_structs_match_videodev2():
+    assert app.V4L2_FMTDESC.size == 64
+    assert app.V4L2_FRMSIZE.size == 44
+    assert app.V4L2_FRMIVAL.size == 52
+
+
+def test_v4l2_ioctl_numbers():
+    assert app.VIDIOC_ENUM_FMT == 0xc0405602
+    assert app.VIDIOC_ENUM_FRAMESIZES == 0xc02c564a
+    assert app.VIDIOC_ENUM_FRAMEINTERVALS == 0xc034564b
+
+
+def test_smallest_covering_mode_prefers_yuyv_when_small():
+    assert app.choose_camera_mode(MODES, (320, 240), 30) == mode("YUYV", 640, 480, 30.0)
+
+
+def test_mode_that_keeps_up_beats_a_slow_one():
+    assert app.choose_camera_mode(MODES, (1280, 720), 30) == mode("MJPG", 1280, 720, 30.0)
+
+
+def test_covering_matters_when_nothing_keeps_up():
+    assert app.choose_camera_mode(MODES, (1920, 1080), 60) == mode("MJPG", 1920, 1080, 30.0)
+
+
+def test_largest_mode_when_none_covers():
+    assert app.choose_camera_mode(MODES, (3840, 2160), 30) == mode("MJPG", 1920, 1080, 30.0)
+
+
+def test_unknown_rate_is_not_held_against_a_mode():
+    modes = [mode("YUYV", 640, 480, 0.0), mode("YUYV", 1280, 720, 30.0)]
+    assert app.choose_camera_mode(modes, (640, 480), 30) == mode("YUYV", 640, 480, 0.0)
+
+
+def test_no_mode_read_undecoded():
+    assert app.choose_camera_mode([], (640, 480), 30) is None
+    assert app.choose_camera_mode([mode("H264", 1280, 720, 30.0)], (640, 480), 30) is None
+
+
+def test_decode_yuyv():
+    # Mid-grey luma with neutral chroma
+    frame = app.decode_camera_frame(np.full(64 * 48 * 2, 128, dtype=np.uint8), "YUYV", 64, 48)
+    assert frame.shape == (48, 64, 3)
+    assert abs(int(frame.mean()) - 128) <= 2
+
+
+def test_incomplete_yuyv_buffer():
+    assert app.decode_camera_frame(np.zeros(100, dtype=np.uint8), "YUYV", 64, 48) is None
+
+
+@pytest.mark.parametrize("reduction, shape", [(1, (48, 64, 3)), (2, (24, 32, 3)), (4, (12, 16, 3))])
+def test_decode_mjpg_at_a_reduced_scale(reduction, shape):
+    _, raw = cv2.imencode(".jpg", np.full((48, 64, 3), 200, dtype=np.uint8))
+    assert app.decode_camera_frame(raw, "MJPG", 64, 48, reduction).shape == shape
+
+
+def test_metrics_report_dropped_frames():
+    camera = app.CameraOverlay(None)
+    camera.raw_mode = ("MJPG", 1280, 720, 2)
+    camera.mode_name = "MJPG 1280×720 @ 30 fps"
+    camera.latest = (np.zeros((2, 2, 3), dtype=np.uint8), None)
+    camera.decoded, camera.decode_time, camera.dropped = 4, 0.01, 3
+    assert camera.metrics() == {"Camera decode (MJPG 1280×720 @ 30 fps, 3 dropped)": (2.5, 4)}
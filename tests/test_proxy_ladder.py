@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import app
+
+
+def test_parse_heights_qualities_and_presets():
+    assert app.parse_proxy_ladder("720@75, 360P@60/Ultrafast,,180") == [
+        {"height": 720, "quality": 75, "preset": None},
+        {"height": 360, "quality": 60, "preset": "ultrafast"},
+        {"height": 180, "quality": None, "preset": None},
+    ]
+    assert app.parse_proxy_ladder("  ") == []
+
+
+@pytest.mark.parametrize("text", ["abc", "720@high", "8", "720@0", "720@101", "720/slowest"])
+def test_parse_rejects_bad_rungs(text):
+    with pytest.raises(ValueError):
+        app.parse_proxy_ladder(text)
+
+
+def test_plan_orders_rungs_and_drops_those_not_smaller():
+    rungs = app.parse_proxy_ladder("360, 720@75, 1080, 721")
+    plan = app.plan_proxy_ladder("/videos/clip.mkv", 1920, 1080, rungs)
+    assert [(rung["file"], rung["width"], rung["height"], rung["quality"]) for rung in plan] == [
+        ("/videos/clip_720p.mp4", 1280, 720, None),
+        ("/videos/clip_360p.mp4", 640, 360, None),
+    ]
+    assert [rung["steps"] for rung in plan] == [[], []]
+
+
+def test_plan_halves_towards_small_rungs():
+    plan = app.plan_proxy_ladder("clip.mp4", 1920, 1080, app.parse_proxy_ladder("181/ultrafast"))
+    assert plan == [{"height": 180, "width": 320, "quality": None, "preset": "ultrafast",
+                     "file": "clip_180p.mp4", "steps": [(960, 540), (480, 270)]}]
+
+
+def test_plan_keeps_widths_even():
+    plan = app.plan_proxy_ladder("clip.mp4", 1366, 768, app.parse_proxy_ladder("360"))
+    assert plan[0]["width"] % 2 == 0
+    assert plan[0]["width"] == 640
+
+
+def test_ladder_reports_through_stats(tmp_path, monkeypatch):
+    # OpenCV's encoder, so the test does not depend on FFmpeg
+    monkeypatch.setattr(app, "find_ffmpeg_tool", lambda *args: None)
+    ladder = app.ProxyLadder(str(tmp_path / "clip.avi"), 320, 180, 30, app.parse_proxy_ladder("90, 46"))
+    for _ in range(5):
+        ladder.write(np.zeros((180, 320, 3), dtype=np.uint8))
+    ladder.release()
+    stats = ladder.stats()
+    assert [(rung["height"], rung["error"]) for rung in stats] == [(90, None), (46, None)]
+    assert all(rung["written"] + rung["dropped"] == 5 for rung in stats)
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+import app
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def sample(t, fps, frames, cpu=50.0, rss_mb=100.0, **extra):
+    return {"t": t, "fps": fps, "frames": frames, "cpu": cpu, "rss_mb": rss_mb, **extra}
+
+
+SAMPLES = [
+    sample(1.0, 10, 10, cpu=90.0, dropped=2),
+    sample(2.0, 30, 40, cpu=40.0, rss_mb=120.0, disk_write=1.0,
+           stages={"grab": 2.0, "encode": 6.0}, wait_ms={"grab": 0.5}),
+    sample(3.0, 0, 40, cpu=5.0, paused=True),
+    sample(4.0, 20, 60, cpu=60.0, dropped=1, disk_write=None, stages={"grab": 4.0}, wait_ms={"grab": 1.5}),
+]
+
+
+def test_summary_leaves_out_the_first_and_paused_seconds():
+    summary = app.summarize_session({"config": {"fps": 30}}, SAMPLES)
+    assert summary["duration"] == 4.0
+    assert summary["frames"] == 60
+    assert summary["target_fps"] == 30
+    assert summary["mean_fps"] == 25.0
+    assert summary["low_fps"] == 20.5
+    assert summary["slow_seconds"] == 1
+    assert summary["mean_cpu"] == 50.0
+    assert summary["mean_disk_write"] == 1.0
+
+
+def test_totals_and_peaks_cover_every_second():
+    summary = app.summarize_session({"config": {"fps": 30}}, SAMPLES)
+    assert summary["dropped"] == 3
+    assert summary["peak_rss_mb"] == 120.0
+
+
+def test_stage_means_skip_seconds_without_the_stage():
+    summary = app.summarize_session({"config": {"fps": 30}}, SAMPLES)
+    assert summary["stages"] == {"encode": 6.0, "grab": 3.0}
+    assert summary["wait_ms"] == {"grab": 1.0}
+
+
+def test_timelapse_has_no_target_rate():
+    summary = app.summarize_session({"config": {"fps": 30, "timelapse_interval": 5}}, SAMPLES)
+    assert summary["target_fps"] == 0
+    assert summary["slow_seconds"] == 0
+
+
+def test_empty_session():
+    summary = app.summarize_session({}, [])
+    assert summary["duration"] == 0.0
+    assert summary["frames"] == 0
+    assert summary["mean_fps"] == 0.0
+    assert summary["low_fps"] == 0.0
+    assert summary["stages"] == {}
+
+
+def test_read_session_log_skips_a_line_cut_short(tmp_path):
+    path = tmp_path / "clip.mp4.20260101-120000.perf.jsonl"
+    lines = [json.dumps({"type": "session", "started": 1.0, "config": {"fps": 30}}),
+             *(json.dumps({"type": "sample", **record}) for record in SAMPLES), '{"type": "sam']
+    path.write_text("\n".join(lines))
+    header, samples, summary = app.read_session_log(path)
+    assert header == {"started": 1.0, "config": {"fps": 30}}
+    assert samples == SAMPLES
+    assert summary is None
+
+
+class StoppedRecorder:
+    def stop_recording(self):
+        pass
+    
+    def wait(self):
+        return True
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(app, "APP_DATA_DIR", str(tmp_path / ".eem_studio"))
+    qt_app = app.QApplication.instance() or app.QApplication([])
+    window = app.EEMStudioPro()
+    yield window
+    window.deleteLater()
+    qt_app.processEvents()
+
+
+def test_closing_mid_session_summarizes_and_registers_it(window, tmp_path, monkeypatch):
+    log_file = str(tmp_path / "clip.mp4.20260101-120000.perf.jsonl")
+    header = {"started": 1.0, "output_file": str(tmp_path / "clip.mp4"), "config": {"fps": 30}, "hardware": {}}
+    assert window.system_sampler.start_session_log(log_file, header)
+    for record in SAMPLES:
+        window.system_sampler.log_session_sample(record)
+    
+    # The user confirms stopping the recording and exiting
+    monkeypatch.setattr(app.QMessageBox, "question", staticmethod(lambda *args, **kwargs: app.QMessageBox.Yes))
+    window.recorder = StoppedRecorder()
+    window.is_recording = True
+    window.close()
+    
+    _, _, summary = app.read_session_log(log_file)
+    assert summary is not None
+    assert summary["frames"] == 60
+    sessions = app.RecordingLibrary(window.library.db_file).session_page(0, 10)
+    assert [session["log_file"] for session in sessions] == [log_file]
@@ -0,0 +1,92 @@
+import socket
+import time
+
+import pytest
+
+import app
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_packet_sink_is_abstract():
+    with pytest.raises(TypeError):
+        app.PacketSink("udp://127.0.0.1:1")
+
+
+def test_create_packet_sink_picks_the_transport():
+    assert isinstance(app.create_packet_sink("udp://127.0.0.1:5000"), app.UdpPacketSink)
+    assert isinstance(app.create_packet_sink("tcp://127.0.0.1:5000"), app.TcpPacketSink)
+    assert isinstance(app.create_packet_sink("srt://127.0.0.1:5000"), app.FfmpegRelaySink)
+
+
+def test_address_parses_host_and_port():
+    assert app.UdpPacketSink("udp://10.0.0.2:1234?pkt_size=1316").address() == ("10.0.0.2", 1234)
+    assert app.UdpPacketSink("udp://[::1]:1234").address() == ("::1", 1234)
+
+
+def test_udp_sink_splits_chunks_into_ts_datagrams():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(2)
+    sink = app.UdpPacketSink(f"udp://127.0.0.1:{receiver.getsockname()[1]}")
+    sink.start()
+    chunk = bytes(range(256)) * (10 * app.TS_PACKET_SIZE // 256)
+    sink.offer(chunk)
+    
+    received = b""
+    sizes = []
+    while len(received) < len(chunk):
+        datagram = receiver.recv(65536)
+        sizes.append(len(datagram))
+        received += datagram
+    sink.close()
+    receiver.close()
+    
+    assert received == chunk
+    assert max(sizes) == app.UdpPacketSink.DATAGRAM_SIZE
+    assert sink.stats()["state"] == "closed"
+
+
+def test_tcp_sink_sends_in_order():
+    server = socket.create_server(("127.0.0.1", 0))
+    sink = app.TcpPacketSink(f"tcp://127.0.0.1:{server.getsockname()[1]}")
+    sink.start()
+    for number in range(20):
+        sink.offer(bytes([number]) * 1000)
+    
+    connection, _ = server.accept()
+    connection.settimeout(2)
+    received = b""
+    while len(received) < 20000:
+        received += connection.recv(65536)
+    sink.close()
+    connection.close()
+    server.close()
+    
+    assert received == b"".join(bytes([number]) * 1000 for number in range(20))
+    assert sink.stats()["sent"] == 20000
+
+
+def test_unreachable_tcp_target_drops_only_its_own_chunks():
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    server.close()  # Nothing listens on this port any more
+    
+    sink = app.TcpPacketSink(f"tcp://127.0.0.1:{port}")
+    sink.start()
+    start = time.time()
+    for _ in range(app.PacketSink.QUEUE_CHUNKS * 2):
+        sink.offer(b"x" * 100)
+    assert time.time() - start < 0.5  # offer() never blocks
+    
+    assert wait_for(lambda: sink.stats()["state"] == "reconnecting")
+    sink.close()
+    stats = sink.stats()
+    assert stats["sent"] == 0
+    assert stats["dropped"] > 0
+    assert stats["error"]